@@ -0,0 +1,94 @@
+'''
+Load test of AsyncQuery.
+
+The coronavirus test dataset is imported into a temporary SQLite database, and a load generator sends lookups of random
+proteins and organisms with thousands of requests in flight at once. The latency percentiles and the throughput are
+printed per lookup. Run it from the BIOGRID folder:
+
+    python benchmarks/bench_async_query.py --requests 20000 --concurrency 2000
+'''
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import Engine, create_engine, select
+
+from biogrid.db.async_query import AsyncQuery
+from biogrid.db.engine import create_async_pooled_engine
+from biogrid.db.manager import Importer
+from biogrid.db.models import Organism, Protein
+
+file_path: str = os.path.join("tests", "data", "BIOGRID-CORONAVIRUS-test.tsv")
+
+
+async def load(query: AsyncQuery, uniprot_ids: list[str], tax_ids: list[int], requests: int,
+               concurrency: int) -> dict[str, list[float]]:
+    """
+    Send random lookups, at most `concurrency` at once.
+
+    Args:
+        query (AsyncQuery): The query to load.
+        uniprot_ids (list[str]): The proteins to look up.
+        tax_ids (list[int]): The organisms to list the interactions of.
+        requests (int): The number of lookups.
+        concurrency (int): The number of lookups in flight at once.
+
+    Returns:
+        dict[str, list[float]]: The latency of every lookup in seconds, keyed by lookup.
+    """
+    lookups = {
+        "partners": lambda: query.partners(uniprot_id=random.choice(uniprot_ids)),
+        "partners_many": lambda: query.partners_many(uniprot_ids=random.sample(uniprot_ids, k=min(50, len(uniprot_ids)))),
+        "organism_interactions": lambda: query.organism_interactions(tax_id=random.choice(tax_ids), limit=50),
+        "count_interactions": query.count_interactions,
+    }
+    latencies: dict[str, list[float]] = {name: [] for name in lookups}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(name: str) -> None:
+        async with semaphore:
+            start: float = time.perf_counter()
+            await lookups[name]()
+            latencies[name].append(time.perf_counter() - start)
+
+    await asyncio.gather(*(request(name=random.choice(list(lookups))) for _ in range(requests)))
+    return latencies
+
+
+async def main(requests: int, concurrency: int, pool_size: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path: str = os.path.join(directory, "biogrid.db")
+        engine: Engine = create_engine(url=f"sqlite:///{db_path}")
+        Importer(file_path=file_path, engine=engine).import_data()
+        with engine.connect() as connection:
+            uniprot_ids: list[str] = connection.execute(select(Protein.uniprot_id)).scalars().all()
+            tax_ids: list[int] = connection.execute(select(Organism.tax_id)).scalars().all()
+        engine.dispose()
+
+        async_engine = create_async_pooled_engine(url=f"sqlite+aiosqlite:///{db_path}", pool_size=pool_size, max_overflow=0)
+        query = AsyncQuery(engine=async_engine)
+        start: float = time.perf_counter()
+        latencies: dict[str, list[float]] = await load(
+            query=query, uniprot_ids=uniprot_ids, tax_ids=tax_ids, requests=requests, concurrency=concurrency
+        )
+        seconds: float = time.perf_counter() - start
+        await async_engine.dispose()
+
+    print(f"{requests} requests, {concurrency} in flight, {requests / seconds:.0f} requests/s")
+    for name, values in latencies.items():
+        p50, p95, p99 = np.percentile(np.array(values) * 1e3, [50, 95, 99])
+        print(f"{name:<24} {len(values):>7} requests  p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  p99 {p99:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test AsyncQuery on the coronavirus test dataset.")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=2_000)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(requests=args.requests, concurrency=args.concurrency, pool_size=args.pool_size))
@@ -0,0 +1,110 @@
+'''
+Benchmark of the secondary indexes declared on the models.
+
+The coronavirus test dataset is imported into a temporary SQLite database, and the common lookups are timed and explained
+once without and once with the indexes. Run it from the BIOGRID folder:
+
+    python benchmarks/bench_indexes.py
+'''
+
+import os
+import tempfile
+import timeit
+
+from sqlalchemy import Engine, Select, create_engine, func, select, text, union
+from sqlalchemy.orm import Session, aliased
+
+from biogrid.db.manager import Importer
+from biogrid.db.models import ExperimentalSystem, Interaction, Protein
+
+file_path: str = os.path.join("tests", "data", "BIOGRID-CORONAVIRUS-test.tsv")
+repeat: int = 1000
+
+
+def build_queries(session: Session) -> dict[str, Select]:
+    """
+    Build the lookups to benchmark for the most connected protein and the largest organism of the dataset.
+
+    Args:
+        session (Session): Session on the imported database.
+
+    Returns:
+        dict[str, Select]: The statements keyed by a short description.
+    """
+    uniprot_id: str = session.execute(
+        select(Interaction.interactor_a_id).group_by(Interaction.interactor_a_id).order_by(func.count().desc()).limit(1)
+    ).scalar_one()
+    tax_id: int = session.execute(
+        select(Protein.tax_id).group_by(Protein.tax_id).order_by(func.count().desc()).limit(1)
+    ).scalar_one()
+    # The names are resolved to their keys first, as Query.interactions_by_experimental_system does
+    physical_ids: list[int] = session.execute(
+        select(ExperimentalSystem.id).where(ExperimentalSystem.type == "physical")
+    ).scalars().all()
+    two_hybrid_ids: list[int] = session.execute(
+        select(ExperimentalSystem.id).where(ExperimentalSystem.name == "Two-hybrid")
+    ).scalars().all()
+    protein_a = aliased(Protein)
+    protein_b = aliased(Protein)
+    return {
+        f"partners of {uniprot_id}": union(
+            select(Interaction.interactor_b_id).where(Interaction.interactor_a_id == uniprot_id),
+            select(Interaction.interactor_a_id).where(Interaction.interactor_b_id == uniprot_id),
+        ),
+        f"physical interactions of {uniprot_id}": select(Interaction.id).where(
+            Interaction.interactor_a_id == uniprot_id, Interaction.experimental_system_id.in_(physical_ids)
+        ),
+        "interactions by Two-hybrid": select(Interaction.id).where(Interaction.experimental_system_id.in_(two_hybrid_ids)),
+        f"proteins of organism {tax_id}": select(Protein.uniprot_id).where(Protein.tax_id == tax_id),
+        f"interactions within organism {tax_id}": select(Interaction.id)
+        .join(protein_a, Interaction.interactor_a_id == protein_a.uniprot_id)
+        .join(protein_b, Interaction.interactor_b_id == protein_b.uniprot_id)
+        .where(protein_a.tax_id == tax_id, protein_b.tax_id == tax_id),
+    }
+
+
+def run(engine: Engine, queries: dict[str, Select]) -> dict[str, tuple[float, list[str]]]:
+    """
+    Time and explain every query.
+
+    Args:
+        engine (Engine): Engine on the imported database.
+        queries (dict[str, Select]): The statements to run.
+
+    Returns:
+        dict[str, tuple[float, list[str]]]: Mean latency in microseconds and query plan of every statement.
+    """
+    results: dict[str, tuple[float, list[str]]] = {}
+    with engine.connect() as connection:
+        for name, statement in queries.items():
+            sql: str = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan: list[str] = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            seconds: float = timeit.timeit(lambda: connection.execute(statement).all(), number=repeat)
+            results[name] = (seconds / repeat * 1e6, plan)
+    return results
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine: Engine = create_engine(url=f"sqlite:///{os.path.join(directory, 'biogrid.db')}")
+        importer = Importer(file_path=file_path, engine=engine)
+        importer.import_data()
+        with Session(bind=engine) as session:
+            queries: dict[str, Select] = build_queries(session=session)
+            importer.drop_indexes(session=session)
+            session.commit()
+            without_indexes = run(engine=engine, queries=queries)
+            importer.create_indexes(session=session)
+            session.commit()
+            with_indexes = run(engine=engine, queries=queries)
+
+        for name in queries:
+            (before, plan_before), (after, plan_after) = without_indexes[name], with_indexes[name]
+            print(f"{name}: {before:.1f} us -> {after:.1f} us ({before / after:.1f}x)")
+            print(f"    without indexes: {'; '.join(plan_before)}")
+            print(f"    with indexes:    {'; '.join(plan_after)}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
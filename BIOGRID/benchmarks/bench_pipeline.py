@@ -0,0 +1,248 @@
+'''
+Benchmark of the import pipeline and of the queries on synthetic releases.
+
+For every size, a synthetic tab3 release is generated (see synthetic.py) and imported into a temporary SQLite database.
+`Importer.load_data`, the `get_*_df` transforms, `import_data` with its stages and the `Query` methods are timed, and
+the results are written as JSON. Given the JSON of an earlier run, the throughput of every benchmark is compared to it
+and the script exits with status 1 if any benchmark regressed by more than the tolerance. Run it from the BIOGRID folder:
+
+    python benchmarks/bench_pipeline.py --rows 10000 100000 1000000 --output results.json
+    python benchmarks/bench_pipeline.py --rows 10000 100000 1000000 --baseline results.json
+'''
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import Engine, create_engine, select
+
+from biogrid.db.manager import Importer, Query
+from biogrid.db.models import Interaction
+from biogrid.db.report import ImportReport
+from biogrid.db.snapshot import Snapshot
+from synthetic import SyntheticRelease
+
+results_format_version: int = 1
+
+
+def best_of(function: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> float:
+    """
+    Time a function several times and keep the fastest run, which is the least disturbed by the rest of the machine.
+
+    Args:
+        function (Callable[[], object]): The function to time.
+        repeat (int): The number of runs.
+        setup (Callable[[], None] | None): Called before every run, outside of the timing.
+
+    Returns:
+        float: The wall time of the fastest run in seconds.
+    """
+    times: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # The counts of Query print their result
+            function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_size(release: SyntheticRelease, directory: str, repeat: int, betweenness_samples: int) -> list[dict]:
+    """
+    Run every benchmark on one synthetic release.
+
+    Args:
+        release (SyntheticRelease): The release to generate.
+        directory (str): A directory for the release and the database.
+        repeat (int): The number of runs of every benchmark.
+        betweenness_samples (int): The number of sources of the betweenness estimate.
+
+    Returns:
+        list[dict]: One result per benchmark, with its wall time and throughput in rows of the release per second.
+    """
+    file_path: str = os.path.join(directory, f"release-{release.rows}.tab3.txt")
+    release.write(path=file_path)
+    engine: Engine = create_engine(url=f"sqlite:///{os.path.join(directory, f'biogrid-{release.rows}.db')}")
+    importer = Importer(file_path=file_path, engine=engine)
+    timings: dict[str, float] = {}
+
+    timings["load_data"] = best_of(function=importer.load_data, repeat=repeat)
+    df: pd.DataFrame = importer.load_data()
+    copy: list[pd.DataFrame] = []
+    for transform in (importer.get_interaction_df, importer.get_proteins_df, importer.get_organisms_df):
+        # The transforms rename the columns of their input
+        timings[transform.__name__] = best_of(
+            function=lambda: transform(df=copy[-1]), repeat=repeat, setup=lambda: copy.append(df.copy())
+        )
+        copy.clear()
+    del df
+
+    reports: list[ImportReport] = []
+    timings["import_data"] = best_of(
+        function=lambda: reports.append(importer.import_data()),
+        repeat=repeat,
+        setup=lambda: importer.recreate_db(),
+    )
+    report: ImportReport = min(reports, key=lambda report: report.seconds)
+    if not report.succeeded:
+        raise RuntimeError(f"The import of {file_path} failed: {report.error}")
+    for name, stage in report.stages.items():
+        timings[f"import_data.{name}"] = stage.seconds
+
+    query = Query(engine=engine)
+    for method in (query.count_proteins, query.count_organisms, query.count_interactions, query.graph):
+        timings[f"Query.{method.__name__}"] = best_of(function=method, repeat=repeat)
+    # A selective prefix search, and one matching the organism name of about every protein
+    timings["Query.search_proteins"] = best_of(function=lambda: query.search_proteins(query="GENE0001"), repeat=repeat)
+    timings["Query.search_proteins.broad"] = best_of(function=lambda: query.search_proteins(query="synthetic"), repeat=repeat)
+    # Whether a pair interacts, answered from the primary key of the interaction_edge table
+    with engine.connect() as connection:
+        uniprot_id_a, uniprot_id_b = connection.execute(select(Interaction.interactor_a_id, Interaction.interactor_b_id).limit(1)).one()
+    timings["Query.interact"] = best_of(function=lambda: query.interact(uniprot_id_a=uniprot_id_b, uniprot_id_b=uniprot_id_a), repeat=repeat)
+    timings["Query.interaction_evidence"] = best_of(
+        function=lambda: query.interaction_evidence(uniprot_id_a=uniprot_id_b, uniprot_id_b=uniprot_id_a), repeat=repeat
+    )
+    # What a downstream job pays at startup: reading the interaction table, or opening a snapshot of it
+    snapshot_path: str = os.path.join(directory, f"snapshot-{release.rows}")
+    timings["Query.export_snapshot"] = best_of(function=lambda: query.export_snapshot(directory=snapshot_path), repeat=repeat)
+    timings["Snapshot.open"] = best_of(function=lambda: Snapshot.open(directory=snapshot_path), repeat=repeat)
+    graph = query.graph()
+    analytics: dict[str, Callable[[], object]] = {
+        "degree_distribution": lambda: query.degree_distribution(graph=graph),
+        "cross_organism_edges": lambda: query.cross_organism_edges(graph=graph),
+        "connected_components": lambda: query.connected_components(graph=graph),
+        "clustering_coefficients": lambda: query.clustering_coefficients(graph=graph),
+        "betweenness": lambda: query.betweenness(samples=betweenness_samples, graph=graph),
+    }
+    for name, function in analytics.items():
+        timings[f"Query.{name}"] = best_of(function=function, repeat=repeat)
+    engine.dispose()
+
+    return [
+        {"benchmark": name, "rows": release.rows, "seconds": seconds, "rows_per_second": release.rows / seconds if seconds else None}
+        for name, seconds in timings.items()
+    ]
+
+
+def environment() -> dict[str, object]:
+    """
+    Describe the machine and the library versions, which the results only compare well across if they are the same.
+
+    Returns:
+        dict[str, object]: The description.
+    """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float, min_seconds: float) -> list[str]:
+    """
+    Compare the throughput of every benchmark with the baseline.
+
+    Args:
+        results (list[dict]): The results of this run.
+        baseline (list[dict]): The results of the baseline run.
+        tolerance (float): The fraction by which a benchmark may be slower than the baseline.
+        min_seconds (float): Benchmarks which took less than this in the baseline are too noisy to count as regressions.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    baseline_seconds: dict[tuple[str, int], float] = {
+        (result["benchmark"], result["rows"]): result["seconds"] for result in baseline
+    }
+    regressions: list[str] = []
+    for result in results:
+        before: float | None = baseline_seconds.get((result["benchmark"], result["rows"]))
+        if not before:
+            continue
+        ratio: float = result["seconds"] / before
+        line: str = f"{result['benchmark']:<34} {result['rows']:>10} {before:>10.4f} s {result['seconds']:>10.4f} s {ratio:>6.2f}x"
+        if ratio > 1 + tolerance and before >= min_seconds:
+            regressions.append(line)
+            line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the import pipeline and the queries on synthetic releases.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000], help="The sizes of the releases.")
+    parser.add_argument("--organisms", type=int, default=20)
+    parser.add_argument("--organism-skew", type=float, default=1.0)
+    parser.add_argument("--protein-skew", type=float, default=0.8)
+    parser.add_argument("--duplicate-fraction", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="The number of runs of every benchmark, the fastest counts.")
+    parser.add_argument("--betweenness-samples", type=int, default=10)
+    parser.add_argument("--output", default=None, help="The JSON file to write the results to.")
+    parser.add_argument("--baseline", default=None, help="The JSON file of an earlier run to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="The slowdown which counts as a regression.")
+    parser.add_argument("--min-seconds", type=float, default=0.01, help="Faster benchmarks are not compared.")
+    args = parser.parse_args()
+
+    releases: list[SyntheticRelease] = [
+        SyntheticRelease(
+            rows=rows,
+            organisms=args.organisms,
+            organism_skew=args.organism_skew,
+            protein_skew=args.protein_skew,
+            duplicate_fraction=args.duplicate_fraction,
+            seed=args.seed,
+        )
+        for rows in args.rows
+    ]
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for release in releases:
+            for result in run_size(
+                release=release, directory=directory, repeat=args.repeat, betweenness_samples=args.betweenness_samples
+            ):
+                results.append(result)
+                print(f"{result['benchmark']:<34} {result['rows']:>10} {result['seconds']:>10.4f} s")
+
+    output: dict[str, object] = {
+        "version": results_format_version,
+        "environment": environment(),
+        "releases": [asdict(release) for release in releases],
+        "results": results,
+    }
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(output, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline: dict = json.load(file)
+        if baseline.get("version") != results_format_version:
+            sys.exit(f"{args.baseline} has results of version {baseline.get('version')}, expected {results_format_version}")
+        if baseline.get("releases") != output["releases"]:
+            print("Warning: the baseline was run on releases with other parameters")
+        print(f"\n{'benchmark':<34} {'rows':>10} {'baseline':>12} {'current':>12} {'ratio':>7}")
+        regressions: list[str] = compare(results=results, baseline=baseline["results"], tolerance=args.tolerance, min_seconds=args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks are more than {args.tolerance:.0%} slower than the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+'''
+Startup benchmark of the `biogrid` command.
+
+The coronavirus test dataset is imported into a temporary SQLite database, and every read-only subcommand is run in a
+new process, the way cron jobs and health checks run it. The time to the first line of output, which includes starting
+the interpreter and importing the modules the subcommand needs, is printed per subcommand against the target, with the
+time of an empty interpreter for reference. Run it from the BIOGRID folder:
+
+    python benchmarks/bench_startup.py --runs 10
+'''
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlalchemy import Engine, create_engine
+
+from biogrid.db.manager import Importer
+
+file_path: str = os.path.join("tests", "data", "BIOGRID-CORONAVIRUS-test.tsv")
+
+# Time to the first result which read-only subcommands should stay under, in milliseconds
+target_ms: float = 150.0
+
+
+def time_to_first_line(command: list[str], env: dict[str, str]) -> float:
+    """
+    Run a command in a new process and measure the time until it writes its first line.
+
+    Args:
+        command (list[str]): The command.
+        env (dict[str, str]): The environment of the process.
+
+    Returns:
+        float: The time in milliseconds.
+    """
+    start: float = time.perf_counter()
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True) as process:
+        first_line: str = process.stdout.readline()
+        elapsed: float = (time.perf_counter() - start) * 1e3
+        process.stdout.read()
+    if process.returncode not in (0, 1) or not first_line:
+        raise RuntimeError(f"{' '.join(command)} failed with exit status {process.returncode}")
+    return elapsed
+
+
+def main(runs: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url: str = f"sqlite:///{os.path.join(directory, 'biogrid.db')}"
+        engine: Engine = create_engine(url=url)
+        Importer(file_path=file_path, engine=engine).import_data()
+        engine.dispose()
+
+        env: dict[str, str] = {**os.environ, "BIOGRID_DATABASE_URL": url}
+        cli: list[str] = [sys.executable, "-m", "biogrid.cli"]
+        commands: dict[str, list[str]] = {
+            "python": [sys.executable, "-c", "print()"],
+            "biogrid --help": [*cli, "--help"],
+            "biogrid count": [*cli, "count"],
+            "biogrid count interactions": [*cli, "count", "interactions"],
+            "biogrid lookup": [*cli, "lookup", "P0DTC2"],
+        }
+        for name, command in commands.items():
+            # The first run warms the page cache, like any run after the first on a server
+            time_to_first_line(command=command, env=env)
+            timings: list[float] = [time_to_first_line(command=command, env=env) for _ in range(runs)]
+            best, median = min(timings), statistics.median(timings)
+            verdict: str = "" if name.startswith("python") else ("  ok" if median <= target_ms else f"  over {target_ms:.0f} ms")
+            print(f"{name:<28} best {best:7.1f} ms  median {median:7.1f} ms{verdict}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the time to the first result of the biogrid command.")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    main(runs=args.runs)
@@ -0,0 +1,321 @@
+'''
+Generator of synthetic BioGRID releases.
+
+The files have the 37 columns of the tab3 format and can be generated at any size, with a configurable number of organisms
+and proteins, skew of the organisms and interactors towards a few hubs, and fraction of duplicated rows. Every value of a
+row is derived from a hash of its key, so the same arguments always give the same file, whatever the chunk size. Run it
+from the BIOGRID folder:
+
+    python benchmarks/synthetic.py release.tab3.txt --rows 1000000
+'''
+
+import argparse
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+tab3_columns: list[str] = [
+    "#BioGRID Interaction ID",
+    "Entrez Gene Interactor A",
+    "Entrez Gene Interactor B",
+    "BioGRID ID Interactor A",
+    "BioGRID ID Interactor B",
+    "Systematic Name Interactor A",
+    "Systematic Name Interactor B",
+    "Official Symbol Interactor A",
+    "Official Symbol Interactor B",
+    "Synonyms Interactor A",
+    "Synonyms Interactor B",
+    "Experimental System",
+    "Experimental System Type",
+    "Author",
+    "Publication Source",
+    "Organism ID Interactor A",
+    "Organism ID Interactor B",
+    "Throughput",
+    "Score",
+    "Modification",
+    "Qualifications",
+    "Tags",
+    "Source Database",
+    "SWISS-PROT Accessions Interactor A",
+    "TREMBL Accessions Interactor A",
+    "REFSEQ Accessions Interactor A",
+    "SWISS-PROT Accessions Interactor B",
+    "TREMBL Accessions Interactor B",
+    "REFSEQ Accessions Interactor B",
+    "Ontology Term IDs",
+    "Ontology Term Names",
+    "Ontology Term Categories",
+    "Ontology Term Qualifier IDs",
+    "Ontology Term Qualifier Names",
+    "Ontology Term Types",
+    "Organism Name Interactor A",
+    "Organism Name Interactor B",
+]
+
+experimental_systems: list[tuple[str, str]] = [
+    ("Affinity Capture-MS", "physical"),
+    ("Two-hybrid", "physical"),
+    ("Affinity Capture-Western", "physical"),
+    ("Reconstituted Complex", "physical"),
+    ("Co-fractionation", "physical"),
+    ("Proximity Label-MS", "physical"),
+    ("Synthetic Lethality", "genetic"),
+    ("Negative Genetic", "genetic"),
+    ("Positive Genetic", "genetic"),
+    ("Dosage Rescue", "genetic"),
+]
+
+# Salts of the hashes from which the values of a row are derived
+_interactor_a, _interactor_b, _system, _score, _missing_a, _missing_b, _duplicate, _original, _organism = range(9)
+
+
+@dataclass
+class SyntheticRelease:
+    """
+    Parameters of a synthetic release.
+
+    Attributes:
+        rows (int): The number of rows of the file.
+        organisms (int): The number of organisms.
+        proteins (int | None): The number of proteins. Defaults to None, which is a fifth of the rows.
+        organism_skew (float): Zipf exponent of the number of proteins per organism. 0 gives every organism the same
+            number of proteins, larger values concentrate them in the first organisms.
+        protein_skew (float): Zipf exponent of the number of interactions per protein, which makes a few proteins hubs.
+        duplicate_fraction (float): The fraction of rows which repeat an earlier row, interaction ID included.
+        missing_fraction (float): The fraction of interactors without a SWISS-PROT accession.
+        score_fraction (float): The fraction of rows with a score.
+        seed (int): Seed of the hashes from which every value is derived.
+    """
+
+    rows: int
+    organisms: int = 20
+    proteins: int | None = None
+    organism_skew: float = 1.0
+    protein_skew: float = 0.8
+    duplicate_fraction: float = 0.05
+    missing_fraction: float = 0.01
+    score_fraction: float = 0.1
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.proteins is None:
+            self.proteins = max(self.rows // 5, 2)
+        if self.rows < 1 or self.organisms < 1 or self.proteins < 1:
+            raise ValueError("rows, organisms and proteins must be positive")
+        for name in ("duplicate_fraction", "missing_fraction", "score_fraction"):
+            if not 0 <= getattr(self, name) < 1:
+                raise ValueError(f"{name} must be in [0, 1)")
+
+    def _uniform(self, keys: np.ndarray, salt: int) -> np.ndarray:
+        """
+        Hash the keys into uniform floats in [0, 1) with the SplitMix64 finalizer.
+
+        Args:
+            keys (np.ndarray): The keys to hash.
+            salt (int): Distinguishes the values derived from the same key.
+
+        Returns:
+            np.ndarray: One float per key.
+        """
+        x: np.ndarray = keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        x ^= np.uint64((self.seed * 1_000_003 + salt) * 0xBF58476D1CE4E5B9 % 2**64)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+        return (x >> np.uint64(11)).astype(np.float64) / 2.0**53
+
+    @staticmethod
+    def _zipf_cdf(n: int, skew: float) -> np.ndarray:
+        """
+        Get the cumulative distribution of Zipf weights over n ranks.
+
+        Args:
+            n (int): The number of ranks.
+            skew (float): The exponent of the weights.
+
+        Returns:
+            np.ndarray: The cumulative probabilities, ending at 1.
+        """
+        weights: np.ndarray = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** skew
+        cdf: np.ndarray = np.cumsum(weights)
+        return cdf / cdf[-1]
+
+    def _sample(self, cdf: np.ndarray, keys: np.ndarray, salt: int) -> np.ndarray:
+        """
+        Draw one rank per key from a cumulative distribution.
+
+        Args:
+            cdf (np.ndarray): The cumulative probabilities.
+            keys (np.ndarray): The keys to draw for.
+            salt (int): Distinguishes the draws from the same key.
+
+        Returns:
+            np.ndarray: The drawn ranks.
+        """
+        return np.minimum(np.searchsorted(cdf, self._uniform(keys=keys, salt=salt), side="right"), len(cdf) - 1)
+
+    def protein_table(self) -> pd.DataFrame:
+        """
+        Get the attributes of every protein, in the columns of the tab3 format without the Interactor suffix.
+
+        Returns:
+            pd.DataFrame: One row per protein.
+        """
+        ids: np.ndarray = np.arange(self.proteins)
+        organisms: np.ndarray = self._sample(
+            cdf=self._zipf_cdf(n=self.organisms, skew=self.organism_skew), keys=ids, salt=_organism
+        )
+        digits: pd.Series = pd.Series(ids).astype(str).str.zfill(7)
+        return pd.DataFrame(
+            {
+                "Entrez Gene": (ids + 1).astype(str),
+                "BioGRID ID": (ids + 100_000).astype(str),
+                "Systematic Name": "SYS" + digits,
+                "Official Symbol": "GENE" + digits,
+                "Synonyms": "ALIAS" + digits,
+                "Organism ID": (organisms * 1_000 + 9_000).astype(str),
+                "SWISS-PROT Accessions": "Q" + digits,
+                "TREMBL Accessions": "-",
+                "REFSEQ Accessions": "NP_" + digits,
+                "Organism Name": "Synthetic organism " + pd.Series(organisms).astype(str),
+            }
+        )
+
+    def chunk(self, start: int, stop: int, proteins: pd.DataFrame, duplicates_before: int | None = None) -> pd.DataFrame:
+        """
+        Generate the rows [start, stop) of the file.
+
+        Args:
+            start (int): The first row.
+            stop (int): The row after the last one.
+            proteins (pd.DataFrame): The table returned by `protein_table`.
+            duplicates_before (int | None): The number of duplicated rows before the first row, as returned by
+                `count_duplicates`. Defaults to None, which counts them.
+
+        Returns:
+            pd.DataFrame: The rows, with the columns of the tab3 format.
+        """
+        rows: np.ndarray = np.arange(start, stop)
+        # A row is either the next original interaction, or a copy of one of the originals before it
+        if duplicates_before is None:
+            duplicates_before = self.count_duplicates(start=0, stop=start)
+        is_duplicate: np.ndarray = self._is_duplicate(rows=rows)
+        originals_before: np.ndarray = rows - duplicates_before - np.cumsum(is_duplicate) + is_duplicate
+        keys: np.ndarray = np.where(
+            is_duplicate,
+            (self._uniform(keys=rows, salt=_original) * originals_before).astype(np.int64),
+            originals_before,
+        )
+
+        cdf: np.ndarray = self._zipf_cdf(n=self.proteins, skew=self.protein_skew)
+        # Rank 0 is the largest hub, spread the hubs over the organisms
+        permutation: np.ndarray = np.argsort(self._uniform(keys=np.arange(self.proteins), salt=_interactor_a))
+        a: np.ndarray = permutation[self._sample(cdf=cdf, keys=keys, salt=_interactor_a)]
+        b: np.ndarray = permutation[self._sample(cdf=cdf, keys=keys, salt=_interactor_b)]
+        systems: np.ndarray = np.minimum(
+            (self._uniform(keys=keys, salt=_system) * len(experimental_systems)).astype(np.int64),
+            len(experimental_systems) - 1,
+        )
+        score: np.ndarray = self._uniform(keys=keys, salt=_score)
+
+        n: int = len(rows)
+        columns: dict[str, object] = {"#BioGRID Interaction ID": (keys + 1).astype(str)}
+        for side, interactor, salt in (("A", a, _missing_a), ("B", b, _missing_b)):
+            for name in proteins.columns:
+                columns[f"{name} Interactor {side}"] = proteins[name].to_numpy()[interactor]
+            missing: np.ndarray = self._uniform(keys=keys, salt=salt) < self.missing_fraction
+            columns[f"SWISS-PROT Accessions Interactor {side}"] = np.where(
+                missing, "-", columns[f"SWISS-PROT Accessions Interactor {side}"]
+            )
+        columns["Experimental System"] = np.array([system for system, _ in experimental_systems], dtype=object)[systems]
+        columns["Experimental System Type"] = np.array([kind for _, kind in experimental_systems], dtype=object)[systems]
+        columns["Author"] = "Synthetic A (2025)"
+        columns["Publication Source"] = "PUBMED:" + pd.Series(keys // 50 + 1_000_000).astype(str).to_numpy()
+        columns["Throughput"] = np.where(systems == 0, "High Throughput", "Low Throughput")
+        columns["Score"] = np.where(score < self.score_fraction, np.round(score * 100, 3).astype(str), "-")
+        columns["Source Database"] = "BIOGRID"
+        for name in tab3_columns:
+            columns.setdefault(name, "-")
+        return pd.DataFrame({name: columns[name] for name in tab3_columns}, index=pd.RangeIndex(n))
+
+    def _is_duplicate(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Get which rows repeat an earlier row. The first row never does.
+
+        Args:
+            rows (np.ndarray): The rows.
+
+        Returns:
+            np.ndarray: A boolean mask over the rows.
+        """
+        return (self._uniform(keys=rows, salt=_duplicate) < self.duplicate_fraction) & (rows > 0)
+
+    def count_duplicates(self, start: int, stop: int) -> int:
+        """
+        Count the rows in [start, stop) which repeat an earlier row, in blocks to bound the memory.
+
+        Args:
+            start (int): The first row.
+            stop (int): The row after the last one.
+
+        Returns:
+            int: The number of duplicated rows.
+        """
+        count: int = 0
+        for block in range(start, stop, 1_000_000):
+            count += int(self._is_duplicate(rows=np.arange(block, min(block + 1_000_000, stop))).sum())
+        return count
+
+    def write(self, path: str, chunksize: int = 500_000) -> None:
+        """
+        Write the release as a tab-separated tab3 file.
+
+        Args:
+            path (str): The file to write.
+            chunksize (int): The number of rows generated and written at once.
+        """
+        proteins: pd.DataFrame = self.protein_table()
+        with open(path, "w", newline="") as file:
+            file.write("\t".join(tab3_columns) + "\n")
+            duplicates: int = 0
+            for start in range(0, self.rows, chunksize):
+                stop: int = min(start + chunksize, self.rows)
+                df: pd.DataFrame = self.chunk(start=start, stop=stop, proteins=proteins, duplicates_before=duplicates)
+                df.to_csv(file, sep="\t", header=False, index=False)
+                duplicates += self.count_duplicates(start=start, stop=stop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic BioGRID tab3 release.")
+    parser.add_argument("path", help="The file to write.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--organisms", type=int, default=20)
+    parser.add_argument("--proteins", type=int, default=None)
+    parser.add_argument("--organism-skew", type=float, default=1.0)
+    parser.add_argument("--protein-skew", type=float, default=0.8)
+    parser.add_argument("--duplicate-fraction", type=float, default=0.05)
+    parser.add_argument("--missing-fraction", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    release = SyntheticRelease(
+        rows=args.rows,
+        organisms=args.organisms,
+        proteins=args.proteins,
+        organism_skew=args.organism_skew,
+        protein_skew=args.protein_skew,
+        duplicate_fraction=args.duplicate_fraction,
+        missing_fraction=args.missing_fraction,
+        seed=args.seed,
+    )
+    release.write(path=args.path)
+    print(f"Wrote {args.path}: {asdict(release)}")
+
+
+if __name__ == "__main__":
+    main()
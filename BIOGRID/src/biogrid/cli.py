@@ -0,0 +1,202 @@
+'''
+In this file, the `biogrid` command is defined.
+It imports a release, counts the rows of the database, looks up the interactions of proteins and exports snapshots, e.g.
+from cron jobs and health checks. Only the standard library is imported at start: every subcommand imports the modules
+it needs when it runs, and biogrid.db binds pandas and numpy lazily, so `biogrid count` answers without loading them.
+The results are written to stdout, and what the library prints on the way, e.g. its errors, to stderr.
+
+    biogrid --database sqlite:///biogrid.db import BIOGRID-ALL-4.4.240.tab3.zip --chunksize 500000
+    biogrid count interactions
+    biogrid lookup P0DTC2 P0DTD1 > interactions.tsv
+    biogrid export snapshots/latest
+'''
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+
+# The database used when neither --database nor the environment variable is given
+default_database_url: str = "sqlite:///biogrid.db"
+database_url_variable: str = "BIOGRID_DATABASE_URL"
+
+count_choices: tuple[str, ...] = ("proteins", "organisms", "interactions", "edges")
+
+
+def _table(name: str) -> str:
+    """
+    Check the name of a table to count.
+
+    Args:
+        name (str): The name given on the command line.
+
+    Raises:
+        argparse.ArgumentTypeError: If the table cannot be counted.
+
+    Returns:
+        str: The name.
+    """
+    if name not in count_choices:
+        raise argparse.ArgumentTypeError(f"invalid choice: {name!r} (choose from {', '.join(count_choices)})")
+    return name
+
+
+def _engine(url: str) -> Engine:
+    """
+    Create the engine of the database.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        Engine: The engine.
+    """
+    from biogrid.db.engine import create_pooled_engine
+
+    return create_pooled_engine(url=url)
+
+
+def _import(args: argparse.Namespace) -> int:
+    """
+    Import a release into the database, or reload it into a shadow database which is swapped in once it is complete.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if the import failed.
+    """
+    from biogrid.db.manager import Importer
+
+    with redirect_stdout(sys.stderr):
+        # Reloading keeps the live tables, which recreating them would drop
+        create = Importer.for_reload if args.reload else Importer
+        importer = create(file_path=args.file, engine=_engine(url=args.database), workers=args.workers, cache=args.cache)
+        report = importer.reload(chunksize=args.chunksize) if args.reload else importer.import_data(chunksize=args.chunksize)
+    print(report.to_json(indent=2) if args.json else report)
+    return 0 if report.succeeded else 1
+
+
+def _count(args: argparse.Namespace) -> int:
+    """
+    Print the number of rows of the database, one table per line.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status.
+    """
+    from biogrid.db.manager import Query
+
+    query = Query(engine=_engine(url=args.database))
+    for name in args.tables or count_choices:
+        with redirect_stdout(sys.stderr):
+            count: int = getattr(query, f"count_{name}")()
+        print(f"{name}\t{count}")
+    return 0
+
+
+def _lookup(args: argparse.Namespace) -> int:
+    """
+    Print the interactions of proteins as TSV.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if none of the proteins interacts.
+    """
+    from biogrid.db.manager import Query
+
+    uniprot_ids: list[str] = args.uniprot_ids or [line.strip() for line in sys.stdin if line.strip()]
+    with redirect_stdout(sys.stderr):
+        df = Query(engine=_engine(url=args.database)).lookup_interactions(uniprot_ids=uniprot_ids)
+    df.to_csv(sys.stdout, sep="\t", index=False)
+    return 0 if len(df) else 1
+
+
+def _export(args: argparse.Namespace) -> int:
+    """
+    Export a snapshot of the database and print its manifest.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status.
+    """
+    from biogrid.db.manager import Query
+
+    with redirect_stdout(sys.stderr):
+        manifest: dict = Query(engine=_engine(url=args.database)).export_snapshot(directory=args.directory)
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser of the command line.
+
+    Returns:
+        argparse.ArgumentParser: The parser, with one subparser per subcommand.
+    """
+    parser = argparse.ArgumentParser(prog="biogrid", description="Import and query BioGRID releases.")
+    parser.add_argument(
+        "--database",
+        default=os.environ.get(database_url_variable, default_database_url),
+        help=f"The database URL. Defaults to ${database_url_variable}, or {default_database_url}.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import a release, replacing the stored data.")
+    import_parser.add_argument("file", help="The BioGRID TSV file, or a .gz file or .zip archive of it.")
+    import_parser.add_argument("--chunksize", type=int, default=None, help="Stream the file in chunks of this many rows.")
+    import_parser.add_argument("--workers", type=int, default=1, help="The number of processes normalizing chunks.")
+    import_parser.add_argument("--cache", action="store_true", help="Cache the parsed file next to it, needs pyarrow.")
+    import_parser.add_argument(
+        "--reload", action="store_true", help="Import into a shadow database and swap it in, without downtime for readers."
+    )
+    import_parser.add_argument("--json", action="store_true", help="Print the import report as JSON.")
+    import_parser.set_defaults(handler=_import)
+
+    count_parser = subparsers.add_parser("count", help="Print the number of rows, from the table_count summary.")
+    # Checked by type rather than choices, which rejects an empty list of tables
+    count_parser.add_argument(
+        "tables", nargs="*", type=_table, metavar="table", help=f"The tables to count, of {', '.join(count_choices)}. Defaults to all."
+    )
+    count_parser.set_defaults(handler=_count)
+
+    lookup_parser = subparsers.add_parser("lookup", help="Print the interactions of proteins as TSV.")
+    lookup_parser.add_argument("uniprot_ids", nargs="*", help="The UniProt IDs. Read from stdin, one per line, if none is given.")
+    lookup_parser.set_defaults(handler=_lookup)
+
+    export_parser = subparsers.add_parser("export", help="Export a memory-mappable snapshot and print its manifest.")
+    export_parser.add_argument("directory", help="The directory of the snapshot. An older snapshot in it is replaced.")
+    export_parser.set_defaults(handler=_export)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Run the `biogrid` command.
+
+    Args:
+        argv (Sequence[str] | None): The arguments. Defaults to None, for the arguments of the process.
+
+    Returns:
+        int: The exit status.
+    """
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
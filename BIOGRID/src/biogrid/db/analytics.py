@@ -0,0 +1,222 @@
+'''
+In this file, network statistics are computed on an InteractionGraph in batch.
+All functions work on the CSR arrays with NumPy operations over all nodes or edges at once, never with a Python loop
+over proteins or interactions, and return pandas DataFrames.
+'''
+
+from __future__ import annotations
+
+from biogrid.db.graph import InteractionGraph
+from biogrid.db.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Upper bound on the number of candidate triangles checked at once by `clustering_coefficients`, to bound its memory
+wedge_batch_size: int = 10_000_000
+
+
+def _edge_list(graph: InteractionGraph) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the source and target node of every entry of the CSR neighbors array, i.e. every edge in both directions.
+
+    Args:
+        graph (InteractionGraph): The graph.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The source and the target node ids.
+    """
+    return np.repeat(np.arange(len(graph), dtype=np.int64), graph.degrees()), graph.neighbors.astype(np.int64)
+
+
+def degree_distribution(graph: InteractionGraph, tax_ids: np.ndarray) -> pd.DataFrame:
+    """
+    Count the proteins of every organism by their degree.
+
+    Args:
+        graph (InteractionGraph): The graph.
+        tax_ids (np.ndarray): The tax_id of every node, indexed by node id.
+
+    Returns:
+        pd.DataFrame: Columns tax_id, degree and proteins, sorted by tax_id and degree.
+    """
+    df = pd.DataFrame(data={"tax_id": tax_ids, "degree": graph.degrees()})
+    return df.groupby(by=["tax_id", "degree"]).size().rename("proteins").reset_index()
+
+
+def cross_organism_edges(graph: InteractionGraph, tax_ids: np.ndarray) -> pd.DataFrame:
+    """
+    Count the interacting protein pairs between every pair of organisms, e.g. between SARS-CoV-2 and Homo sapiens.
+    An edge is counted once, under the pair of organisms with the smaller tax_id first.
+
+    Args:
+        graph (InteractionGraph): The graph.
+        tax_ids (np.ndarray): The tax_id of every node, indexed by node id.
+
+    Returns:
+        pd.DataFrame: Columns tax_id_a, tax_id_b and edges, with tax_id_a <= tax_id_b, sorted by decreasing edges.
+    """
+    source, target = _edge_list(graph=graph)
+    once: np.ndarray = source <= target  # Every undirected edge appears in both directions
+    tax_a, tax_b = tax_ids[source[once]], tax_ids[target[once]]
+    df = pd.DataFrame(data={"tax_id_a": np.minimum(tax_a, tax_b), "tax_id_b": np.maximum(tax_a, tax_b)})
+    counts: pd.DataFrame = df.groupby(by=["tax_id_a", "tax_id_b"]).size().rename("edges").reset_index()
+    return counts.sort_values(by=["edges", "tax_id_a", "tax_id_b"], ascending=[False, True, True], ignore_index=True)
+
+
+def component_labels(graph: InteractionGraph) -> np.ndarray:
+    """
+    Label the connected components by hooking every component onto its smallest node id, with pointer jumping in
+    between, so the number of passes over the edges grows with the logarithm of the component diameter.
+
+    Args:
+        graph (InteractionGraph): The graph.
+
+    Returns:
+        np.ndarray: For every node, the smallest node id of its component.
+    """
+    source, target = _edge_list(graph=graph)
+    labels: np.ndarray = np.arange(len(graph), dtype=np.int64)
+    while True:
+        hooked: np.ndarray = labels.copy()
+        np.minimum.at(hooked, labels[source], labels[target])
+        while True:
+            jumped: np.ndarray = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+def connected_components(graph: InteractionGraph) -> pd.DataFrame:
+    """
+    Assign every protein to its connected component.
+
+    Args:
+        graph (InteractionGraph): The graph.
+
+    Returns:
+        pd.DataFrame: Columns uniprot_id, component and component_size. Components are numbered from 0 by decreasing size.
+    """
+    labels: np.ndarray = component_labels(graph=graph)
+    roots, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    # Number the components by decreasing size, ties by their smallest node id
+    rank: np.ndarray = np.empty(len(roots), dtype=np.int64)
+    rank[np.lexsort((roots, -sizes))] = np.arange(len(roots))
+    return pd.DataFrame(data={"uniprot_id": graph.nodes, "component": rank[inverse], "component_size": sizes[inverse]})
+
+
+def triangle_counts(graph: InteractionGraph) -> np.ndarray:
+    """
+    Count the triangles every node is part of. Self interactions are ignored.
+    Edges are oriented from the node of lower to the node of higher (degree, node id), so every triangle is found
+    exactly once, from its lowest node, as a pair of out-neighbors which are connected themselves.
+
+    Args:
+        graph (InteractionGraph): The graph.
+
+    Returns:
+        np.ndarray: The number of triangles of every node, indexed by node id.
+    """
+    n: int = len(graph)
+    source, target = _edge_list(graph=graph)
+    rank: np.ndarray = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), graph.degrees()))] = np.arange(n)
+    forward: np.ndarray = rank[source] < rank[target]
+    out_source, out_target = source[forward], target[forward]  # Grouped by source, as the CSR arrays are
+    out_degrees: np.ndarray = np.bincount(out_source, minlength=n)
+    out_offsets: np.ndarray = np.concatenate([[0], np.cumsum(out_degrees)])
+    edge_keys: np.ndarray = np.unique(np.minimum(source, target) * n + np.maximum(source, target))
+
+    triangles: np.ndarray = np.zeros(n, dtype=np.int64)
+    # Every out-neighbor is paired with the out-neighbors after it. The nodes are processed in blocks of at most
+    # wedge_batch_size pairs (or a single node) to bound the memory
+    pairs_per_entry: np.ndarray = out_degrees[out_source] - 1 - (np.arange(len(out_source)) - out_offsets[out_source])
+    cumulative_pairs: np.ndarray = np.cumsum(np.bincount(out_source, weights=pairs_per_entry, minlength=n).astype(np.int64))
+    block_start: int = 0
+    while block_start < n:
+        pairs_before: int = int(cumulative_pairs[block_start - 1]) if block_start else 0
+        block_end: int = max(int(np.searchsorted(cumulative_pairs, pairs_before + wedge_batch_size, side="right")), block_start + 1)
+        entries: np.ndarray = np.arange(out_offsets[block_start], out_offsets[block_end])
+        counts: np.ndarray = pairs_per_entry[entries]
+        first: np.ndarray = np.repeat(entries, counts)
+        second: np.ndarray = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+        u, w = out_target[first], out_target[second]
+        keys: np.ndarray = np.minimum(u, w) * n + np.maximum(u, w)
+        positions: np.ndarray = np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)
+        closed: np.ndarray = edge_keys[positions] == keys
+        for corner in (out_source[first[closed]], u[closed], w[closed]):
+            triangles += np.bincount(corner, minlength=n)
+        block_start = block_end
+    return triangles
+
+
+def clustering_coefficients(graph: InteractionGraph) -> pd.DataFrame:
+    """
+    Compute the local clustering coefficient of every protein, i.e. the fraction of its partner pairs which interact.
+
+    Args:
+        graph (InteractionGraph): The graph.
+
+    Returns:
+        pd.DataFrame: Columns uniprot_id, degree (without self interactions), triangles and clustering, which is 0 for
+        proteins with fewer than 2 partners.
+    """
+    source, target = _edge_list(graph=graph)
+    degrees: np.ndarray = np.bincount(source[source != target], minlength=len(graph))
+    triangles: np.ndarray = triangle_counts(graph=graph)
+    pairs: np.ndarray = degrees * (degrees - 1) / 2
+    clustering: np.ndarray = np.divide(triangles, pairs, out=np.zeros(len(graph)), where=pairs > 0)
+    return pd.DataFrame(data={"uniprot_id": graph.nodes, "degree": degrees, "triangles": triangles, "clustering": clustering})
+
+
+def betweenness(graph: InteractionGraph, samples: int | None = 100, seed: int = 0) -> pd.DataFrame:
+    """
+    Estimate the betweenness centrality of every protein with Brandes' algorithm run from a random sample of source
+    proteins, scaled up to all sources. Every breadth first search expands a whole level of the graph at once.
+
+    Args:
+        graph (InteractionGraph): The graph.
+        samples (int | None): Number of source proteins. None uses every protein, which gives the exact values.
+            Defaults to 100.
+        seed (int): Seed of the random source sample. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Columns uniprot_id and betweenness, the (estimated) number of shortest paths between other
+        proteins passing through the protein, each unordered pair counted once.
+    """
+    n: int = len(graph)
+    if samples is None or samples >= n:
+        sources: np.ndarray = np.arange(n)
+    else:
+        sources = np.random.default_rng(seed=seed).choice(n, size=samples, replace=False)
+
+    centrality: np.ndarray = np.zeros(n)
+    for source in sources:
+        distance: np.ndarray = np.full(n, -1, dtype=np.int64)
+        paths: np.ndarray = np.zeros(n)  # Number of shortest paths from the source
+        distance[source], paths[source] = 0, 1.0
+        frontier: np.ndarray = np.array([source], dtype=np.int64)
+        levels: list[tuple[np.ndarray, np.ndarray]] = []  # Edges between consecutive levels, to walk back afterwards
+        depth: int = 0
+        while len(frontier):
+            parents: np.ndarray = np.repeat(frontier, graph.offsets[frontier + 1] - graph.offsets[frontier])
+            children: np.ndarray = graph.gather_neighbors(node_ids=frontier).astype(np.int64)
+            distance[children[distance[children] == -1]] = depth + 1
+            on_path: np.ndarray = distance[children] == depth + 1
+            parents, children = parents[on_path], children[on_path]
+            paths += np.bincount(children, weights=paths[parents], minlength=n)
+            levels.append((parents, children))
+            frontier = np.unique(children)
+            depth += 1
+
+        dependency: np.ndarray = np.zeros(n)
+        for parents, children in reversed(levels):
+            dependency += np.bincount(parents, weights=paths[parents] / paths[children] * (1 + dependency[children]), minlength=n)
+        dependency[source] = 0
+        centrality += dependency
+
+    # Every unordered pair is found from both of its ends when all sources are used
+    return pd.DataFrame(data={"uniprot_id": graph.nodes, "betweenness": centrality * n / max(len(sources), 1) / 2})
@@ -0,0 +1,185 @@
+'''
+In this file, the asyncio counterpart of Query is defined.
+AsyncQuery runs the lookups of an async web service on SQLAlchemy's asyncio extension, so they do not block the event
+loop. Like Query, it keeps no session between calls: every call takes a connection from the pool of the engine and
+returns it when it is done, so one instance can serve any number of concurrent requests. Create the engine with
+`create_async_pooled_engine` and an asyncio driver, aiosqlite for SQLite and asyncmy or aiomysql for MySQL.
+'''
+
+from typing import Iterable
+
+from sqlalchemy import Select, bindparam, func, select, union
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from biogrid.db.manager import in_clause_batch_size, select_interactions
+from biogrid.db.models import Interaction, Organism, Protein, TableCount
+
+# Built once, as building the statement costs about as much as running it on an indexed lookup. One branch per side, so
+# each can use the index leading with its interactor column
+_partners_statement = union(
+    select(Interaction.interactor_b_id).where(Interaction.interactor_a_id == bindparam("uniprot_id")),
+    select(Interaction.interactor_a_id).where(Interaction.interactor_b_id == bindparam("uniprot_id")),
+)
+
+
+class AsyncQuery:
+    """
+    Class to handle queries to the database from asyncio code.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """
+        Initialize the AsyncQuery class.
+
+        Args:
+            engine (AsyncEngine): The SQLAlchemy asyncio engine to use for the database connection.
+        """
+        self.engine: AsyncEngine = engine
+        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(bind=self.engine)
+
+    async def _count(self, model: type) -> int:
+        """
+        Count the rows of a table, from the table_count summary written by the Importer.
+
+        Args:
+            model (type): The mapped class of the table.
+
+        Returns:
+            int: The number of rows.
+        """
+        async with self.session_factory() as session:
+            try:
+                count: int | None = (await session.execute(
+                    select(TableCount.rows).where(TableCount.table_name == model.__tablename__)
+                )).scalar_one_or_none()
+            except DBAPIError:  # The table is missing
+                await session.rollback()
+                count = None
+            # Databases imported before the summaries existed are counted the slow way
+            if count is None:
+                count = (await session.execute(select(func.count()).select_from(model))).scalar_one()
+            return count
+
+    async def count_proteins(self) -> int:
+        """
+        Count the number of proteins in the database.
+
+        Returns:
+            int: The number of proteins.
+        """
+        return await self._count(model=Protein)
+
+    async def count_organisms(self) -> int:
+        """
+        Count the number of organisms in the database.
+
+        Returns:
+            int: The number of organisms.
+        """
+        return await self._count(model=Organism)
+
+    async def count_interactions(self) -> int:
+        """
+        Count the number of interactions in the database.
+
+        Returns:
+            int: The number of interactions.
+        """
+        return await self._count(model=Interaction)
+
+    async def partners(self, uniprot_id: str) -> list[str]:
+        """
+        Get the interaction partners of a protein, on either side of its interactions.
+
+        Args:
+            uniprot_id (str): The UniProt ID of the protein.
+
+        Returns:
+            list[str]: The sorted UniProt IDs of the partners. Empty for unknown proteins.
+        """
+        async with self.session_factory() as session:
+            return sorted(
+                (await session.execute(_partners_statement, {"uniprot_id": uniprot_id.strip().upper()})).scalars().all()
+            )
+
+    async def partners_many(self, uniprot_ids: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Get the interaction partners of many proteins, using IN clauses of at most `in_clause_batch_size` IDs, all on
+        one connection.
+
+        Args:
+            uniprot_ids (Iterable[str]): The UniProt IDs of the proteins.
+
+        Returns:
+            dict[str, list[str]]: The sorted UniProt IDs of the partners of every given protein, keyed by the normalized
+                UniProt ID, e.g. "P0DTC2" for " p0dtc2". Empty for unknown proteins.
+        """
+        # Normalized like the stored IDs, which the rows return whatever the case of the IDs they were matched with
+        unique_ids: list[str] = list(dict.fromkeys(uniprot_id.strip().upper() for uniprot_id in uniprot_ids))
+        partners: dict[str, set[str]] = {uniprot_id: set() for uniprot_id in unique_ids}
+        async with self.session_factory() as session:
+            for start in range(0, len(unique_ids), in_clause_batch_size):
+                batch: list[str] = unique_ids[start:start + in_clause_batch_size]
+                statement = union(
+                    select(Interaction.interactor_a_id, Interaction.interactor_b_id).where(Interaction.interactor_a_id.in_(batch)),
+                    select(Interaction.interactor_b_id, Interaction.interactor_a_id).where(Interaction.interactor_b_id.in_(batch)),
+                )
+                for uniprot_id, partner_id in (await session.execute(statement)).all():
+                    partners[uniprot_id].add(partner_id)
+        return {uniprot_id: sorted(partner_ids) for uniprot_id, partner_ids in partners.items()}
+
+    async def organism_interactions(self, tax_id: int, limit: int | None = 100, offset: int = 0) -> list[dict]:
+        """
+        List the interactions with at least one interactor of an organism, ordered by interaction id.
+
+        Args:
+            tax_id (int): The tax_id of the organism.
+            limit (int | None): The maximum number of interactions to return, for paging. None returns all of them.
+                Defaults to 100.
+            offset (int): The number of interactions to skip, for paging. Defaults to 0.
+
+        Returns:
+            list[dict]: The interactions, with the columns of `Importer.get_interaction_df`.
+        """
+        protein = aliased(Protein)
+        # The proteins of the organism come from the tax_id index, and their interactions from the interactor indexes
+        organism_ids: Select = select(Interaction.id).join(protein, Interaction.interactor_a_id == protein.uniprot_id).where(
+            protein.tax_id == tax_id
+        ).union(
+            select(Interaction.id).join(protein, Interaction.interactor_b_id == protein.uniprot_id).where(protein.tax_id == tax_id)
+        ).subquery()
+        statement: Select = (
+            select_interactions()
+            .where(Interaction.id.in_(select(organism_ids.c.id)))
+            .order_by(Interaction.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        async with self.session_factory() as session:
+            return [dict(row) for row in (await session.execute(statement)).mappings().all()]
+
+    async def proteins_many(self, uniprot_ids: Iterable[str]) -> list[dict]:
+        """
+        Look up many proteins with their organism, using IN clauses of at most `in_clause_batch_size` IDs, all on one
+        connection.
+
+        Args:
+            uniprot_ids (Iterable[str]): The UniProt IDs of the proteins.
+
+        Returns:
+            list[dict]: uniprot_id, symbol, tax_id and organism_name of every protein found, in the order of the IDs.
+        """
+        unique_ids: list[str] = list(dict.fromkeys(uniprot_id.strip().upper() for uniprot_id in uniprot_ids))
+        found: dict[str, dict] = {}
+        async with self.session_factory() as session:
+            for start in range(0, len(unique_ids), in_clause_batch_size):
+                batch: list[str] = unique_ids[start:start + in_clause_batch_size]
+                statement: Select = (
+                    select(Protein.uniprot_id, Protein.symbol, Protein.tax_id, Organism.name.label("organism_name"))
+                    .outerjoin(Organism, Protein.tax_id == Organism.tax_id)
+                    .where(Protein.uniprot_id.in_(batch))
+                )
+                found.update({row["uniprot_id"]: dict(row) for row in (await session.execute(statement)).mappings().all()})
+        return [found[uniprot_id] for uniprot_id in unique_ids if uniprot_id in found]
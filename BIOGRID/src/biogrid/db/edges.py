@@ -0,0 +1,138 @@
+'''
+In this file, the canonical edges of the interaction network are computed.
+BioGRID reports the same interaction as A-B and as B-A, and again for every experimental system which detected it.
+The interaction_edge table keeps one row per unordered pair of proteins and experimental system, with the pair ordered
+so that protein_a_id <= protein_b_id and the number of interactions reporting it as evidence. Whether two proteins
+interact is then one probe of its primary key instead of an OR over both interactor columns of the interaction table.
+The Importer aggregates the edges with pandas while it loads a release, and recomputes them in SQL after an update.
+'''
+
+from __future__ import annotations
+
+from sqlalchemy import Connection, Select, case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from biogrid.db.models import Interaction, InteractionEdge
+from biogrid.db.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+edge_columns: list[str] = ["protein_a_id", "protein_b_id", "experimental_system_id"]
+
+
+def canonical_pair(uniprot_id_a: str, uniprot_id_b: str) -> tuple[str, str]:
+    """
+    Order a pair of proteins the way the interaction_edge table stores it.
+
+    Args:
+        uniprot_id_a (str): The UniProt ID of one protein.
+        uniprot_id_b (str): The UniProt ID of the other protein.
+
+    Returns:
+        tuple[str, str]: The smaller and the larger ID.
+    """
+    return (uniprot_id_a, uniprot_id_b) if uniprot_id_a <= uniprot_id_b else (uniprot_id_b, uniprot_id_a)
+
+
+def _distinct(ids: pd.Series) -> np.ndarray:
+    """
+    Get the distinct values of an ID column, from its categories if it is categorical.
+
+    Args:
+        ids (pd.Series): The IDs.
+
+    Returns:
+        np.ndarray: The distinct IDs.
+    """
+    return ids.cat.categories.to_numpy() if isinstance(ids.dtype, pd.CategoricalDtype) else ids.unique()
+
+
+def _positions(ids: pd.Series, index: pd.Index) -> np.ndarray:
+    """
+    Get the position of every ID in a sorted index, looking every category up once if the column is categorical.
+
+    Args:
+        ids (pd.Series): The IDs.
+        index (pd.Index): The sorted distinct IDs.
+
+    Returns:
+        np.ndarray: The position of every ID.
+    """
+    if isinstance(ids.dtype, pd.CategoricalDtype):
+        return index.get_indexer(ids.cat.categories)[ids.cat.codes.to_numpy()]
+    return index.get_indexer(ids)
+
+
+def aggregate_edges(interactions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count the interactions of every unordered pair of proteins and experimental system.
+    The IDs are replaced by their positions in the sorted distinct IDs, which order like the IDs, so the pairs are
+    ordered and grouped on integers.
+
+    Args:
+        interactions (pd.DataFrame): Interaction rows with the columns interactor_a_id, interactor_b_id and
+            experimental_system_id, as inserted by the Importer.
+
+    Returns:
+        pd.DataFrame: The columns protein_a_id, protein_b_id, experimental_system_id and evidence.
+    """
+    a, b = interactions["interactor_a_id"], interactions["interactor_b_id"]
+    ids: pd.Index = pd.Index(np.union1d(_distinct(ids=a), _distinct(ids=b)))
+    positions_a, positions_b = _positions(ids=a, index=ids), _positions(ids=b, index=ids)
+    pairs = pd.DataFrame({
+        "protein_a_id": np.minimum(positions_a, positions_b),
+        "protein_b_id": np.maximum(positions_a, positions_b),
+        "experimental_system_id": interactions["experimental_system_id"].array,
+    })
+    edges: pd.DataFrame = pairs.groupby(by=edge_columns, sort=False).size().reset_index(name="evidence")
+    edges["protein_a_id"] = ids.take(edges["protein_a_id"]).to_numpy()
+    edges["protein_b_id"] = ids.take(edges["protein_b_id"]).to_numpy()
+    return edges
+
+
+def combine_edges(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Add up the edges aggregated from the chunks of a release.
+
+    Args:
+        frames (list[pd.DataFrame]): The edges of every chunk, from `aggregate_edges`.
+
+    Returns:
+        pd.DataFrame: The edges of the release, in the order of the primary key, which is the cheapest to insert.
+    """
+    if not frames:
+        return pd.DataFrame(columns=[*edge_columns, "evidence"])
+    if len(frames) == 1:
+        return frames[0].sort_values(by=edge_columns, ignore_index=True)
+    return pd.concat(objs=frames, ignore_index=True).groupby(by=edge_columns)["evidence"].sum().reset_index()
+
+
+def edges_select() -> Select:
+    """
+    Build the statement which computes the edges from the interaction table.
+
+    Returns:
+        Select: The statement, with the columns of the interaction_edge table in order.
+    """
+    ordered = Interaction.interactor_a_id <= Interaction.interactor_b_id
+    protein_a_id = case((ordered, Interaction.interactor_a_id), else_=Interaction.interactor_b_id)
+    protein_b_id = case((ordered, Interaction.interactor_b_id), else_=Interaction.interactor_a_id)
+    return select(
+        protein_a_id.label("protein_a_id"),
+        protein_b_id.label("protein_b_id"),
+        Interaction.experimental_system_id,
+        func.count().label("evidence"),
+    ).group_by(protein_a_id, protein_b_id, Interaction.experimental_system_id)
+
+
+def refresh_edges(connection: Connection | Session) -> None:
+    """
+    Recompute the interaction_edge table, in the transaction of the connection.
+
+    Args:
+        connection (Connection | Session): The connection or session of the transaction which changed the data.
+    """
+    table = InteractionEdge.__table__
+    connection.execute(delete(table))
+    connection.execute(insert(table).from_select([column.name for column in table.columns], edges_select()))
@@ -0,0 +1,221 @@
+'''
+In this file, the interaction table is turned into an in-memory graph in compressed sparse row (CSR) form.
+Every protein is interned to an integer node id, and the neighbors of node i are neighbors[offsets[i]:offsets[i + 1]],
+so a lookup is an array slice instead of a database query and an edge costs 4 bytes instead of one ORM object.
+'''
+
+from __future__ import annotations
+
+from biogrid.db.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+class InteractionGraph:
+    """
+    Undirected protein interaction graph stored as CSR arrays.
+    An interaction between A and B is stored in both directions, and several interactions between the same two
+    proteins (e.g. from different experimental systems) collapse into one edge.
+
+    Attributes:
+        nodes (np.ndarray): The uniprot_id of every node, sorted. The position of an id is its node id.
+        offsets (np.ndarray): int64 array of length n + 1, the neighbors of node i start at offsets[i].
+        neighbors (np.ndarray): int32 array with the sorted neighbor node ids of all nodes, one after the other.
+    """
+
+    def __init__(self, nodes: np.ndarray, offsets: np.ndarray, neighbors: np.ndarray) -> None:
+        """
+        Initialize the InteractionGraph class from its CSR arrays. Use `from_edges` to build it from interactions.
+
+        Args:
+            nodes (np.ndarray): The sorted uniprot_id of every node.
+            offsets (np.ndarray): Start of the neighbors of every node, followed by the total number of entries.
+            neighbors (np.ndarray): The neighbor node ids of all nodes.
+        """
+        self.nodes: np.ndarray = nodes
+        self.offsets: np.ndarray = offsets
+        self.neighbors: np.ndarray = neighbors
+        self._node_ids: dict[str, int] = {uniprot_id: node_id for node_id, uniprot_id in enumerate(nodes.tolist())}
+
+    @classmethod
+    def from_edges(cls, interactor_a_ids: np.ndarray, interactor_b_ids: np.ndarray, extra_nodes: np.ndarray | None = None) -> "InteractionGraph":
+        """
+        Build the graph from the two interactor columns of the interaction table.
+
+        Args:
+            interactor_a_ids (np.ndarray): The uniprot_id of the first interactor of every interaction.
+            interactor_b_ids (np.ndarray): The uniprot_id of the second interactor of every interaction.
+            extra_nodes (np.ndarray | None): Further uniprot_ids to add as nodes, e.g. proteins without interactions.
+
+        Returns:
+            InteractionGraph: The graph.
+        """
+        endpoints: np.ndarray = np.concatenate([np.asarray(interactor_a_ids, dtype=object), np.asarray(interactor_b_ids, dtype=object)])
+        if extra_nodes is not None:
+            endpoints = np.concatenate([endpoints, np.asarray(extra_nodes, dtype=object)])
+        codes, nodes = pd.factorize(values=endpoints, sort=True)
+        n_edges: int = len(interactor_a_ids)
+        source: np.ndarray = codes[:n_edges]
+        target: np.ndarray = codes[n_edges:2 * n_edges]
+
+        # Store both directions, then sort by (source, target) and drop the repeated pairs
+        source, target = np.concatenate([source, target]), np.concatenate([target, source])
+        pairs: np.ndarray = np.unique(source.astype(np.int64) * len(nodes) + target)
+        source, target = np.divmod(pairs, len(nodes))
+        offsets: np.ndarray = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source, minlength=len(nodes)), out=offsets[1:])
+        return cls(nodes=np.asarray(nodes, dtype=object), offsets=offsets, neighbors=target.astype(np.int32))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, uniprot_id: str) -> bool:
+        return uniprot_id in self._node_ids
+
+    def __repr__(self) -> str:
+        return f"InteractionGraph(nodes={len(self)}, edges={self.edge_count()})"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the CSR arrays in bytes, without the uniprot_id strings.
+
+        Returns:
+            int: The number of bytes used by offsets and neighbors.
+        """
+        return self.offsets.nbytes + self.neighbors.nbytes
+
+    def edge_count(self) -> int:
+        """
+        Count the undirected edges. A self interaction counts as one edge.
+
+        Returns:
+            int: The number of distinct interacting protein pairs.
+        """
+        self_loops: int = int(np.count_nonzero(self.neighbors == np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.offsets))))
+        return (len(self.neighbors) - self_loops) // 2 + self_loops
+
+    def node_id(self, uniprot_id: str) -> int:
+        """
+        Get the node id of a protein.
+
+        Args:
+            uniprot_id (str): The uniprot_id of the protein.
+
+        Returns:
+            int: The node id.
+
+        Raises:
+            KeyError: If the protein is not in the graph.
+        """
+        return self._node_ids[uniprot_id]
+
+    def neighbor_ids(self, node_id: int) -> np.ndarray:
+        """
+        Get the neighbor node ids of a node. The result is a view on the CSR array and must not be modified.
+
+        Args:
+            node_id (int): The node id.
+
+        Returns:
+            np.ndarray: The sorted neighbor node ids.
+        """
+        return self.neighbors[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def partners(self, uniprot_id: str) -> list[str]:
+        """
+        Get the interaction partners of a protein.
+
+        Args:
+            uniprot_id (str): The uniprot_id of the protein.
+
+        Returns:
+            list[str]: The sorted uniprot_ids of its partners.
+        """
+        return self.nodes[self.neighbor_ids(node_id=self.node_id(uniprot_id=uniprot_id))].tolist()
+
+    def degree(self, uniprot_id: str) -> int:
+        """
+        Get the number of distinct interaction partners of a protein.
+
+        Args:
+            uniprot_id (str): The uniprot_id of the protein.
+
+        Returns:
+            int: The degree of the protein.
+        """
+        node_id: int = self.node_id(uniprot_id=uniprot_id)
+        return int(self.offsets[node_id + 1] - self.offsets[node_id])
+
+    def degrees(self) -> np.ndarray:
+        """
+        Get the degree of every node.
+
+        Returns:
+            np.ndarray: The degrees, indexed by node id.
+        """
+        return np.diff(self.offsets)
+
+    def gather_neighbors(self, node_ids: np.ndarray) -> np.ndarray:
+        """
+        Gather the neighbors of several nodes at once.
+
+        Args:
+            node_ids (np.ndarray): The node ids to expand.
+
+        Returns:
+            np.ndarray: The concatenated neighbor node ids, possibly with repetitions.
+        """
+        starts: np.ndarray = self.offsets[node_ids]
+        lengths: np.ndarray = self.offsets[node_ids + 1] - starts
+        # Position of every gathered entry in the neighbors array, without a Python loop over the frontier
+        positions: np.ndarray = np.arange(lengths.sum()) + np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.neighbors[positions]
+
+    def k_hop(self, uniprot_id: str, k: int) -> list[str]:
+        """
+        Get the proteins which can be reached from a protein in at most k interactions.
+
+        Args:
+            uniprot_id (str): The uniprot_id of the protein to start from.
+            k (int): The maximum number of hops.
+
+        Returns:
+            list[str]: The sorted uniprot_ids of the reached proteins, including the start protein.
+        """
+        if k < 0:
+            raise ValueError(f"k must not be negative, got {k}")
+        visited: np.ndarray = np.zeros(len(self), dtype=bool)
+        frontier: np.ndarray = np.array([self.node_id(uniprot_id=uniprot_id)], dtype=np.int64)
+        visited[frontier] = True
+        for _ in range(k):
+            reached: np.ndarray = self.gather_neighbors(node_ids=frontier)
+            frontier = np.unique(reached[~visited[reached]]).astype(np.int64)
+            if len(frontier) == 0:
+                break
+            visited[frontier] = True
+        return self.nodes[visited].tolist()
+
+    def subgraph(self, uniprot_ids: list[str]) -> "InteractionGraph":
+        """
+        Extract the subgraph induced by some proteins, i.e. those proteins and all edges between them.
+
+        Args:
+            uniprot_ids (list[str]): The uniprot_ids of the proteins. Ids which are not in the graph are ignored.
+
+        Returns:
+            InteractionGraph: The induced subgraph, with its own node ids.
+        """
+        kept_nodes: np.ndarray = np.unique(np.array(
+            [self._node_ids[uniprot_id] for uniprot_id in uniprot_ids if uniprot_id in self._node_ids], dtype=np.int64
+        ))
+        # Only the neighbor lists of the kept nodes are visited, so the cost does not depend on the size of the graph.
+        # The new id of a kept node is its position in kept_nodes, which keeps the nodes sorted by uniprot_id
+        neighbors: np.ndarray = self.gather_neighbors(node_ids=kept_nodes)
+        sources: np.ndarray = np.repeat(np.arange(len(kept_nodes)), self.offsets[kept_nodes + 1] - self.offsets[kept_nodes])
+        new_ids: np.ndarray = np.minimum(np.searchsorted(kept_nodes, neighbors), max(len(kept_nodes) - 1, 0))
+        kept_entries: np.ndarray = kept_nodes[new_ids] == neighbors if len(kept_nodes) else np.zeros(0, dtype=bool)
+        offsets: np.ndarray = np.zeros(len(kept_nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources[kept_entries], minlength=len(kept_nodes)), out=offsets[1:])
+        return InteractionGraph(nodes=self.nodes[kept_nodes], offsets=offsets, neighbors=new_ids[kept_entries].astype(np.int32))
@@ -0,0 +1,64 @@
+'''
+In this file, the lazy import of heavy modules is defined.
+pandas and numpy take most of the time spent importing biogrid.db.manager, while a command like `biogrid count` only
+reads one row through SQLAlchemy. The modules of the package bind them with `lazy_import`, which runs the module on the
+first access to one of its attributes, together with `from __future__ import annotations`, so that the annotations
+naming pd.DataFrame or np.ndarray do not count as accesses.
+pyarrow is an optional dependency, which `import_pyarrow` imports where a feature needs it.
+'''
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module the first time one of its attributes is used. A module which was imported already is returned as
+    it is.
+
+    Args:
+        name (str): The name of the module, e.g. "pandas".
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed.
+
+    Returns:
+        ModuleType: The module, which is in sys.modules, so that a later `import` statement gets the same object.
+    """
+    with _lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        return module
+
+
+def import_pyarrow(feature: str):
+    """
+    Import pyarrow, which is an optional dependency.
+
+    Args:
+        feature (str): The feature which needs pyarrow, for the error message, e.g. "The release cache".
+
+    Returns:
+        The pyarrow module with its ipc submodule loaded.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ImportError(f"{feature} needs pyarrow, install it with `pip install biogrid[arrow]`") from e
+    return pyarrow
@@ -1,18 +1,54 @@
-import pandas as pd
+from __future__ import annotations
+
+import gzip
+import multiprocessing
 import os
-from sqlalchemy import Column, Engine, ForeignKey, Integer, String, create_engine
-from sqlalchemy.orm import (
-    DeclarativeBase,
-    Mapped,
-    mapped_column,
-    relationship,
-    sessionmaker
-)
-from typing import Literal
+import queue
+import time
+import zipfile
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing.managers import SyncManager
+from sqlalchemy import Column, Connection, Engine, MetaData, Select, String, Table, create_engine, delete, event, func, insert, select, text, union, update
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import aliased, sessionmaker
+from typing import IO, Callable, Iterable, Iterator, Literal
 
 from sqlalchemy.orm.session import Session
 
-from biogrid.db.models import Base, Interaction, Organism, Protein
+from biogrid.db import analytics
+from biogrid.db.engine import sqlite_database_file
+from biogrid.db.edges import aggregate_edges, canonical_pair, combine_edges, refresh_edges
+from biogrid.db.graph import InteractionGraph
+from biogrid.db.partitions import create_partition, drop_partition, partition_table, stored_partitions
+from biogrid.db.models import (
+    Base,
+    DatasetGeneration,
+    ExperimentalSystem,
+    ExperimentalSystemSummary,
+    Interaction,
+    InteractionEdge,
+    Organism,
+    OrganismPairSummary,
+    OrganismSummary,
+    Protein,
+    TableCount,
+)
+from biogrid.db.release_cache import ReleaseCache
+from biogrid.db.reload import discard_shadow, prepare_shadow, restore_previous, set_generation, swap_in, table_counts, validate_counts
+from biogrid.db.report import ImportReport, peak_rss_bytes
+from biogrid.db.result_cache import ResultCache
+from biogrid.db.search import create_search_index, refresh_search_index, search_statement
+from biogrid.db.snapshot import write_snapshot
+from biogrid.db.summaries import check_summaries, refresh_summaries
+from biogrid.db.lazy import import_pyarrow, lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 # This is the list copied from the test_software.py file
 normalized_column_names: list[str] = [
@@ -30,37 +66,360 @@ normalized_column_names: list[str] = [
     "organism_name_interactor_b",
 ]
 
+# Types used when parsing the required columns. The text columns are read as categoricals, as BioGRID writes missing values
+# as '-' and the strings repeat across rows, e.g. a few dozen experimental systems and every protein once per interaction:
+# every distinct string is stored once and every row holds a small integer code. Tax ids fit in 32 bits.
+# The interaction id is left to pandas to infer
+column_dtypes: dict[str, str] = {
+    column: "int32" if column in ("organism_id_interactor_a", "organism_id_interactor_b") else "category"
+    for column in normalized_column_names
+    if column != "biogrid_interaction_id"
+}
+
+# Symbols which are '-' end up as str(None) in the protein table, see `_replace_missing`
+symbol_columns: tuple[str, str] = ("official_symbol_interactor_a", "official_symbol_interactor_b")
+
+# Rows per chunk when the file is normalized by several workers and no chunksize was given
+parallel_chunksize: int = 100_000
+
+# Normalized chunks a worker reading a member of a .zip archive can send ahead before it waits for the main process
+member_queue_size: int = 2
+
+# Maximum number of keys put into one IN (...) clause, well below the bound parameter limits of SQLite and MySQL
+in_clause_batch_size: int = 500
+
+# Tells a cache miss apart from a cached None
+_missing = object()
+
+# The number of generation changes committed by this process, which tells its Query instances to read the generation again
+_generation_changes: int = 0
+
+
+def _count_generation_change(*args) -> None:
+    """
+    Count a committed change of the generation, e.g. from the after_commit event of a session.
+    """
+    global _generation_changes
+    _generation_changes += 1
+
+
+def read_generation(connection: Connection | Session) -> int:
+    """
+    Read the generation of the dataset, which the Importer increments with every committed import and update.
+
+    Args:
+        connection (Connection | Session): The connection or session to read with.
+
+    Returns:
+        int: The generation. 0 if the database has never been imported into by this version of the Importer.
+    """
+    try:
+        generation: int | None = connection.execute(
+            select(DatasetGeneration.generation).where(DatasetGeneration.id == 1)
+        ).scalar_one_or_none()
+    except DBAPIError:  # The table is missing
+        connection.rollback()
+        return 0
+    return generation or 0
+
+
+def bump_generation(connection: Connection | Session) -> None:
+    """
+    Increment the generation of the dataset, in the transaction which changes the data.
+
+    Args:
+        connection (Connection | Session): The connection or session of the transaction.
+    """
+    table: Table = DatasetGeneration.__table__
+    if not connection.execute(update(table).where(table.c.id == 1).values(generation=table.c.generation + 1)).rowcount:
+        connection.execute(insert(table).values(id=1, generation=1))
+    # The queries of this process do not wait for their generation_ttl to see the change, once it is committed
+    event.listen(connection, "after_commit" if isinstance(connection, Session) else "commit", _count_generation_change, once=True)
+
+
+def select_interactions() -> Select:
+    """
+    Build the statement reading the interactions with the names of their experimental system, i.e. in the columns of
+    `Importer.get_interaction_df`.
+
+    Returns:
+        Select: The statement, to filter, order and page further.
+    """
+    return select(
+        Interaction.id,
+        Interaction.interactor_a_id,
+        Interaction.interactor_b_id,
+        Interaction.score,
+        ExperimentalSystem.name.label("experimental_system"),
+        ExperimentalSystem.type.label("experimental_system_type"),
+    ).join(ExperimentalSystem, Interaction.experimental_system_id == ExperimentalSystem.id)
+
+
+def _concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate DataFrames with the same columns, keeping the categorical columns categorical even if their categories
+    differ, which `pd.concat` would turn into object columns.
+
+    Args:
+        frames (list[pd.DataFrame]): The DataFrames.
+
+    Returns:
+        pd.DataFrame: The rows of all DataFrames, with a new RangeIndex.
+    """
+    columns: dict[str, pd.Series | pd.Categorical] = {}
+    for column in frames[0].columns:
+        parts: list[pd.Series] = [frame[column] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[column] = pd.api.types.union_categoricals(to_union=parts)
+        else:
+            columns[column] = pd.concat(objs=parts, ignore_index=True)
+    return pd.DataFrame(data=columns)
+
+
+def _stack(first: pd.Series, second: pd.Series, name: str) -> pd.Series:
+    """
+    Stack two columns into one, e.g. the interactor A and interactor B columns. Categorical columns only stack their
+    integer codes, without materializing the strings.
+
+    Args:
+        first (pd.Series): The values which come first.
+        second (pd.Series): The values which come after.
+        name (str): The name of the stacked column.
+
+    Returns:
+        pd.Series: The values of both columns, with a new RangeIndex.
+    """
+    if isinstance(first.dtype, pd.CategoricalDtype) and isinstance(second.dtype, pd.CategoricalDtype):
+        return pd.Series(data=pd.api.types.union_categoricals(to_union=[first, second]), name=name)
+    return pd.Series(data=np.concatenate([first.to_numpy(), second.to_numpy()]), name=name)
+
+
+def _map_strings(series: pd.Series, function: Callable[[pd.Series], pd.Series], na_value: str | None = None) -> pd.Series:
+    """
+    Apply a string transformation, e.g. stripping and upper-casing, to the values of a column converted with `astype(str)`.
+    For a categorical column, only the categories are transformed, and categories which become equal are merged.
+
+    Args:
+        series (pd.Series): The column.
+        function (Callable[[pd.Series], pd.Series]): The transformation of a Series of strings.
+        na_value (str | None): What missing values of a categorical column become. Defaults to None, which keeps them
+            missing. Object columns convert them with `astype(str)`.
+
+    Returns:
+        pd.Series: The transformed column, with the index of the input.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return function(series.astype(dtype=str))
+    codes: np.ndarray = series.cat.codes.to_numpy()
+    categories: list[str] = series.cat.categories.astype(dtype=str).to_list()
+    if na_value is not None:
+        # Missing values take the code of an extra category
+        codes = np.where(codes < 0, len(categories), codes)
+        categories.append(na_value)
+    new_codes, new_categories = pd.factorize(values=function(pd.Series(data=categories, dtype=object)))
+    codes = np.where(codes < 0, -1, new_codes[np.maximum(codes, 0)])
+    return pd.Series(
+        data=pd.Categorical.from_codes(codes=codes, categories=new_categories), index=series.index, name=series.name
+    )
+
+
+def _replace_missing(df: pd.DataFrame) -> None:
+    """
+    Replace the '-' which BioGRID writes for missing values with None, in place. In categorical columns, the '-'
+    category is removed, which makes its rows missing, except in the symbol columns where it is renamed to 'None': the
+    protein table stores the symbols with `astype(str)`, which turns None into 'None'.
+
+    Args:
+        df (pd.DataFrame): The DataFrame.
+    """
+    object_columns: list[str] = []
+    for column in df.columns:
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            object_columns.append(column)
+        elif '-' in df[column].cat.categories:
+            if column in symbol_columns:
+                df[column] = _map_strings(series=df[column], function=lambda values: values.replace(to_replace='-', value="None"))
+            else:
+                df[column] = df[column].cat.remove_categories(removals=['-'])
+    if object_columns:
+        df[object_columns] = df[object_columns].replace(to_replace='-', value=None)
+
+
+@dataclass
+class UpdateSummary:
+    """
+    Summary of the changes applied by `Importer.update_data`.
+
+    Attributes:
+        organisms_inserted (int): Number of organisms which were not stored before.
+        organisms_updated (int): Number of stored organisms whose name changed.
+        proteins_inserted (int): Number of proteins which were not stored before.
+        proteins_updated (int): Number of stored proteins whose symbol or tax_id changed.
+        interactions_inserted (int): Number of interactions which were not stored before.
+        interactions_updated (int): Number of stored interactions whose interactors, score or experimental system changed.
+        interactions_deleted (int): Number of stored interactions missing from the release which were deleted.
+        interactions_unchanged (int): Number of interactions which are identical in the release and the database.
+    """
+    organisms_inserted: int = 0
+    organisms_updated: int = 0
+    proteins_inserted: int = 0
+    proteins_updated: int = 0
+    interactions_inserted: int = 0
+    interactions_updated: int = 0
+    interactions_deleted: int = 0
+    interactions_unchanged: int = 0
+
+
+def _partition_keys(ids_a: pd.Series, ids_b: pd.Series, tax_ids: dict[str, int]) -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    Get the partition of every interaction or edge, from the organisms of its two proteins.
+
+    Args:
+        ids_a (pd.Series): The UniProt IDs of one side.
+        ids_b (pd.Series): The UniProt IDs of the other side.
+        tax_ids (dict[str, int]): The tax_id of every protein read so far.
+
+    Returns:
+        tuple[np.ndarray, list[np.ndarray]]: Whether the organisms of both proteins are known, and the smaller and the
+            larger tax_id of the rows where they are, i.e. their `partition_key`.
+    """
+    # Categorical columns are mapped once per category
+    tax_ids_a: pd.Series = ids_a.map(tax_ids).astype("Int64")
+    tax_ids_b: pd.Series = ids_b.map(tax_ids).astype("Int64")
+    known: np.ndarray = (tax_ids_a.notna() & tax_ids_b.notna()).to_numpy()
+    tax_ids_a_known: np.ndarray = tax_ids_a[known].to_numpy(dtype="int64")
+    tax_ids_b_known: np.ndarray = tax_ids_b[known].to_numpy(dtype="int64")
+    return known, [np.minimum(tax_ids_a_known, tax_ids_b_known), np.maximum(tax_ids_a_known, tax_ids_b_known)]
+
+
+@dataclass
+class _Partition:
+    """
+    A partition which `Importer.import_partitions` is building.
+
+    Attributes:
+        url (URL): The URL of the partition database.
+        protein_ids (set[str]): The proteins inserted into the partition so far.
+        system_ids (set[int]): The keys of the experimental systems inserted into the partition so far.
+        frames (list[pd.DataFrame]): The interactions routed to the partition and not written yet.
+        buffered (int): The number of interactions in `frames`.
+        interactions (int): The number of interactions routed to the partition so far.
+    """
+    url: URL
+    protein_ids: set[str] = field(default_factory=set)
+    system_ids: set[int] = field(default_factory=set)
+    frames: list[pd.DataFrame] = field(default_factory=list)
+    buffered: int = 0
+    interactions: int = 0
+
+
 class Importer:
     """
     Class to handle the import of data from a TSV file into the database.
     """
 
-    def __init__(self, file_path: str, engine: Engine) -> None:
+    def __init__(self, file_path: str, engine: Engine, batch_size: int = 10_000, recreate: bool = True, workers: int = 1,
+                 cache: bool = False, members: list[str] | None = None) -> None:
         """
         Initialize the Importer class.
 
         Args:
-            file_path (str): The path to the TSV file.
+            file_path (str): The path to the TSV file. It can also be a .gz file or a .zip archive as downloaded from
+                BioGRID, which are decompressed while reading without extracting them to disk.
             engine (Engine): The SQLAlchemy engine to use for the database connection.
+            batch_size (int): Number of rows sent to the database per executemany INSERT. Defaults to 10_000.
+            recreate (bool): Whether to drop and recreate all tables. Pass False to keep the stored data, e.g. to apply
+                a new release with `update_data`; missing tables are still created. Use `for_reload` to create an
+                Importer for `reload`. Defaults to True.
+            workers (int): Number of processes normalizing chunks of the file in parallel. With more than one, the file
+                is always read in chunks. The result is the same as with a single process. Defaults to 1.
+            cache (bool): Whether to cache the parsed file in an Arrow IPC file next to it, which later loads of the same
+                file memory-map instead of parsing it again. Needs pyarrow. Defaults to False.
+            members (list[str] | None): The members of a .zip archive to read, one after the other. Defaults to None,
+                which reads every .txt and .tsv member, e.g. all the organisms of a BIOGRID-ORGANISM archive.
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+        if workers < 1:
+            raise ValueError(f"workers must be a positive integer, got {workers}")
         self.file_path: str = file_path
         self.engine: Engine = engine  # Assign the engine to an instance attribute
-        self.session: Session = sessionmaker(bind=self.engine)()
-        self.recreate_db()
+        self.batch_size: int = batch_size
+        self.workers: int = workers
+        self.members: list[str] | None = members
+        self.recreate: bool = recreate
+        self.cache: ReleaseCache | None = (
+            ReleaseCache(source_path=os.path.join(os.getcwd(), file_path), members=members) if cache else None
+        )
+        # Every import opens a session of its own, whose connection goes back to the pool of the engine once it is closed
+        self.session_factory: sessionmaker[Session] = sessionmaker(bind=self.engine)
+        if recreate:
+            self.recreate_db()
+        else:
+            Base.metadata.create_all(bind=self.engine)
+            self._create_search_index()
+
+    @classmethod
+    def for_reload(cls, file_path: str, engine: Engine, batch_size: int = 10_000, workers: int = 1, cache: bool = False,
+                   members: list[str] | None = None) -> "Importer":
+        """
+        Create an Importer which reloads the live database of the engine with `reload`. Unlike the constructor, it never
+        drops the live tables.
+
+        Args:
+            file_path (str): The path to the TSV file, or a .gz file or .zip archive of it.
+            engine (Engine): The SQLAlchemy engine of the live database.
+            batch_size (int): Number of rows sent to the database per executemany INSERT. Defaults to 10_000.
+            workers (int): Number of processes normalizing chunks of the file in parallel. Defaults to 1.
+            cache (bool): Whether to cache the parsed file next to it. Needs pyarrow. Defaults to False.
+            members (list[str] | None): The members of a .zip archive to read. Defaults to None, for all of them.
+
+        Returns:
+            Importer: The importer.
+        """
+        return cls(
+            file_path=file_path, engine=engine, batch_size=batch_size, recreate=False, workers=workers, cache=cache, members=members
+        )
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the importer without its engine and session factory, which cannot be sent to the worker processes.
+
+        Returns:
+            dict: The attributes of the importer needed to normalize data.
+        """
+        state: dict = self.__dict__.copy()
+        del state["engine"], state["session_factory"]
+        return state
 
     def recreate_db(self) -> Literal[True]:
         """
         Recreate the database by dropping all tables and creating them again.
+        The generation of the dataset is carried over and incremented, so cached query results of the dropped data expire.
 
         Returns:
             Literal[True]: Returns True after recreating the database.
         """
-        name_of_db_file = str(self.engine).split('///')[1].split(')')[0]
-        if not os.path.exists(name_of_db_file):
+        name_of_db_file: str | None = sqlite_database_file(url=self.engine.url)
+        if name_of_db_file is not None and not os.path.exists(name_of_db_file):
             open(name_of_db_file, 'w').close()
+        with self.engine.connect() as connection:
+            generation: int = read_generation(connection=connection)
         Base.metadata.drop_all(bind=self.engine)
         Base.metadata.create_all(bind=self.engine)
-        return True    
+        self._create_search_index()
+        with self.engine.begin() as connection:
+            connection.execute(insert(DatasetGeneration.__table__).values(id=1, generation=generation + 1))
+        _count_generation_change()
+        return True
+
+    def _create_search_index(self) -> None:
+        """
+        Create the protein_search table and its full-text index, outside the transactions which import the data, as DDL
+        commits them implicitly on MySQL.
+        """
+        with self.engine.begin() as connection:
+            create_search_index(connection=connection)
 
     def _normalize_column_names(self, data: list) -> list:
         """
@@ -75,21 +434,156 @@ class Importer:
         new_data: list = [col.lower().replace('-', '_').replace(" ", "_").replace('#', '') for col in data]
         return new_data
     
-    def load_data(self) -> pd.DataFrame:
+    def archive_members(self) -> list[str | None]:
         """
-        Load the TSV file, normalize the column names, and return a new DataFrame with only the required columns.
+        List the members of the file to read. Only .zip archives have several members.
 
         Returns:
-            pd.DataFrame: The filtered DataFrame with normalized column names.
+            list[str | None]: The names of the members, or [None] if the file is not a .zip archive.
+        """
+        file_path: str = os.path.join(os.getcwd(), self.file_path)
+        if not file_path.endswith('.zip'):
+            return [None]
+        if self.members is not None:
+            return list(self.members)
+        with zipfile.ZipFile(file=file_path) as archive:
+            members: list[str] = [
+                info.filename for info in archive.infolist() if not info.is_dir() and info.filename.endswith(('.txt', '.tsv'))
+            ]
+        if not members:
+            raise ValueError(f"The archive {self.file_path} contains no .txt or .tsv file")
+        return members
+
+    @contextmanager
+    def _open_source(self, member: str | None = None) -> Iterator[IO[bytes]]:
+        """
+        Open the file, or one member of a .zip archive, for streaming its decompressed content.
+
+        Args:
+            member (str | None): The member of the .zip archive to open. Ignored for other files.
+
+        Yields:
+            IO[bytes]: The decompressed content.
         """
         file_path: str = os.path.join(os.getcwd(), self.file_path)
-        df: pd.DataFrame = pd.read_csv(filepath_or_buffer=file_path, sep='\t')
+        if file_path.endswith('.zip'):
+            with zipfile.ZipFile(file=file_path) as archive, archive.open(name=member) as file:
+                yield file
+        elif file_path.endswith('.gz'):
+            with gzip.open(filename=file_path, mode='rb') as file:
+                yield file
+        else:
+            with open(file_path, 'rb') as file:
+                yield file
+
+    def _read_options(self, member: str | None = None) -> dict:
+        """
+        Build the options of `pd.read_csv` which parse only the required columns with explicit types.
+
+        Args:
+            member (str | None): The member of the .zip archive to read. Ignored for other files.
+
+        Returns:
+            dict: The keyword arguments for `pd.read_csv`.
+        """
+        with self._open_source(member=member) as file:
+            header: list[str] = pd.read_csv(filepath_or_buffer=file, sep='\t', nrows=0).columns.to_list()
+        # Map the raw column names of the file onto the normalized names so that only those columns get parsed
+        raw_columns: dict[str, str] = {
+            raw: normalized for raw, normalized in zip(header, self._normalize_column_names(data=header))
+            if normalized in normalized_column_names
+        }
+        return {
+            "sep": '\t',
+            "usecols": list(raw_columns),
+            "dtype": {raw: column_dtypes[normalized] for raw, normalized in raw_columns.items() if normalized in column_dtypes},
+        }
+
+    def _read_tsv(self, member: str | None = None) -> pd.DataFrame:
+        """
+        Read the TSV file, parsing only the required columns with explicit types.
+
+        Args:
+            member (str | None): The member of the .zip archive to read. Ignored for other files.
+
+        Returns:
+            pd.DataFrame: The parsed file. Column names are not normalized yet.
+        """
+        options: dict = self._read_options(member=member)
+        with self._open_source(member=member) as file:
+            return pd.read_csv(filepath_or_buffer=file, **options)
+
+    def _read_tsv_chunks(self, chunksize: int, member: str | None = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream the TSV file in chunks, parsing only the required columns with explicit types.
+
+        Args:
+            chunksize (int): The maximum number of rows per chunk.
+            member (str | None): The member of the .zip archive to read. Ignored for other files.
+
+        Yields:
+            pd.DataFrame: The parsed chunks. Column names are not normalized yet.
+        """
+        options: dict = self._read_options(member=member)
+        with self._open_source(member=member) as file:
+            yield from pd.read_csv(filepath_or_buffer=file, chunksize=chunksize, **options)
+
+    def _select_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalize the column names of a freshly parsed DataFrame and put the required columns in their expected order.
+
+        Args:
+            df (pd.DataFrame): The parsed DataFrame.
+
+        Returns:
+            pd.DataFrame: The DataFrame with normalized column names.
+        """
         df.columns = self._normalize_column_names(data=df.columns.to_list())  # Normalize the column names
         selected_columns: list = normalized_column_names
-        df_filtered: pd.DataFrame = df[selected_columns]
+        return df[selected_columns]
+
+    def load_data(self) -> pd.DataFrame:
+        """
+        Load the TSV file, normalize the column names, and return a new DataFrame with only the required columns.
+        If the cache is enabled, a valid cache is loaded instead, and otherwise written after parsing the file.
+
+        Returns:
+            pd.DataFrame: The filtered DataFrame with normalized column names.
+        """
+        if self.cache is not None and (cached_df := self.cache.load()) is not None:
+            return cached_df
+
+        members: list[str | None] = self.archive_members()
+        if len(members) == 1:
+            df: pd.DataFrame = self._read_tsv(member=members[0])
+        else:
+            df = _concat_frames(frames=[self._read_tsv(member=member) for member in members])
+        df_filtered: pd.DataFrame = self._select_columns(df=df)
 
+        if self.cache is not None:
+            self.cache.store(df=df_filtered)
         return df_filtered
 
+    def iter_data(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Stream the TSV file in chunks, so that the memory used does not grow with the size of the file.
+        If the cache is enabled and valid, the chunks are read from the cache instead. The cache is only written by `load_data`.
+
+        Args:
+            chunksize (int): The maximum number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: A chunk with the same columns as the DataFrame returned by `load_data`.
+        """
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be a positive integer, got {chunksize}")
+        if self.cache is not None and (cached_chunks := self.cache.iter_chunks(chunksize=chunksize)) is not None:
+            yield from cached_chunks
+            return
+        for member in self.archive_members():
+            for chunk in self._read_tsv_chunks(chunksize=chunksize, member=member):
+                yield self._select_columns(df=chunk)
+
     def get_interaction_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Process the DataFrame to extract interaction data. It is important to note that there can be instances where the values are None
@@ -115,13 +609,14 @@ class Importer:
         df_interaction = df_interaction.dropna(subset=['interactor_a_id', 'interactor_b_id'])
 
         # Ensure IDs are cleaned and uppercase
-        df_interaction["interactor_a_id"] = df_interaction["interactor_a_id"].astype(str).str.strip().str.upper()
-        df_interaction["interactor_b_id"] = df_interaction["interactor_b_id"].astype(str).str.strip().str.upper()
+        df_interaction["interactor_a_id"] = _map_strings(series=df_interaction["interactor_a_id"], function=lambda ids: ids.str.strip().str.upper())
+        df_interaction["interactor_b_id"] = _map_strings(series=df_interaction["interactor_b_id"], function=lambda ids: ids.str.strip().str.upper())
 
         # Remove duplicate interaction IDs
         df_interaction = df_interaction.drop_duplicates(subset=['id']).reset_index(drop=True)
 
-        return df_interaction.replace(to_replace='-', value=None)
+        _replace_missing(df=df_interaction)
+        return df_interaction
 
     def get_proteins_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -136,23 +631,19 @@ class Importer:
             pd.DataFrame: The processed DataFrame with protein data.
         """
         df.columns = self._normalize_column_names(data=df.columns.to_list())
-        # Since we want to cover all the instances of the uniprot_id, symbol, and name, we will create separate dataframes and later concatenate them 
-        df_melted_1: pd.DataFrame = pd.melt(frame=df, value_vars=["swiss_prot_accessions_interactor_a", "swiss_prot_accessions_interactor_b"],
-                            var_name="uniprot_column", value_name="uniprot_id") # Makes a new dataframe in which 1st column is uniprot_column which mentions whether it is interactor_a or _b and then in the second column by the name uniprot_id mention their respective uniprot_id
-        df_melted_2: pd.DataFrame = pd.melt(frame=df, value_vars=["official_symbol_interactor_a", "official_symbol_interactor_b"],
-                            var_name="symbol_column", value_name="symbol")
-        df_melted_3: pd.DataFrame = pd.melt(frame=df, value_vars=["organism_id_interactor_a", "organism_id_interactor_b"],
-                            var_name="organism_column", value_name="tax_id")
-
-        # Concatenate melted DataFrames. Removes the duplicates by itself
-        df_proteins: pd.DataFrame = pd.concat(objs=[df_melted_1["uniprot_id"], df_melted_2["symbol"], df_melted_3["tax_id"]], axis=1)
+        # Since we want to cover all the instances of the uniprot_id, symbol, and tax_id, the interactor A and B columns are stacked
+        df_proteins: pd.DataFrame = pd.concat(objs=[
+            _stack(first=df["swiss_prot_accessions_interactor_a"], second=df["swiss_prot_accessions_interactor_b"], name="uniprot_id"),
+            _stack(first=df["official_symbol_interactor_a"], second=df["official_symbol_interactor_b"], name="symbol"),
+            _stack(first=df["organism_id_interactor_a"], second=df["organism_id_interactor_b"], name="tax_id"),
+        ], axis=1)
 
         # Remove rows where 'uniprot_id' is missing (NaN or None)
         df_proteins = df_proteins.dropna(subset=["uniprot_id"])
 
         # Strip spaces and standardize case for uniformity
-        df_proteins["uniprot_id"] = df_proteins["uniprot_id"].astype(dtype=str).str.strip().str.upper()
-        df_proteins["symbol"] = df_proteins["symbol"].astype(dtype=str).str.strip()
+        df_proteins["uniprot_id"] = _map_strings(series=df_proteins["uniprot_id"], function=lambda ids: ids.str.strip().str.upper())
+        df_proteins["symbol"] = _map_strings(series=df_proteins["symbol"], function=lambda symbols: symbols.str.strip(), na_value="nan")
         df_proteins["tax_id"] = pd.to_numeric(arg=df_proteins["tax_id"], errors="coerce")  # Convert tax_id to numeric
 
         # Drop duplicate proteins based on 'uniprot_id'
@@ -172,123 +663,1573 @@ class Importer:
         Returns:
             pd.DataFrame: The processed DataFrame with organism data.
         """
-        df_melted_1: pd.DataFrame = pd.melt(frame=df, id_vars=[], value_vars=["organism_id_interactor_a", "organism_id_interactor_b"],
-                    var_name="org_id_column", value_name="tax_id") # Makes a new dataframe in which 1st column is org_id_column which mentions whether it is interactor_a or _b and then in the second column by the name tax_id mention their respective tax_id
-        df_melted_2: pd.DataFrame = pd.melt(frame=df, id_vars=[], value_vars=["organism_name_interactor_a", "organism_name_interactor_b"],
-                    var_name="organism_column", value_name="name")
-        # Concatenate melted DataFrames. Removes the duplicates by itself
-        df_organisms: pd.DataFrame = pd.concat(objs=[df_melted_1["tax_id"], df_melted_2["name"]], axis=1).drop_duplicates().reset_index(drop=True)
+        # The interactor A and B columns are stacked, so that every organism of either side is covered
+        tax_ids: pd.Series = _stack(first=df["organism_id_interactor_a"], second=df["organism_id_interactor_b"], name="tax_id")
+        names: pd.Series = _stack(first=df["organism_name_interactor_a"], second=df["organism_name_interactor_b"], name="name")
+        df_organisms: pd.DataFrame = pd.concat(objs=[tax_ids, names], axis=1).drop_duplicates().reset_index(drop=True)
         
         return df_organisms
 
-    def import_data(self) -> None:
+    def _to_records(self, df: pd.DataFrame) -> list[dict]:
         """
-        Import data from the TSV file into the database.
+        Convert a DataFrame into a list of plain Python dictionaries which can be passed to an executemany INSERT.
+        NaN values are turned into None and numpy scalars into Python scalars, as the DB-API drivers only understand the latter.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to convert.
+
+        Returns:
+            list[dict]: One dictionary per row, keyed by column name.
         """
-        df: pd.DataFrame = self.load_data()
-        df.replace(to_replace='-', value=None, inplace=True)
-        organisms_df: pd.DataFrame = self.get_organisms_df(df=df)
-        proteins_df: pd.DataFrame = self.get_proteins_df(df=df)
-        interactions_df: pd.DataFrame = self.get_interaction_df(df=df)
+        return df.astype(dtype=object).where(cond=df.notna(), other=None).to_dict(orient="records")
 
-        session: Session = self.session
+    def _bulk_insert(self, session: Session, table: Table, df: pd.DataFrame) -> int:
+        """
+        Insert the rows of a DataFrame into a table using Core executemany INSERTs of at most `batch_size` rows each.
+        The DataFrame must already be free of duplicate primary keys, no lookups are done against the database.
 
-        try:
-            with session.no_autoflush:  # Prevent autoflush before inserts
-                for _, row in organisms_df.iterrows():
-                    organism = Organism(tax_id=row['tax_id'], name=row['name'])
-                    session.add(organism)
-
-                for _, row in proteins_df.iterrows():
-                    # Extra Safety Check Before Inserting
-                    if pd.isna(row['uniprot_id']) or row['uniprot_id'] == '': # isna() Detects missing values for an array-like object.
-                        print(f"Skipping protein with missing uniprot_id: {row}")
-                        continue
-
-                    existing_protein: Protein | None = session.query(Protein).filter_by(uniprot_id=row['uniprot_id']).first()
-                    if existing_protein:
-                        print(f"Skipping duplicate protein with uniprot_id {row['uniprot_id']}")
-                        continue
-
-                    protein = Protein(uniprot_id=row['uniprot_id'], symbol=row['symbol'], tax_id=row['tax_id'])
-                    session.add(protein)
-
-                for _, row in interactions_df.iterrows():
-                    if row['interactor_a_id'] is None or row['interactor_b_id'] is None:
-                        print(f"Skipping interaction with missing IDs: {row}")
-                        continue
-
-                    existing_interaction: Interaction | None = session.query(Interaction).filter_by(id=row['id']).first()
-                    if existing_interaction:
-                        print(f"Skipping duplicate interaction with id {row['id']}")
-                        continue
-
-                    interaction = Interaction(
-                        id=row['id'],
-                        interactor_a_id=row['interactor_a_id'],
-                        interactor_b_id=row['interactor_b_id'],
-                        score=row['score'],
-                        experimental_system=row['experimental_system'],
-                        experimental_system_type=row['experimental_system_type']
-                    )
-                    session.add(interaction)
+        Args:
+            session (Session): The session whose transaction the rows are inserted in.
+            table (Table): The table to insert into.
+            df (pd.DataFrame): The rows to insert. Column names must match the table columns.
 
-            session.commit()  # Only commit if all inserts are valid
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            session.rollback()
-        finally:
-            session.close()
+        Returns:
+            int: The number of rows inserted.
+        """
+        for start in range(0, len(df), self.batch_size):
+            records: list[dict] = self._to_records(df=df.iloc[start:start + self.batch_size])
+            session.execute(insert(table), records)
+        return len(df)
 
+    def _drop_seen(self, df: pd.DataFrame, column: str, seen: set) -> pd.DataFrame:
+        """
+        Remove the rows whose key has already been inserted and remember the keys of the remaining ones.
 
-class Query:
-    """
-    Class to handle queries to the database.
-    """
+        Args:
+            df (pd.DataFrame): The DataFrame to filter. The keys in `column` must already be unique.
+            column (str): The primary key column.
+            seen (set): The keys inserted so far. It is updated in place.
+
+        Returns:
+            pd.DataFrame: The rows whose key was not seen before.
+        """
+        # Probe the set row by row instead of using isin, which would hash all the keys seen so far for every chunk
+        is_new: list[bool] = [key not in seen for key in df[column].to_list()]
+        df = df.loc[is_new]
+        seen.update(df[column].to_list())
+        return df
 
-    def __init__(self, engine: Engine) -> None:
+    def _stored_experimental_systems(self, session: Session) -> dict[tuple[str, str], int]:
         """
-        Initialize the Query class.
+        Read the keys of the experimental systems already in the database.
 
         Args:
-            engine (Engine): The SQLAlchemy engine to use for the database connection.
+            session (Session): The session to query with.
+
+        Returns:
+            dict[tuple[str, str], int]: The key of every (experimental_system, experimental_system_type) pair.
         """
-        self.engine: Engine = engine
-        self.session: Session = sessionmaker(bind=self.engine)()
-    
-    def count_proteins(self) -> int:
+        rows: list = session.execute(select(ExperimentalSystem.name, ExperimentalSystem.type, ExperimentalSystem.id)).all()
+        return {(name, system_type): system_id for name, system_type, system_id in rows}
+
+    def _map_experimental_systems(self, df: pd.DataFrame, system_ids: dict[tuple[str, str], int]) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Count the number of proteins in the database.
+        Replace the experimental_system and experimental_system_type columns of interaction rows by the key of the pair.
+        The rows are mapped with one factorization, so only the distinct pairs are looked up, and the pairs without a
+        key yet get the next ones.
+
+        Args:
+            df (pd.DataFrame): The interactions, as returned by `get_interaction_df`.
+            system_ids (dict[tuple[str, str], int]): The keys assigned so far. It is updated in place.
 
         Returns:
-            int: The number of proteins.
+            tuple[pd.DataFrame, pd.DataFrame]: The interactions with an experimental_system_id column instead, and the
+            experimental systems which got a key, to insert before the interactions.
         """
-        count = self.session.query(Protein).count()
-        print(f"Number of proteins: ")
-        return count
-    
-    def count_organisms(self) -> int:
+        if df.empty:
+            # A MultiIndex cannot be built from no rows, e.g. a chunk in which every interaction was dropped
+            codes, pairs = np.empty(shape=0, dtype="intp"), []
+        else:
+            codes, pairs = pd.MultiIndex.from_arrays(
+                arrays=[df["experimental_system"], df["experimental_system_type"]]
+            ).factorize()
+        new_systems: list[dict] = []
+        next_id: int = max(system_ids.values(), default=0) + 1
+        for name, system_type in pairs:
+            # Pairs with a missing value get no key, so the NOT NULL constraint rejects them as before
+            if (name, system_type) not in system_ids and pd.notna(name) and pd.notna(system_type):
+                system_ids[(name, system_type)] = next_id
+                new_systems.append({"id": next_id, "name": name, "type": system_type})
+                next_id += 1
+        keys = pd.array(data=[system_ids.get(pair) for pair in pairs], dtype="Int16")
+        df = df.drop(columns=["experimental_system", "experimental_system_type"])
+        df["experimental_system_id"] = keys.take(codes)
+        return df, pd.DataFrame(data=new_systems, columns=["id", "name", "type"])
+
+    def normalize_chunk(self, df: pd.DataFrame, report: ImportReport | None = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
-        Count the number of organisms in the database.
+        Normalize a chunk of the TSV file into organism, protein and interaction rows which are ready to be written to
+        the database. Duplicates and rows with missing keys are removed within the chunk.
+
+        Args:
+            df (pd.DataFrame): A chunk as returned by `load_data` or `iter_data`. It is modified in place.
+            report (ImportReport | None): If given, the time spent and the rows kept and dropped are recorded on it.
 
         Returns:
-            int: The number of organisms.
+            tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: The organisms, proteins and interactions of the chunk.
         """
-        count = self.session.query(Organism).count()
-        print(f"Number of organisms: ")
-        return count
-    
-    def count_interactions(self) -> int:
+        report = report if report is not None else ImportReport()
+        rows: int = len(df)
+
+        with report.stage(name="replace_missing") as stage:
+            _replace_missing(df=df)
+            stage.rows_in += rows
+            stage.rows_out += rows
+
+        # Every row names two organisms and two proteins
+        with report.stage(name="organisms") as stage:
+            organisms_df: pd.DataFrame = self.get_organisms_df(df=df)
+            stage.rows_in += 2 * rows
+            stage.drop(reason="duplicate", rows=2 * rows - len(organisms_df))
+            # The primary keys have to be unique before the bulk insert, the first occurrence wins
+            kept: int = len(organisms_df)
+            organisms_df = organisms_df.dropna(subset=["tax_id"])
+            stage.drop(reason="missing tax_id", rows=kept - len(organisms_df))
+            kept = len(organisms_df)
+            organisms_df = organisms_df.drop_duplicates(subset=["tax_id"])
+            stage.drop(reason="tax_id with several names", rows=kept - len(organisms_df))
+            stage.rows_out += len(organisms_df)
+
+        with report.stage(name="proteins") as stage:
+            missing: int = int(df[["swiss_prot_accessions_interactor_a", "swiss_prot_accessions_interactor_b"]].isna().to_numpy().sum())
+            proteins_df: pd.DataFrame = self.get_proteins_df(df=df)
+            stage.rows_in += 2 * rows
+            stage.drop(reason="missing uniprot_id", rows=missing)
+            stage.drop(reason="duplicate uniprot_id", rows=2 * rows - missing - len(proteins_df))
+            kept = len(proteins_df)
+            proteins_df = proteins_df[proteins_df["uniprot_id"] != ""]
+            stage.drop(reason="empty uniprot_id", rows=kept - len(proteins_df))
+            stage.rows_out += len(proteins_df)
+
+        with report.stage(name="interactions") as stage:
+            missing = int(df[["swiss_prot_accessions_interactor_a", "swiss_prot_accessions_interactor_b"]].isna().any(axis=1).sum())
+            interactions_df: pd.DataFrame = self.get_interaction_df(df=df)
+            stage.rows_in += rows
+            stage.drop(reason="missing interactor", rows=missing)
+            stage.drop(reason="duplicate id", rows=rows - missing - len(interactions_df))
+            # Interaction ids which are not numbers cannot be keyed, and '123' and 123 have to end up as the same key
+            kept = len(interactions_df)
+            interactions_df["id"] = pd.to_numeric(arg=interactions_df["id"], errors="coerce")
+            interactions_df = interactions_df.dropna(subset=["id", "interactor_a_id", "interactor_b_id"])
+            stage.drop(reason="invalid id", rows=kept - len(interactions_df))
+            kept = len(interactions_df)
+            interactions_df = interactions_df.astype(dtype={"id": "int64"}).drop_duplicates(subset=["id"])
+            stage.drop(reason="duplicate id", rows=kept - len(interactions_df))
+            interactions_df["score"] = pd.to_numeric(arg=interactions_df["score"], errors="coerce")
+            stage.rows_out += len(interactions_df)
+
+        return organisms_df, proteins_df, interactions_df
+
+    def _normalize_chunk_reported(self, df: pd.DataFrame) -> tuple[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame], ImportReport]:
         """
-        Count the number of interactions in the database.
+        Normalize a chunk into a report of its own, which can be sent back from a worker process.
+
+        Args:
+            df (pd.DataFrame): A chunk as returned by `load_data` or `iter_data`.
 
         Returns:
-            int: The number of interactions.
+            tuple[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame], ImportReport]: The result of `normalize_chunk` and its report.
         """
-        count = self.session.query(Interaction).count()
-        print(f"Number of interactions: ")
-        return count
+        report = ImportReport()
+        return self.normalize_chunk(df=df, report=report), report
+
+    def normalize_member(self, member: str | None, chunksize: int, report: ImportReport | None = None) -> Iterator[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+        """
+        Read and normalize one member of a .zip archive, chunk by chunk. This lets the worker processes decompress and
+        parse several members in parallel.
+
+        Args:
+            member (str | None): The member of the .zip archive.
+            chunksize (int): The maximum number of rows per chunk.
+            report (ImportReport | None): If given, the time spent and the rows kept and dropped are recorded on it.
+
+        Yields:
+            tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: The organisms, proteins and interactions of one chunk.
+        """
+        report = report if report is not None else ImportReport()
+        chunks: Iterator[pd.DataFrame] = (
+            self._select_columns(df=chunk) for chunk in self._read_tsv_chunks(chunksize=chunksize, member=member)
+        )
+        for chunk in report.timed_chunks(name="parse", chunks=chunks):
+            yield self.normalize_chunk(df=chunk, report=report)
+
+    def _normalize_member_into(self, member: str | None, chunksize: int, results: queue.Queue) -> None:
+        """
+        Read and normalize one member of a .zip archive in a worker process, and send every chunk back through a
+        bounded queue as soon as it is normalized, with a report of its own. The worker waits while the queue is full,
+        so a member is never held in memory at once, however large it is.
+        The last item is None and the report of the end of the member, and is sent even if the member cannot be read.
+
+        Args:
+            member (str | None): The member of the .zip archive.
+            chunksize (int): The maximum number of rows per chunk.
+            results (queue.Queue): The queue the chunks are sent back through, shared with the main process.
+        """
+        report = ImportReport()
+        try:
+            for frames in self.normalize_member(member=member, chunksize=chunksize, report=report):
+                # The queue proxy pickles the report when the chunk is put, so it can be reused for the next chunk
+                results.put((frames, report))
+                report.stages.clear()
+        finally:
+            results.put((None, report))
+
+    def _map_members(
+        self, executor: ProcessPoolExecutor, manager: SyncManager, chunksize: int, members: list[str | None], report: ImportReport
+    ) -> Iterator:
+        """
+        Normalize the members of a .zip archive in the worker processes and yield their chunks in the order of the file.
+        Every member sends its chunks through a queue of `member_queue_size` chunks, which the main process drains one
+        member after the other, so at most that many chunks per worker wait in memory.
+
+        Args:
+            executor (ProcessPoolExecutor): The worker processes.
+            manager (SyncManager): The manager process which holds the queues.
+            chunksize (int): The maximum number of rows per chunk.
+            members (list[str | None]): The members of the .zip archive.
+            report (ImportReport): The report the end of every member is recorded on.
+
+        Raises:
+            Exception: The error of the worker process, if a member cannot be read.
+
+        Yields:
+            tuple[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame], ImportReport]: The result of `normalize_chunk` and its report.
+        """
+        pending: deque[tuple[Future, queue.Queue]] = deque()
+
+        def drain() -> Iterator:
+            future, results = pending.popleft()
+            while True:
+                frames, chunk_report = results.get()
+                if frames is None:
+                    report.merge(other=chunk_report)
+                    future.result()
+                    return
+                yield frames, chunk_report
+
+        try:
+            for member in members:
+                results: queue.Queue = manager.Queue(maxsize=member_queue_size)
+                pending.append((executor.submit(self._normalize_member_into, member, chunksize, results), results))
+                if len(pending) >= 2 * self.workers:
+                    yield from drain()
+            while pending:
+                yield from drain()
+        finally:
+            for future, _ in pending:
+                future.cancel()
 
+    def _map_in_order(self, executor: ProcessPoolExecutor, function: Callable, items: Iterator) -> Iterator:
+        """
+        Apply a function to the items in the worker processes and yield the results in the order of the items.
+        Unlike `executor.map`, at most two items per worker are submitted ahead, so the file is not read faster than
+        the results are consumed.
+
+        Args:
+            executor (ProcessPoolExecutor): The worker processes.
+            function (Callable): The function to apply. It must be picklable.
+            items (Iterator): The items to apply it to.
+
+        Yields:
+            The results of the function.
+        """
+        pending: deque[Future] = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2 * self.workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def _iter_frames(self, chunksize: int | None = None, report: ImportReport | None = None) -> Iterator[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+        """
+        Normalize the TSV file into organism, protein and interaction rows which are ready to be written to the database.
+        Every chunk is normalized on its own, by the worker processes if there are several, which also read the members
+        of a .zip archive in parallel. The keys yielded so far are then carried across chunks in the order of the file,
+        so every key is yielded exactly once with its first occurrence in the file, whatever the number of workers.
+
+        Args:
+            chunksize (int | None): If given, the file is streamed in chunks of this many rows. Defaults to None, which
+                loads the whole file at once, or uses chunks of `parallel_chunksize` rows with several workers.
+            report (ImportReport | None): If given, the time spent and the rows kept and dropped are recorded on it.
+
+        Yields:
+            tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: The organisms, proteins and interactions of one chunk.
+        """
+        report = report if report is not None else ImportReport()
+        if chunksize is None and self.workers > 1:
+            chunksize = parallel_chunksize
+        chunks: Iterator[pd.DataFrame] = (
+            (self.load_data() for _ in range(1)) if chunksize is None else self.iter_data(chunksize=chunksize)
+        )
+        seen_tax_ids: set[int] = set()
+        seen_uniprot_ids: set[str] = set()
+        seen_interaction_ids: set[int] = set()
+
+        with ExitStack() as stack:
+            executor: ProcessPoolExecutor | None = (
+                stack.enter_context(ProcessPoolExecutor(max_workers=self.workers)) if self.workers > 1 else None
+            )
+            members: list[str | None] = self.archive_members()
+            if executor is None:
+                normalized: Iterator = map(self._normalize_chunk_reported, report.timed_chunks(name="parse", chunks=chunks))
+            elif len(members) > 1 and (self.cache is None or not self.cache.is_valid()):
+                # Every worker decompresses, parses and normalizes whole members of the archive, and sends them back chunk by chunk
+                # The manager is shut down before the executor, which unblocks the workers still waiting on a full queue
+                # if the import stops early
+                manager: SyncManager = stack.enter_context(multiprocessing.Manager())
+                normalized = self._map_members(executor=executor, manager=manager, chunksize=chunksize, members=members, report=report)
+            else:
+                normalized = self._map_in_order(
+                    executor=executor, function=self._normalize_chunk_reported, items=report.timed_chunks(name="parse", chunks=chunks)
+                )
+
+            for (organisms_df, proteins_df, interactions_df), chunk_report in normalized:
+                report.merge(other=chunk_report)
+                with report.stage(name="dedup_across_chunks") as stage:
+                    stage.rows_in += len(organisms_df) + len(proteins_df) + len(interactions_df)
+                    kept: list[int] = [len(organisms_df), len(proteins_df), len(interactions_df)]
+                    organisms_df = self._drop_seen(df=organisms_df, column="tax_id", seen=seen_tax_ids)
+                    proteins_df = self._drop_seen(df=proteins_df, column="uniprot_id", seen=seen_uniprot_ids)
+                    interactions_df = self._drop_seen(df=interactions_df, column="id", seen=seen_interaction_ids)
+                    stage.drop(reason="organism in an earlier chunk", rows=kept[0] - len(organisms_df))
+                    stage.drop(reason="protein in an earlier chunk", rows=kept[1] - len(proteins_df))
+                    stage.drop(reason="interaction in an earlier chunk", rows=kept[2] - len(interactions_df))
+                    stage.rows_out += len(organisms_df) + len(proteins_df) + len(interactions_df)
+
+                yield organisms_df, proteins_df, interactions_df
+
+    def drop_indexes(self, session: Session) -> None:
+        """
+        Drop the secondary indexes declared on the models, if they exist.
+        On MySQL, the indexes whose first column has a foreign key are kept: InnoDB needs an index leading with the
+        column of every foreign key, and refuses to drop it (error 1553).
 
+        Args:
+            session (Session): The session whose connection the indexes are dropped with.
+        """
+        keep_foreign_key_indexes: bool = self.engine.dialect.name in ("mysql", "mariadb")
+        for table in Base.metadata.sorted_tables:
+            foreign_key_columns: set[str] = {foreign_key.parent.name for foreign_key in table.foreign_keys}
+            for index in table.indexes:
+                if keep_foreign_key_indexes and next(iter(index.columns)).name in foreign_key_columns:
+                    continue
+                index.drop(bind=session.connection(), checkfirst=True)
+
+    def create_indexes(self, session: Session) -> None:
+        """
+        Create the secondary indexes declared on the models, if they do not exist yet, and update the table statistics.
+
+        Args:
+            session (Session): The session whose connection the indexes are created with.
+        """
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=session.connection(), checkfirst=True)
+        # Refresh the statistics the query planner uses to choose between the indexes
+        if self.engine.dialect.name == "sqlite":
+            session.execute(text("ANALYZE"))
+        elif self.engine.dialect.name in ("mysql", "mariadb"):
+            session.execute(text(f"ANALYZE TABLE {', '.join(table.name for table in Base.metadata.sorted_tables)}"))
+
+    def import_data(self, chunksize: int | None = None) -> ImportReport:
+        """
+        Import data from the TSV file into the database.
+        Duplicates and rows with missing keys are removed once on the DataFrames, after which every table is written with
+        batched executemany INSERTs instead of one ORM object and one lookup query per row. The secondary indexes are
+        dropped for the load and built again afterwards. The canonical edges are aggregated from the interactions of
+        every chunk, and inserted once the last chunk is.
+
+        Args:
+            chunksize (int | None): If given, the file is streamed in chunks of this many rows, each of which is normalized
+                and inserted before the next one is read. The keys inserted so far are carried across chunks, so the
+                result is the same as importing the whole file at once. Defaults to None, which loads the whole file.
 
+        Returns:
+            ImportReport: The time spent and the rows kept and dropped by every stage, and the error if the import failed.
+        """
+        report = ImportReport()
+        start: float = time.perf_counter()
+        session: Session = self.session_factory()
+
+        try:
+            # Maintaining the secondary indexes row by row is slower than building them once the tables are filled
+            with report.stage(name="indexes"):
+                self.drop_indexes(session=session)
+            system_ids: dict[tuple[str, str], int] = self._stored_experimental_systems(session=session)
+            edge_frames: list[pd.DataFrame] = []
+            for organisms_df, proteins_df, interactions_df in self._iter_frames(chunksize=chunksize, report=report):
+                interactions_df, systems_df = self._map_experimental_systems(df=interactions_df, system_ids=system_ids)
+                for table, df in (
+                    (Organism.__table__, organisms_df),
+                    (Protein.__table__, proteins_df),
+                    (ExperimentalSystem.__table__, systems_df),
+                    (Interaction.__table__, interactions_df),
+                ):
+                    with report.stage(name=f"insert_{table.name}") as stage:
+                        stage.rows_in += len(df)
+                        stage.rows_out += self._bulk_insert(session=session, table=table, df=df)
+                with report.stage(name="edges") as stage:
+                    stage.rows_in += len(interactions_df)
+                    edge_frames.append(aggregate_edges(interactions=interactions_df))
+            # The chunks are aggregated as they are inserted, and only their edges are kept until the end
+            with report.stage(name="edges") as stage:
+                edges_df: pd.DataFrame = combine_edges(frames=edge_frames)
+                stage.rows_out += len(edges_df)
+            del edge_frames
+            with report.stage(name="insert_interaction_edge") as stage:
+                stage.rows_in += len(edges_df)
+                stage.rows_out += self._bulk_insert(session=session, table=InteractionEdge.__table__, df=edges_df)
+            with report.stage(name="indexes"):
+                self.create_indexes(session=session)
+            with report.stage(name="summaries"):
+                refresh_summaries(connection=session)
+            with report.stage(name="search_index"):
+                refresh_search_index(connection=session)
 
+            with report.stage(name="commit"):
+                bump_generation(connection=session)
+                session.commit()  # Only commit if all inserts are valid
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            report.error = f"{type(e).__name__}: {e}"
+            session.rollback()
+        finally:
+            session.close()
+            report.seconds = time.perf_counter() - start
+            report.peak_rss_bytes = peak_rss_bytes()
+
+        return report
+
+    def _open_partition(self, key: tuple[int, int], version: int, organisms: dict[int, dict], report: ImportReport) -> _Partition:
+        """
+        Create an empty partition with its organisms, and without the secondary indexes, which are built once it is filled.
+
+        Args:
+            key (tuple[int, int]): The key of the partition.
+            version (int): The version of the partition.
+            organisms (dict[int, dict]): The organisms read so far, by tax_id.
+            report (ImportReport): The report of the import.
+
+        Returns:
+            _Partition: The partition.
+        """
+        partition = _Partition(url=create_partition(engine=self.engine, key=key, version=version))
+        importer = Importer(file_path=self.file_path, engine=create_engine(partition.url), batch_size=self.batch_size, recreate=False)
+        try:
+            with importer.session_factory() as session:
+                importer.drop_indexes(session=session)
+                with report.stage(name="insert_organism") as stage:
+                    rows: list[dict] = [organisms[tax_id] for tax_id in sorted(set(key))]
+                    stage.rows_in += len(rows)
+                    session.execute(insert(Organism.__table__), rows)
+                    stage.rows_out += len(rows)
+                session.commit()
+        finally:
+            importer.engine.dispose()
+        return partition
+
+    def _write_partition(self, partition: _Partition, proteins: dict[str, dict], systems: dict[int, dict], report: ImportReport,
+                         finish: bool = False) -> None:
+        """
+        Write the interactions buffered for a partition, after the proteins and experimental systems they refer to which
+        the partition does not have yet, and commit them. Only one partition is connected to at a time, for the time
+        of one write.
+
+        Args:
+            partition (_Partition): The partition.
+            proteins (dict[str, dict]): The proteins read so far, by uniprot_id.
+            systems (dict[int, dict]): The experimental systems read so far, by id.
+            report (ImportReport): The report of the import.
+            finish (bool): Whether the partition has all its interactions, in which case its edges, indexes, summaries
+                and search index are built in the same transaction. Defaults to False.
+        """
+        # The frames of the chunks may have different categories, which concat turns into plain objects
+        interactions_df: pd.DataFrame | None = pd.concat(objs=partition.frames, ignore_index=True) if partition.frames else None
+        partition.frames.clear()
+        partition.buffered = 0
+        new_protein_ids: list[str] = []
+        new_system_ids: list[int] = []
+        if interactions_df is not None:
+            interactor_ids = pd.unique(np.concatenate([
+                interactions_df["interactor_a_id"].to_numpy(dtype=object), interactions_df["interactor_b_id"].to_numpy(dtype=object)
+            ]))
+            new_protein_ids = [uniprot_id for uniprot_id in interactor_ids if uniprot_id not in partition.protein_ids]
+            partition.protein_ids.update(new_protein_ids)
+            new_system_ids = [
+                system_id for system_id in interactions_df["experimental_system_id"].unique() if system_id not in partition.system_ids
+            ]
+            partition.system_ids.update(new_system_ids)
+
+        importer = Importer(file_path=self.file_path, engine=create_engine(partition.url), batch_size=self.batch_size, recreate=False)
+        try:
+            with importer.session_factory() as session:
+                for table, rows in (
+                    (Protein.__table__, [proteins[uniprot_id] for uniprot_id in new_protein_ids]),
+                    (ExperimentalSystem.__table__, [systems[system_id] for system_id in new_system_ids]),
+                ):
+                    with report.stage(name=f"insert_{table.name}") as stage:
+                        stage.rows_in += len(rows)
+                        for start in range(0, len(rows), self.batch_size):
+                            session.execute(insert(table), rows[start:start + self.batch_size])
+                        stage.rows_out += len(rows)
+                if interactions_df is not None:
+                    with report.stage(name="insert_interaction") as stage:
+                        stage.rows_in += len(interactions_df)
+                        stage.rows_out += importer._bulk_insert(session=session, table=Interaction.__table__, df=interactions_df)
+                if finish:
+                    with report.stage(name="edges"):
+                        refresh_edges(connection=session)
+                    with report.stage(name="indexes"):
+                        importer.create_indexes(session=session)
+                    with report.stage(name="summaries"):
+                        refresh_summaries(connection=session)
+                    with report.stage(name="search_index"):
+                        refresh_search_index(connection=session)
+                    bump_generation(connection=session)
+                session.commit()
+        finally:
+            importer.engine.dispose()
+
+    def import_partitions(self, chunksize: int | None = None) -> ImportReport:
+        """
+        Import data from the TSV file into one database per pair of organisms, see `biogrid.db.partitions`.
+        The interactions of every chunk are routed to the partition of the organisms of their interactors, and written
+        like `import_data` writes them, with the proteins and experimental systems they refer to. Every partition buffers
+        at most `chunksize` interactions, which are then written and committed, so the partitions are built one write at
+        a time, whatever their number.
+        The database of the engine becomes the catalog of the partitions, which `PartitionedQuery` reads. The partitions
+        are built under a new version, and the catalog is switched to them in its transaction, once they are all
+        complete: readers keep the previous partitions until then, and if the import fails. Create the Importer with
+        `recreate=False`, which keeps the catalog until then too.
+
+        Args:
+            chunksize (int | None): If given, the file is streamed in chunks of this many rows, and every partition
+                buffers at most this many interactions. Defaults to None, which loads the whole file at once.
+
+        Returns:
+            ImportReport: The time spent and the rows kept and dropped by every stage, summed over the partitions, and
+                the error if the import failed.
+        """
+        report = ImportReport()
+        start: float = time.perf_counter()
+        session: Session = self.session_factory()
+        partitions: dict[tuple[int, int], _Partition] = {}
+
+        try:
+            previous_partitions: dict[tuple[int, int], int] = stored_partitions(connection=session)
+            # The generation the catalog gets when it commits, which no earlier import has used
+            version: int = read_generation(connection=session) + 1
+            # The previous catalog is replaced in the transaction of the import, so readers keep it until the commit
+            for table in reversed(Base.metadata.sorted_tables):
+                if table is not DatasetGeneration.__table__:
+                    session.execute(delete(table))
+            system_ids: dict[tuple[str, str], int] = self._stored_experimental_systems(session=session)
+            # The rows read so far, from which every partition gets the ones its interactions refer to
+            organisms: dict[int, dict] = {}
+            proteins: dict[str, dict] = {}
+            systems: dict[int, dict] = {}
+            tax_ids: dict[str, int] = {}
+            for organisms_df, proteins_df, interactions_df in self._iter_frames(chunksize=chunksize, report=report):
+                interactions_df, systems_df = self._map_experimental_systems(df=interactions_df, system_ids=system_ids)
+                # The catalog keeps the organisms, proteins and experimental systems of all partitions, from which
+                # PartitionedQuery finds the partitions of proteins
+                with report.stage(name="catalog") as stage:
+                    for table, df in (
+                        (Organism.__table__, organisms_df),
+                        (Protein.__table__, proteins_df),
+                        (ExperimentalSystem.__table__, systems_df),
+                    ):
+                        stage.rows_in += len(df)
+                        stage.rows_out += self._bulk_insert(session=session, table=table, df=df)
+                organisms.update((row["tax_id"], row) for row in self._to_records(df=organisms_df))
+                protein_rows: list[dict] = self._to_records(df=proteins_df)
+                proteins.update((row["uniprot_id"], row) for row in protein_rows)
+                tax_ids.update((row["uniprot_id"], row["tax_id"]) for row in protein_rows)
+                systems.update((row["id"], row) for row in self._to_records(df=systems_df))
+
+                with report.stage(name="route") as stage:
+                    stage.rows_in += len(interactions_df)
+                    has_organisms, keys = _partition_keys(
+                        ids_a=interactions_df["interactor_a_id"], ids_b=interactions_df["interactor_b_id"], tax_ids=tax_ids
+                    )
+                    stage.drop(reason="interactor without organism", rows=int((~has_organisms).sum()))
+                    interactions_df = interactions_df.loc[has_organisms]
+                    stage.rows_out += len(interactions_df)
+                for (tax_id_a, tax_id_b), partition_df in interactions_df.groupby(by=keys, sort=False):
+                    key: tuple[int, int] = (int(tax_id_a), int(tax_id_b))
+                    if key not in partitions:
+                        partitions[key] = self._open_partition(key=key, version=version, organisms=organisms, report=report)
+                    partition: _Partition = partitions[key]
+                    partition.frames.append(partition_df)
+                    partition.buffered += len(partition_df)
+                    partition.interactions += len(partition_df)
+                    if chunksize is not None and partition.buffered >= chunksize:
+                        self._write_partition(partition=partition, proteins=proteins, systems=systems, report=report)
+
+            for partition in partitions.values():
+                self._write_partition(partition=partition, proteins=proteins, systems=systems, report=report, finish=True)
+            with report.stage(name="commit"):
+                session.execute(delete(partition_table))
+                if partitions:
+                    session.execute(insert(partition_table), [
+                        {
+                            "tax_id_a": key[0],
+                            "tax_id_b": key[1],
+                            "interactions": partition.interactions,
+                            "proteins": len(partition.protein_ids),
+                            "version": version,
+                        }
+                        for key, partition in partitions.items()
+                    ])
+                bump_generation(connection=session)
+                session.commit()
+            # Readers resolve the partitions from the catalog on every call, so the previous ones are not listed anymore
+            with report.stage(name="partitions"):
+                for key, previous_version in previous_partitions.items():
+                    drop_partition(engine=self.engine, key=key, version=previous_version)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            report.error = f"{type(e).__name__}: {e}"
+            session.rollback()
+            for key in partitions:
+                drop_partition(engine=self.engine, key=key, version=version)
+        finally:
+            session.close()
+            report.seconds = time.perf_counter() - start
+            report.peak_rss_bytes = peak_rss_bytes()
+
+        return report
+
+    def reload(self, chunksize: int | None = None, min_row_ratio: float | None = 0.5) -> ImportReport:
+        """
+        Import the TSV file into a shadow database, and swap it in for the live database once it is complete.
+        The live database is only read until the swap, which replaces a symbolic link on SQLite and is one RENAME TABLE
+        statement on MySQL, so readers keep seeing the previous release while the new one is loaded, indexed and
+        checked. The previous release is kept for `rollback`. Create the Importer with `for_reload`, which keeps the
+        live data.
+
+        Args:
+            chunksize (int | None): If given, the file is streamed in chunks of this many rows. Defaults to None, which
+                loads the whole file at once.
+            min_row_ratio (float | None): The smallest allowed ratio of new to live rows of every table, below which the
+                release is not swapped in. None does not compare them. Defaults to 0.5.
+
+        Returns:
+            ImportReport: The measurements of the import into the shadow database, and of the "validate" and "swap"
+                stages. If the import or a check failed, the error, and the live database is unchanged.
+
+        Raises:
+            ValueError: If the Importer was created with `recreate=True`, which dropped the live tables already.
+        """
+        if self.recreate:
+            raise ValueError("The Importer recreated the live database, create it with Importer.for_reload to reload it")
+        start: float = time.perf_counter()
+        shadow_url: URL = prepare_shadow(engine=self.engine)
+        shadow_engine: Engine = create_engine(shadow_url)
+        shadow = Importer(
+            file_path=self.file_path,
+            engine=shadow_engine,
+            batch_size=self.batch_size,
+            workers=self.workers,
+            cache=self.cache is not None,
+            members=self.members,
+        )
+        report: ImportReport = shadow.import_data(chunksize=chunksize)
+        if not report.succeeded:
+            shadow_engine.dispose()
+            discard_shadow(engine=self.engine)
+            return report
+
+        try:
+            with report.stage(name="validate"):
+                validate_counts(
+                    engine=shadow_engine,
+                    report=report,
+                    live_counts=table_counts(engine=self.engine),
+                    min_row_ratio=min_row_ratio,
+                )
+                # Carried over from the live dataset, so cached query results of it expire with the swap
+                with self.engine.connect() as connection:
+                    generation: int = read_generation(connection=connection)
+                set_generation(url=shadow_url, generation=generation + 1)
+            shadow_engine.dispose()  # The file of the shadow is moved, and its schema emptied
+            with report.stage(name="swap"):
+                swap_in(engine=self.engine)
+            _count_generation_change()
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            report.error = f"{type(e).__name__}: {e}"
+            discard_shadow(engine=self.engine)
+        finally:
+            shadow_engine.dispose()
+            report.seconds = time.perf_counter() - start
+
+        return report
+
+    def rollback(self) -> None:
+        """
+        Swap the release which the last `reload` replaced back in. Rolling back twice restores the reloaded release.
+
+        Raises:
+            FileNotFoundError: If no release was replaced yet.
+        """
+        restore_previous(engine=self.engine)
+        _count_generation_change()
+
+    def _fetch_stored(self, session: Session, table: Table, keys: list) -> pd.DataFrame:
+        """
+        Fetch the stored rows of a table for the given primary keys, using IN clauses of at most `in_clause_batch_size` keys.
+
+        Args:
+            session (Session): The session to query with.
+            table (Table): The table to query. It must have a single column primary key.
+            keys (list): The primary keys to look up.
+
+        Returns:
+            pd.DataFrame: The stored rows, with one column per table column.
+        """
+        key_column = table.primary_key.columns[0]
+        rows: list = []
+        for start in range(0, len(keys), in_clause_batch_size):
+            statement = select(table).where(key_column.in_(keys[start:start + in_clause_batch_size]))
+            rows.extend(session.execute(statement).all())
+        return pd.DataFrame(data=rows, columns=[column.name for column in table.columns])
+
+    def _split_changes(self, df: pd.DataFrame, stored_df: pd.DataFrame, key: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Compare rows of a release with the stored rows having the same keys.
+
+        Args:
+            df (pd.DataFrame): The rows of the release.
+            stored_df (pd.DataFrame): The stored rows with the same columns.
+            key (str): The primary key column.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: The rows of `df` whose key is not stored, and the rows whose key is stored
+            but whose values differ from the stored ones.
+        """
+        df = df.reset_index(drop=True)
+        merged: pd.DataFrame = df.merge(right=stored_df, on=key, how="left", suffixes=("", "_stored"), indicator=True)
+        is_new = (merged["_merge"] == "left_only").to_numpy()
+        is_changed = pd.Series(data=False, index=merged.index)
+        for column in df.columns.drop(key):
+            both_missing = merged[column].isna() & merged[column + "_stored"].isna()
+            is_changed |= ~((merged[column] == merged[column + "_stored"]) | both_missing)
+        is_changed = is_changed.to_numpy() & ~is_new
+        return df[is_new], df[is_changed]
+
+    def _upsert(self, session: Session, table: Table, df: pd.DataFrame) -> int:
+        """
+        Insert the rows of a DataFrame into a table, overwriting the stored rows with the same primary key.
+        This uses the native upsert of the dialect: INSERT ... ON CONFLICT DO UPDATE for SQLite and PostgreSQL, and
+        INSERT ... ON DUPLICATE KEY UPDATE for MySQL.
+
+        Args:
+            session (Session): The session whose transaction the rows are written in.
+            table (Table): The table to write to.
+            df (pd.DataFrame): The rows to write. Column names must match the table columns.
+
+        Returns:
+            int: The number of rows written.
+        """
+        # The dialect modules are only needed by updates, so they do not slow down the import of this module
+        from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+        dialect: str = self.engine.dialect.name
+        value_columns: list[str] = [column.name for column in table.columns if not column.primary_key]
+        if dialect in ("sqlite", "postgresql"):
+            statement = sqlite.insert(table) if dialect == "sqlite" else postgresql.insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(table.primary_key.columns),
+                set_={column: statement.excluded[column] for column in value_columns},
+            )
+        elif dialect in ("mysql", "mariadb"):
+            statement = mysql.insert(table)
+            statement = statement.on_duplicate_key_update({column: statement.inserted[column] for column in value_columns})
+        else:
+            raise NotImplementedError(f"Upserts are not supported for the {dialect} dialect")
+
+        for start in range(0, len(df), self.batch_size):
+            records: list[dict] = self._to_records(df=df.iloc[start:start + self.batch_size])
+            session.execute(statement, records)
+        return len(df)
+
+    def _apply_changes(self, session: Session, table: Table, df: pd.DataFrame) -> tuple[int, int]:
+        """
+        Write the rows of a release which are new or differ from the stored ones.
+
+        Args:
+            session (Session): The session whose transaction the rows are written in.
+            table (Table): The table to write to. It must have a single column primary key.
+            df (pd.DataFrame): The rows of the release. Column names must match the table columns.
+
+        Returns:
+            tuple[int, int]: The number of inserted and of updated rows.
+        """
+        key: str = table.primary_key.columns[0].name
+        stored_df: pd.DataFrame = self._fetch_stored(session=session, table=table, keys=df[key].to_list())
+        inserted_df, updated_df = self._split_changes(df=df, stored_df=stored_df, key=key)
+        self._upsert(session=session, table=table, df=pd.concat(objs=[inserted_df, updated_df]))
+        return len(inserted_df), len(updated_df)
+
+    def update_data(self, chunksize: int | None = None, delete_missing: bool = False) -> UpdateSummary:
+        """
+        Apply the TSV file to the stored data without dropping the database.
+        Every chunk of the release is compared with the stored rows having the same keys. Only rows which are new or
+        changed are written, with the native upsert of the dialect, and everything is committed in one transaction so
+        that readers keep seeing the previous release until the update is complete.
+
+        Args:
+            chunksize (int | None): If given, the file is streamed in chunks of this many rows. Defaults to None, which
+                loads the whole file at once.
+            delete_missing (bool): Whether to delete the stored interactions whose id is not in the release, i.e. which
+                were retracted. Proteins and organisms are never deleted. Defaults to False.
+
+        Returns:
+            UpdateSummary: The number of inserted, updated, deleted and unchanged rows.
+        """
+        summary = UpdateSummary()
+        release_interaction_ids: set[int] = set()
+        session: Session = self.session_factory()
+
+        try:
+            system_ids: dict[tuple[str, str], int] = self._stored_experimental_systems(session=session)
+            for organisms_df, proteins_df, interactions_df in self._iter_frames(chunksize=chunksize):
+                interactions_df, systems_df = self._map_experimental_systems(df=interactions_df, system_ids=system_ids)
+                self._bulk_insert(session=session, table=ExperimentalSystem.__table__, df=systems_df)
+                inserted, updated = self._apply_changes(session=session, table=Organism.__table__, df=organisms_df)
+                summary.organisms_inserted += inserted
+                summary.organisms_updated += updated
+                inserted, updated = self._apply_changes(session=session, table=Protein.__table__, df=proteins_df)
+                summary.proteins_inserted += inserted
+                summary.proteins_updated += updated
+                inserted, updated = self._apply_changes(session=session, table=Interaction.__table__, df=interactions_df)
+                summary.interactions_inserted += inserted
+                summary.interactions_updated += updated
+                summary.interactions_unchanged += len(interactions_df) - inserted - updated
+                if delete_missing:
+                    release_interaction_ids.update(interactions_df["id"].to_list())
+
+            if delete_missing:
+                stored_ids: list[int] = session.execute(select(Interaction.id)).scalars().all()
+                retracted_ids: list[int] = [interaction_id for interaction_id in stored_ids if interaction_id not in release_interaction_ids]
+                for start in range(0, len(retracted_ids), in_clause_batch_size):
+                    batch: list[int] = retracted_ids[start:start + in_clause_batch_size]
+                    session.execute(delete(Interaction.__table__).where(Interaction.id.in_(batch)))
+                summary.interactions_deleted = len(retracted_ids)
+
+            refresh_edges(connection=session)
+            refresh_summaries(connection=session)
+            refresh_search_index(connection=session)
+            bump_generation(connection=session)
+            session.commit()  # Only commit if the whole release was applied
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        return summary
+
+
+class Query:
+    """
+    Class to handle queries to the database.
+    """
+
+    def __init__(self, engine: Engine, cache: ResultCache | None = None, generation_ttl: float = 1.0) -> None:
+        """
+        Initialize the Query class. The query keeps no session between calls, so one instance can be shared by many
+        threads. Every call opens a short-lived session, which returns its connection to the pool of the engine and
+        sees the data committed before the call. Create the engine with `create_pooled_engine` to size the pool.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use for the database connection.
+            cache (ResultCache | None): If given, the results are cached in it, keyed by the generation of the dataset.
+                Defaults to None.
+            generation_ttl (float): Seconds for which cached calls reuse the generation they read, instead of reading it
+                on every call. The imports, updates and reloads committed by this process are seen at once; those of
+                other processes after at most this time. Defaults to 1.
+        """
+        self.engine: Engine = engine
+        self.session_factory: sessionmaker[Session] = sessionmaker(bind=self.engine)
+        self.cache: ResultCache | None = cache
+        self.generation_ttl: float = generation_ttl
+        self._database_file: str | None = sqlite_database_file(url=self.engine.url)
+        self._database_inode: int | None = self._inode()
+        # The first item of the cache keys, rendered once rather than on every cached call
+        self._namespace: str = self.engine.url.render_as_string(hide_password=True)
+        # The generation read last, when it was read, and the generation changes of this process counted then
+        self._generation: tuple[int, float, int] | None = None
+
+    def _inode(self) -> int | None:
+        """
+        Get the inode of the SQLite database file, which changes when `Importer.reload` points it to another release.
+
+        Returns:
+            int | None: The inode, or None for other databases or if the file does not exist.
+        """
+        if self._database_file is None:
+            return None
+        try:
+            return os.stat(self._database_file).st_ino
+        except OSError:
+            return None
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """
+        Open a short-lived session, which is closed when the block exits.
+
+        Yields:
+            Session: The session.
+        """
+        inode: int | None = self._inode()
+        if inode != self._database_inode:
+            # The pooled connections still read the release which a reload of another process swapped out
+            self._database_inode = inode
+            self.engine.dispose()
+        with self.session_factory() as session:
+            yield session
+
+    def generation(self) -> int:
+        """
+        Get the generation of the dataset, which changes with every committed import and update.
+
+        Returns:
+            int: The generation.
+        """
+        with self.session() as session:
+            return read_generation(connection=session)
+
+    def _current_generation(self) -> int:
+        """
+        Get the generation of the dataset for a cached call. It is read again once `generation_ttl` seconds have passed,
+        or once this process committed a change of the generation, so a cache hit touches neither the database nor its
+        file. Reading it reconnects to the release a reload of another process swapped in. When it has changed, the
+        cached results of the older generations are removed.
+
+        Returns:
+            int: The generation.
+        """
+        now: float = time.monotonic()
+        known: tuple[int, float, int] | None = self._generation
+        if known is not None and now - known[1] < self.generation_ttl and known[2] == _generation_changes:
+            return known[0]
+        changes: int = _generation_changes
+        generation: int = self.generation()
+        self._generation = (generation, now, changes)
+        if known is not None and known[0] != generation:
+            self.cache.retire(namespace=self._namespace, generation=generation)
+        return generation
+
+    def _cached(self, key: tuple, compute: Callable[[], object]) -> object:
+        """
+        Get a result from the cache, or compute and cache it.
+
+        Args:
+            key (tuple): Identifies the result within a generation of this database.
+            compute (Callable[[], object]): Computes the result.
+
+        Returns:
+            object: The result.
+        """
+        if self.cache is None:
+            return compute()
+        key = (self._namespace, self._current_generation(), *key)
+        result: object = self.cache.get(key=key, default=_missing)
+        if result is _missing:
+            result = compute()
+            self.cache.set(key=key, value=result)
+        return result
+
+    def _count(self, model: type) -> int:
+        """
+        Count the rows of a table, from the table_count summary written by the Importer.
+
+        Args:
+            model (type): The mapped class of the table.
+
+        Returns:
+            int: The number of rows.
+        """
+        with self.session() as session:
+            try:
+                count: int | None = session.execute(
+                    select(TableCount.rows).where(TableCount.table_name == model.__tablename__)
+                ).scalar_one_or_none()
+            except DBAPIError:  # The table is missing
+                session.rollback()
+                count = None
+            # Databases imported before the summaries existed are counted the slow way
+            return count if count is not None else session.query(model).count()
+
+    def organism_protein_counts(self) -> pd.DataFrame:
+        """
+        Count the proteins of every organism, from the organism_summary table written by the Importer.
+
+        Returns:
+            pd.DataFrame: Columns tax_id, name and proteins, by decreasing number of proteins.
+        """
+        def compute() -> pd.DataFrame:
+            with self.session() as session:
+                rows: list = session.execute(
+                    select(OrganismSummary.tax_id, Organism.name, OrganismSummary.proteins)
+                    .join(Organism, Organism.tax_id == OrganismSummary.tax_id)
+                    .order_by(OrganismSummary.proteins.desc(), OrganismSummary.tax_id)
+                ).all()
+            return pd.DataFrame(data=rows, columns=["tax_id", "name", "proteins"])
+
+        return self._cached(key=("organism_protein_counts",), compute=compute)
+
+    def experimental_system_counts(self) -> pd.DataFrame:
+        """
+        Count the interactions of every experimental system, from the experimental_system_summary table written by the
+        Importer.
+
+        Returns:
+            pd.DataFrame: Columns experimental_system, experimental_system_type and interactions, by decreasing number
+                of interactions.
+        """
+        def compute() -> pd.DataFrame:
+            with self.session() as session:
+                rows: list = session.execute(
+                    select(ExperimentalSystemSummary).order_by(
+                        ExperimentalSystemSummary.interactions.desc(), ExperimentalSystemSummary.experimental_system
+                    )
+                ).scalars().all()
+            return pd.DataFrame(
+                data=[(row.experimental_system, row.experimental_system_type, row.interactions) for row in rows],
+                columns=["experimental_system", "experimental_system_type", "interactions"],
+            )
+
+        return self._cached(key=("experimental_system_counts",), compute=compute)
+
+    def organism_pair_counts(self, cross_species_only: bool = True) -> pd.DataFrame:
+        """
+        Count the interactions between the proteins of every pair of organisms, from the organism_pair_summary table
+        written by the Importer. Unlike `cross_organism_edges`, every interaction counts, not every protein pair.
+
+        Args:
+            cross_species_only (bool): Whether to leave out the interactions within one organism. Defaults to True.
+
+        Returns:
+            pd.DataFrame: Columns tax_id_a, name_a, tax_id_b, name_b and interactions, with tax_id_a <= tax_id_b, by
+                decreasing number of interactions.
+        """
+        def compute() -> pd.DataFrame:
+            organism_a, organism_b = aliased(Organism), aliased(Organism)
+            statement: Select = (
+                select(
+                    OrganismPairSummary.tax_id_a,
+                    organism_a.name,
+                    OrganismPairSummary.tax_id_b,
+                    organism_b.name,
+                    OrganismPairSummary.interactions,
+                )
+                .outerjoin(organism_a, organism_a.tax_id == OrganismPairSummary.tax_id_a)
+                .outerjoin(organism_b, organism_b.tax_id == OrganismPairSummary.tax_id_b)
+                .order_by(OrganismPairSummary.interactions.desc(), OrganismPairSummary.tax_id_a, OrganismPairSummary.tax_id_b)
+            )
+            if cross_species_only:
+                statement = statement.where(OrganismPairSummary.tax_id_a != OrganismPairSummary.tax_id_b)
+            with self.session() as session:
+                rows: list = session.execute(statement).all()
+            return pd.DataFrame(data=rows, columns=["tax_id_a", "name_a", "tax_id_b", "name_b", "interactions"])
+
+        return self._cached(key=("organism_pair_counts", cross_species_only), compute=compute)
+
+    def check_summaries(self) -> dict[str, bool]:
+        """
+        Recompute the summary tables from the data tables and compare them with the stored ones. This scans the data
+        tables, and is never cached.
+
+        Returns:
+            dict[str, bool]: Whether every summary table is consistent, keyed by table name.
+        """
+        with self.session() as session:
+            return check_summaries(connection=session)
+
+    def count_proteins(self) -> int:
+        """
+        Count the number of proteins in the database.
+
+        Returns:
+            int: The number of proteins.
+        """
+        count = self._cached(key=("count_proteins",), compute=partial(self._count, model=Protein))
+        print(f"Number of proteins: ")
+        return count
+    
+    def count_organisms(self) -> int:
+        """
+        Count the number of organisms in the database.
+
+        Returns:
+            int: The number of organisms.
+        """
+        count = self._cached(key=("count_organisms",), compute=partial(self._count, model=Organism))
+        print(f"Number of organisms: ")
+        return count
+    
+    def count_interactions(self) -> int:
+        """
+        Count the number of interactions in the database.
+
+        Returns:
+            int: The number of interactions.
+        """
+        count = self._cached(key=("count_interactions",), compute=partial(self._count, model=Interaction))
+        print(f"Number of interactions: ")
+        return count
+
+    def lookup_interactions(self, uniprot_ids: Iterable[str], method: Literal["temp_table", "in"] = "temp_table",
+                            arrow: bool = False) -> "pd.DataFrame | pyarrow.Table":
+        """
+        Look up all interactions of many proteins, on either side, joined to both interactors and their organisms.
+        The IDs are resolved in a bounded number of round trips instead of one query per ID: with "temp_table", they are
+        sent to a temporary table with one executemany INSERT and joined in one SELECT; with "in", they are sent in IN
+        clauses of at most `in_clause_batch_size` IDs, with one SELECT per clause.
+
+        Args:
+            uniprot_ids (Iterable[str]): The UniProt IDs of the proteins, matched like `interaction_evidence` matches
+                them, i.e. regardless of case and surrounding whitespace. Duplicates are ignored.
+            method (Literal["temp_table", "in"]): How to send the IDs. Defaults to "temp_table".
+            arrow (bool): Whether to return a pyarrow Table instead of a DataFrame. Needs pyarrow. Defaults to False.
+
+        Returns:
+            pd.DataFrame | pyarrow.Table: One row per interaction, ordered by id, with the columns id, interactor_a_id,
+                symbol_a, tax_id_a, organism_a, interactor_b_id, symbol_b, tax_id_b, organism_b, score,
+                experimental_system and experimental_system_type.
+        """
+        if method not in ("temp_table", "in"):
+            raise ValueError(f"method must be 'temp_table' or 'in', got {method!r}")
+        unique_ids: list[str] = list(dict.fromkeys(uniprot_id.strip().upper() for uniprot_id in uniprot_ids))
+        df: pd.DataFrame = self._cached(
+            key=("lookup_interactions", method, tuple(unique_ids)),
+            compute=partial(self._lookup_interactions, uniprot_ids=unique_ids, method=method),
+        )
+        if arrow:
+            return import_pyarrow(feature="Arrow results").Table.from_pandas(df=df, preserve_index=False)
+        return df
+
+    def _lookup_interactions(self, uniprot_ids: list[str], method: Literal["temp_table", "in"]) -> pd.DataFrame:
+        """
+        Run `lookup_interactions`.
+
+        Args:
+            uniprot_ids (list[str]): The UniProt IDs of the proteins, without duplicates.
+            method (Literal["temp_table", "in"]): How to send the IDs.
+
+        Returns:
+            pd.DataFrame: One row per interaction, ordered by id.
+        """
+        unique_ids: list[str] = uniprot_ids
+        protein_a, protein_b = aliased(Protein), aliased(Protein)
+        organism_a, organism_b = aliased(Organism), aliased(Organism)
+        columns: Select = (
+            select(
+                Interaction.id,
+                Interaction.interactor_a_id,
+                protein_a.symbol.label("symbol_a"),
+                protein_a.tax_id.label("tax_id_a"),
+                organism_a.name.label("organism_a"),
+                Interaction.interactor_b_id,
+                protein_b.symbol.label("symbol_b"),
+                protein_b.tax_id.label("tax_id_b"),
+                organism_b.name.label("organism_b"),
+                Interaction.score,
+                ExperimentalSystem.name.label("experimental_system"),
+                ExperimentalSystem.type.label("experimental_system_type"),
+            )
+            .join(ExperimentalSystem, Interaction.experimental_system_id == ExperimentalSystem.id)
+            .outerjoin(protein_a, Interaction.interactor_a_id == protein_a.uniprot_id)
+            .outerjoin(organism_a, protein_a.tax_id == organism_a.tax_id)
+            .outerjoin(protein_b, Interaction.interactor_b_id == protein_b.uniprot_id)
+            .outerjoin(organism_b, protein_b.tax_id == organism_b.tax_id)
+        )
+
+        def matching(ids) -> Select:
+            # One branch per side, so each can use the index leading with its interactor column
+            interaction_ids = union(
+                select(Interaction.id).where(Interaction.interactor_a_id.in_(ids)),
+                select(Interaction.id).where(Interaction.interactor_b_id.in_(ids)),
+            ).subquery()
+            return columns.where(Interaction.id.in_(select(interaction_ids.c.id)))
+
+        rows: list = []
+        with self.session() as session:
+            if method == "in":
+                for start in range(0, len(unique_ids), in_clause_batch_size):
+                    rows.extend(session.execute(matching(ids=unique_ids[start:start + in_clause_batch_size])).all())
+            elif unique_ids:
+                # Temporary tables belong to the connection, which the session keeps until it is closed
+                lookup_ids = Table(
+                    "biogrid_lookup_ids", MetaData(), Column("uniprot_id", String(length=100), primary_key=True),
+                    prefixes=["TEMPORARY"],
+                )
+                connection = session.connection()
+                lookup_ids.create(bind=connection)
+                try:
+                    session.execute(insert(lookup_ids), [{"uniprot_id": uniprot_id} for uniprot_id in unique_ids])
+                    # One SELECT per side, as MySQL cannot open a temporary table twice in one statement (error 1137)
+                    for interactor_id in (Interaction.interactor_a_id, Interaction.interactor_b_id):
+                        rows.extend(session.execute(columns.where(interactor_id.in_(select(lookup_ids.c.uniprot_id)))).all())
+                finally:
+                    lookup_ids.drop(bind=connection)
+                    session.commit()  # Otherwise closing the session rolls the DROP back, and the table stays in the pool
+
+        df: pd.DataFrame = pd.DataFrame(data=rows, columns=list(columns.selected_columns.keys()))
+        # IN clauses of different batches, or both sides, can match the same interaction
+        return df.drop_duplicates(subset=["id"]).sort_values(by="id", ignore_index=True)
+
+    def search_proteins(self, query: str, prefix: bool = True, limit: int | None = 20, offset: int = 0) -> pd.DataFrame:
+        """
+        Search the proteins by symbol and organism name, e.g. "ACE", "nsp" or "nsp coronavirus". Every token of the search
+        has to match a word of the symbol or of the organism name, and matches of the symbol rank higher. The search is
+        answered by the full-text index the Importer fills: FTS5 on SQLite and FULLTEXT on MySQL. Other databases fall
+        back to LIKE prefix matching, without ranking.
+
+        Args:
+            query (str): The search. Case and punctuation are ignored.
+            prefix (bool): Whether the tokens also match the words they start, e.g. 'ACE' matches 'ACE2'. Defaults to True.
+            limit (int | None): The maximum number of proteins to return, for paging. None returns all of them.
+                Defaults to 20.
+            offset (int): The number of proteins to skip, for paging. Defaults to 0.
+
+        Returns:
+            pd.DataFrame: Columns uniprot_id, symbol, tax_id, organism and score, by decreasing score. Empty if the search
+                has no letters or digits.
+        """
+        statement: Select | None = search_statement(
+            dialect=self.engine.dialect.name, query=query, prefix=prefix, limit=limit, offset=offset
+        )
+        columns: list[str] = ["uniprot_id", "symbol", "tax_id", "organism", "score"]
+        if statement is None:
+            return pd.DataFrame(columns=columns)
+
+        def compute() -> pd.DataFrame:
+            with self.session() as session:
+                rows: list = session.execute(statement).all()
+            return pd.DataFrame(data=rows, columns=columns)
+
+        return self._cached(key=("search_proteins", query, prefix, limit, offset), compute=compute)
+
+    def experimental_system_ids(self, experimental_system: str | None = None, experimental_system_type: str | None = None) -> list[int]:
+        """
+        Get the keys of the experimental systems with a name, a type or both.
+
+        Args:
+            experimental_system (str | None): The experimental system, e.g. 'Two-hybrid'. Defaults to None, for any.
+            experimental_system_type (str | None): The type, e.g. 'physical'. Defaults to None, for any.
+
+        Returns:
+            list[int]: The sorted keys. Empty if no experimental system matches.
+        """
+        def compute() -> list[int]:
+            statement: Select = select(ExperimentalSystem.id).order_by(ExperimentalSystem.id)
+            if experimental_system is not None:
+                statement = statement.where(ExperimentalSystem.name == experimental_system)
+            if experimental_system_type is not None:
+                statement = statement.where(ExperimentalSystem.type == experimental_system_type)
+            with self.session() as session:
+                return session.execute(statement).scalars().all()
+
+        return self._cached(key=("experimental_system_ids", experimental_system, experimental_system_type), compute=compute)
+
+    def interactions_by_experimental_system(self, experimental_system: str | None = None, experimental_system_type: str | None = None,
+                                            limit: int | None = 100, offset: int = 0) -> pd.DataFrame:
+        """
+        List the interactions detected with an experimental system, a type of experimental system or both, ordered by
+        interaction id. The names are resolved to their keys first, so the interaction table is only probed through the
+        index on its integer experimental_system_id column.
+
+        Args:
+            experimental_system (str | None): The experimental system, e.g. 'Two-hybrid'. Defaults to None, for any.
+            experimental_system_type (str | None): The type, e.g. 'physical'. Defaults to None, for any.
+            limit (int | None): The maximum number of interactions to return, for paging. None returns all of them.
+                Defaults to 100.
+            offset (int): The number of interactions to skip, for paging. Defaults to 0.
+
+        Returns:
+            pd.DataFrame: The interactions, with the columns of `get_interaction_df`.
+        """
+        system_ids: list[int] = self.experimental_system_ids(
+            experimental_system=experimental_system, experimental_system_type=experimental_system_type
+        )
+        statement: Select = (
+            select_interactions()
+            .where(Interaction.experimental_system_id.in_(system_ids))
+            .order_by(Interaction.id)
+            .limit(limit)
+            .offset(offset)
+        )
+
+        def compute() -> pd.DataFrame:
+            with self.session() as session:
+                rows: list = session.execute(statement).all()
+            return pd.DataFrame(data=rows, columns=list(statement.selected_columns.keys()))
+
+        return self._cached(key=("interactions_by_experimental_system", tuple(system_ids), limit, offset), compute=compute)
+
+    def interaction_evidence(self, uniprot_id_a: str, uniprot_id_b: str) -> pd.DataFrame:
+        """
+        Get the evidence that two proteins interact, reported as A-B or B-A, from one probe of the primary key of the
+        interaction_edge table.
+
+        Args:
+            uniprot_id_a (str): The UniProt ID of one protein.
+            uniprot_id_b (str): The UniProt ID of the other protein.
+
+        Returns:
+            pd.DataFrame: The experimental_system, experimental_system_type and evidence, i.e. the number of interactions,
+                of every experimental system which detected the pair, by decreasing evidence. Empty if they do not interact.
+        """
+        protein_a_id, protein_b_id = canonical_pair(uniprot_id_a.strip().upper(), uniprot_id_b.strip().upper())
+        statement: Select = (
+            select(
+                ExperimentalSystem.name.label("experimental_system"),
+                ExperimentalSystem.type.label("experimental_system_type"),
+                InteractionEdge.evidence,
+            )
+            .join(ExperimentalSystem, InteractionEdge.experimental_system_id == ExperimentalSystem.id)
+            .where(InteractionEdge.protein_a_id == protein_a_id, InteractionEdge.protein_b_id == protein_b_id)
+            .order_by(InteractionEdge.evidence.desc(), InteractionEdge.experimental_system_id)
+        )
+
+        def compute() -> pd.DataFrame:
+            with self.session() as session:
+                rows: list = session.execute(statement).all()
+            return pd.DataFrame(data=rows, columns=list(statement.selected_columns.keys()))
+
+        return self._cached(key=("interaction_evidence", protein_a_id, protein_b_id), compute=compute)
+
+    def interact(self, uniprot_id_a: str, uniprot_id_b: str) -> bool:
+        """
+        Check whether two proteins interact, reported as A-B or B-A, with one probe of the primary key of the
+        interaction_edge table. It is not cached, as reading the generation would cost as much as the probe.
+
+        Args:
+            uniprot_id_a (str): The UniProt ID of one protein.
+            uniprot_id_b (str): The UniProt ID of the other protein.
+
+        Returns:
+            bool: Whether at least one interaction between the two proteins is stored.
+        """
+        protein_a_id, protein_b_id = canonical_pair(uniprot_id_a.strip().upper(), uniprot_id_b.strip().upper())
+        with self.session() as session:
+            return session.execute(
+                select(InteractionEdge.evidence)
+                .where(InteractionEdge.protein_a_id == protein_a_id, InteractionEdge.protein_b_id == protein_b_id)
+                .limit(1)
+            ).first() is not None
+
+    def count_edges(self) -> int:
+        """
+        Count the pairs of interacting proteins, i.e. the edges of the network, however many interactions report them.
+
+        Returns:
+            int: The number of pairs.
+        """
+        def compute() -> int:
+            # The pairs lead the primary key, so they are counted from it in order
+            pairs: Select = select(InteractionEdge.protein_a_id, InteractionEdge.protein_b_id).distinct()
+            with self.session() as session:
+                return session.execute(select(func.count()).select_from(pairs.subquery())).scalar_one()
+
+        return self._cached(key=("count_edges",), compute=compute)
+
+    def export_snapshot(self, directory: str) -> dict:
+        """
+        Write a snapshot of the proteins, interactions and experimental systems for downstream jobs, which open it with
+        `Snapshot.open` in milliseconds instead of reading the interaction table at every start. See `biogrid.db.snapshot`
+        for the files.
+
+        Args:
+            directory (str): The directory of the snapshot. An older snapshot in it is replaced.
+
+        Returns:
+            dict: The manifest of the snapshot, with the generation of the dataset it was taken from.
+        """
+        with self.session() as session:
+            generation: int = read_generation(connection=session)
+            proteins: pd.DataFrame = pd.DataFrame(
+                data=session.execute(select(Protein.uniprot_id, Protein.symbol, Protein.tax_id)).all(),
+                columns=["uniprot_id", "symbol", "tax_id"],
+            )
+            interactions: pd.DataFrame = pd.DataFrame(
+                data=session.execute(
+                    select(
+                        Interaction.id,
+                        Interaction.interactor_a_id,
+                        Interaction.interactor_b_id,
+                        Interaction.score,
+                        Interaction.experimental_system_id,
+                    )
+                ).all(),
+                columns=["id", "interactor_a_id", "interactor_b_id", "score", "experimental_system_id"],
+            )
+            experimental_systems: pd.DataFrame = pd.DataFrame(
+                data=session.execute(select(ExperimentalSystem.id, ExperimentalSystem.name, ExperimentalSystem.type)).all(),
+                columns=["id", "name", "type"],
+            )
+        return write_snapshot(
+            directory=directory,
+            proteins=proteins,
+            interactions=interactions,
+            experimental_systems=experimental_systems,
+            generation=generation,
+        )
+
+    def graph(self) -> InteractionGraph:
+        """
+        Load the interaction table once into an in-memory graph, to walk the network without further queries.
+        The graph is a snapshot and does not see later imports. With a cache, the graph is shared by the calls and its
+        arrays are read-only.
+
+        Returns:
+            InteractionGraph: The graph of all proteins, with one edge per interacting protein pair.
+        """
+        return self._cached(key=("graph",), compute=self._load_graph)
+
+    def _load_graph(self) -> InteractionGraph:
+        """
+        Run `graph`.
+
+        Returns:
+            InteractionGraph: The graph of all proteins.
+        """
+        with self.session() as session:
+            edges: np.ndarray = np.array(
+                session.execute(select(Interaction.interactor_a_id, Interaction.interactor_b_id)).all(), dtype=object
+            ).reshape(-1, 2)
+            proteins: np.ndarray = np.array(session.execute(select(Protein.uniprot_id)).scalars().all(), dtype=object)
+        return InteractionGraph.from_edges(interactor_a_ids=edges[:, 0], interactor_b_ids=edges[:, 1], extra_nodes=proteins)
+
+    def _node_tax_ids(self, graph: InteractionGraph) -> np.ndarray:
+        """
+        Look up the tax_id of every node of a graph.
+
+        Args:
+            graph (InteractionGraph): The graph.
+
+        Returns:
+            np.ndarray: The tax_id of every node, indexed by node id. NaN for proteins missing from the protein table.
+        """
+        with self.session() as session:
+            proteins: pd.DataFrame = pd.DataFrame(
+                data=session.execute(select(Protein.uniprot_id, Protein.tax_id)).all(), columns=["uniprot_id", "tax_id"]
+            )
+        return proteins.set_index(keys="uniprot_id")["tax_id"].reindex(index=graph.nodes).to_numpy()
+
+    def _organism_names(self) -> pd.Series:
+        """
+        Get the name of every organism.
+
+        Returns:
+            pd.Series: The organism names, indexed by tax_id.
+        """
+        with self.session() as session:
+            organisms: list = session.execute(select(Organism.tax_id, Organism.name)).all()
+        return pd.Series(data=[name for _, name in organisms], index=[tax_id for tax_id, _ in organisms], dtype=object)
+
+    def degree_distribution(self, graph: InteractionGraph | None = None) -> pd.DataFrame:
+        """
+        Count the proteins of every organism by their number of interaction partners.
+
+        Args:
+            graph (InteractionGraph | None): A graph returned by `graph`, to reuse it across calls. Defaults to None,
+                which loads the graph.
+
+        Returns:
+            pd.DataFrame: Columns tax_id, name, degree and proteins.
+        """
+        if graph is None:
+            return self._cached(key=("degree_distribution",), compute=lambda: self.degree_distribution(graph=self.graph()))
+        df: pd.DataFrame = analytics.degree_distribution(graph=graph, tax_ids=self._node_tax_ids(graph=graph))
+        df.insert(loc=1, column="name", value=df["tax_id"].map(self._organism_names()))
+        return df
+
+    def cross_organism_edges(self, graph: InteractionGraph | None = None) -> pd.DataFrame:
+        """
+        Count the interacting protein pairs between every pair of organisms, e.g. between SARS-CoV-2 and Homo sapiens.
+
+        Args:
+            graph (InteractionGraph | None): A graph returned by `graph`, to reuse it across calls. Defaults to None,
+                which loads the graph.
+
+        Returns:
+            pd.DataFrame: Columns tax_id_a, name_a, tax_id_b, name_b and edges, with tax_id_a <= tax_id_b.
+        """
+        if graph is None:
+            return self._cached(key=("cross_organism_edges",), compute=lambda: self.cross_organism_edges(graph=self.graph()))
+        df: pd.DataFrame = analytics.cross_organism_edges(graph=graph, tax_ids=self._node_tax_ids(graph=graph))
+        names: pd.Series = self._organism_names()
+        df.insert(loc=1, column="name_a", value=df["tax_id_a"].map(names))
+        df.insert(loc=3, column="name_b", value=df["tax_id_b"].map(names))
+        return df
+
+    def connected_components(self, graph: InteractionGraph | None = None) -> pd.DataFrame:
+        """
+        Assign every protein to its connected component of the interaction network.
+
+        Args:
+            graph (InteractionGraph | None): A graph returned by `graph`, to reuse it across calls. Defaults to None,
+                which loads the graph.
+
+        Returns:
+            pd.DataFrame: Columns uniprot_id, component and component_size. Components are numbered by decreasing size.
+        """
+        if graph is None:
+            return self._cached(key=("connected_components",), compute=lambda: analytics.connected_components(graph=self.graph()))
+        return analytics.connected_components(graph=graph)
+
+    def clustering_coefficients(self, graph: InteractionGraph | None = None) -> pd.DataFrame:
+        """
+        Compute the local clustering coefficient of every protein.
+
+        Args:
+            graph (InteractionGraph | None): A graph returned by `graph`, to reuse it across calls. Defaults to None,
+                which loads the graph.
+
+        Returns:
+            pd.DataFrame: Columns uniprot_id, degree, triangles and clustering.
+        """
+        if graph is None:
+            return self._cached(
+                key=("clustering_coefficients",), compute=lambda: analytics.clustering_coefficients(graph=self.graph())
+            )
+        return analytics.clustering_coefficients(graph=graph)
+
+    def betweenness(self, samples: int | None = 100, seed: int = 0, graph: InteractionGraph | None = None) -> pd.DataFrame:
+        """
+        Estimate the betweenness centrality of every protein from a random sample of source proteins.
+
+        Args:
+            samples (int | None): Number of source proteins. None uses every protein, which gives the exact values.
+                Defaults to 100.
+            seed (int): Seed of the random source sample. Defaults to 0.
+            graph (InteractionGraph | None): A graph returned by `graph`, to reuse it across calls. Defaults to None,
+                which loads the graph.
+
+        Returns:
+            pd.DataFrame: Columns uniprot_id and betweenness.
+        """
+        if graph is None:
+            return self._cached(
+                key=("betweenness", samples, seed),
+                compute=lambda: analytics.betweenness(graph=self.graph(), samples=samples, seed=seed),
+            )
+        return analytics.betweenness(graph=graph, samples=samples, seed=seed)
@@ -11,7 +11,8 @@ class Base(DeclarativeBase):
 
 from typing import List, Optional
 from sqlalchemy.orm import Mapped
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import Index, SmallInteger, String, ForeignKey, UniqueConstraint
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.orm import mapped_column, relationship
 
 class Protein(Base):
@@ -25,7 +26,9 @@ class Protein(Base):
         org (Organism): The relationship to the Organism model.
     """
     __tablename__ = "protein"
-    uniprot_id: Mapped[str] = mapped_column(primary_key=True)
+    # Proteins of one organism. uniprot_id is included so that listing them is answered from the index alone
+    __table_args__ = (Index("ix_protein_tax_id", "tax_id", "uniprot_id"),)
+    uniprot_id: Mapped[str] = mapped_column(String(length=100), primary_key=True)  # MySQL can only index VARCHARs with a length
     symbol: Mapped[str] = mapped_column(__name_pos=String(length=100))
     tax_id: Mapped[int] = mapped_column(__name_pos=ForeignKey("organism.tax_id"))
     org: Mapped["Organism"] = relationship(argument="Organism", back_populates="proteins")
@@ -43,6 +46,7 @@ class Organism(Base):
         proteins (List[Protein]): The relationship to the Protein model.
     """
     __tablename__ = "organism"
+    __table_args__ = (Index("ix_organism_name", "name"),)
     tax_id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(__name_pos=String(length=100))
     proteins: Mapped[List[Protein]] = relationship(argument="Protein", back_populates="org")
@@ -50,6 +54,25 @@ class Organism(Base):
     def __repr__(self) -> str:
         return f"Organism(tax_id={self.tax_id}, name={self.name})"
 
+class ExperimentalSystem(Base):
+    """
+    ORM model for the 'experimental_system' dimension table. BioGRID uses a few dozen experimental systems, so the
+    interactions reference them by a small integer key instead of repeating their names on every row.
+
+    Attributes:
+        id (int): The key of the experimental system, assigned by the importer in the order of the release.
+        name (str): The experimental system, e.g. 'Two-hybrid'.
+        type (str): The type of the experimental system, 'physical' or 'genetic'.
+    """
+    __tablename__ = "experimental_system"
+    __table_args__ = (UniqueConstraint("name", "type", name="uq_experimental_system_name_type"),)
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(__name_pos=String(length=100))
+    type: Mapped[str] = mapped_column(__name_pos=String(length=100))
+
+    def __repr__(self) -> str:
+        return f"ExperimentalSystem(id={self.id}, name={self.name}, type={self.type})"
+
 class Interaction(Base):
     """
     ORM model for the 'interaction' table.
@@ -59,16 +82,141 @@ class Interaction(Base):
         interactor_a_id (str): The unique identifier for the first interactor protein.
         interactor_b_id (str): The unique identifier for the second interactor protein.
         score (Optional[float]): The score of the interaction.
-        experimental_system (str): The experimental system used to detect the interaction.
-        experimental_system_type (str): The type of experimental system used.
+        experimental_system_id (int): The key of the experimental system used to detect the interaction.
+        system (ExperimentalSystem): The relationship to the experimental system.
+        experimental_system (str): The experimental system used to detect the interaction, read through `system`.
+        experimental_system_type (str): The type of experimental system used, read through `system`.
+        interactor_a (Protein): The relationship to the first interactor protein.
+        interactor_b (Protein): The relationship to the second interactor protein.
     """
     __tablename__ = "interaction"
+    # One index per interactor column, serving lookups by the interactor alone and by (interactor, experimental system).
+    # The other interactor is included so that the partners of a protein are answered from the index alone.
+    # Filtering by experimental system or type probes the integer keys, see Query.interactions_by_experimental_system
+    __table_args__ = (
+        Index("ix_interaction_a_system_b", "interactor_a_id", "experimental_system_id", "interactor_b_id"),
+        Index("ix_interaction_b_system_a", "interactor_b_id", "experimental_system_id", "interactor_a_id"),
+        Index("ix_interaction_experimental_system_id", "experimental_system_id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     interactor_a_id: Mapped[str] = mapped_column(__name_pos=ForeignKey(column="protein.uniprot_id"))
     interactor_b_id: Mapped[str] = mapped_column(__name_pos=ForeignKey(column="protein.uniprot_id"))
     score: Mapped[Optional[float]] = mapped_column()  # Can be a float or None. This is what we call a nullable in the database
-    experimental_system: Mapped[str] = mapped_column(__name_pos=String(length=100))
-    experimental_system_type: Mapped[str] = mapped_column(__name_pos=String(length=100))
+    experimental_system_id: Mapped[int] = mapped_column(SmallInteger, ForeignKey(column="experimental_system.id"))
+    system: Mapped[ExperimentalSystem] = relationship(argument="ExperimentalSystem")
+    # Comparing these in a WHERE clause gives an EXISTS subquery, compare experimental_system_id with the keys instead
+    experimental_system: AssociationProxy[str] = association_proxy("system", "name")
+    experimental_system_type: AssociationProxy[str] = association_proxy("system", "type")
+    # Load them with selectinload or joinedload when iterating over many interactions, or use Query.lookup_interactions
+    interactor_a: Mapped[Protein] = relationship(argument="Protein", foreign_keys=[interactor_a_id])
+    interactor_b: Mapped[Protein] = relationship(argument="Protein", foreign_keys=[interactor_b_id])
+
+    def __repr__(self) -> str:
+        return f"Interaction(id={self.id}, interactor_a_id={self.interactor_a_id}, interactor_b_id={self.interactor_b_id}, score={self.score}, experimental_system={self.experimental_system}, experimental_system_type={self.experimental_system_type})"
+
+class InteractionEdge(Base):
+    """
+    ORM model for the 'interaction_edge' table, with one row per unordered pair of proteins and experimental system.
+    The pair is ordered so that protein_a_id <= protein_b_id, so A-B and B-A interactions are the same edge, and the
+    edges of a pair are next to each other in the primary key.
+
+    Attributes:
+        protein_a_id (str): The smaller UniProt ID of the pair.
+        protein_b_id (str): The larger UniProt ID of the pair.
+        experimental_system_id (int): The key of the experimental system which detected the interactions.
+        evidence (int): The number of interactions between the two proteins detected with the experimental system.
+        system (ExperimentalSystem): The relationship to the experimental system.
+    """
+    __tablename__ = "interaction_edge"
+    # Stored in the order of the primary key, as InnoDB does, so a lookup of a pair is one probe of one B-tree
+    __table_args__ = {"sqlite_with_rowid": False}
+    protein_a_id: Mapped[str] = mapped_column(ForeignKey(column="protein.uniprot_id"), primary_key=True)
+    protein_b_id: Mapped[str] = mapped_column(ForeignKey(column="protein.uniprot_id"), primary_key=True)
+    experimental_system_id: Mapped[int] = mapped_column(SmallInteger, ForeignKey(column="experimental_system.id"), primary_key=True)
+    evidence: Mapped[int] = mapped_column()
+    system: Mapped[ExperimentalSystem] = relationship(argument="ExperimentalSystem")
+
+    def __repr__(self) -> str:
+        return f"InteractionEdge(protein_a_id={self.protein_a_id}, protein_b_id={self.protein_b_id}, experimental_system_id={self.experimental_system_id}, evidence={self.evidence})"
+
+class DatasetGeneration(Base):
+    """
+    ORM model for the 'dataset_generation' table. Its single row counts the imports committed to the database, so that
+    cached query results can be keyed by the data they were computed from.
+
+    Attributes:
+        id (int): Always 1.
+        generation (int): The number of imports and updates committed so far.
+    """
+    __tablename__ = "dataset_generation"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    generation: Mapped[int] = mapped_column()
+
+    def __repr__(self) -> str:
+        return f"DatasetGeneration(generation={self.generation})"
+
+class TableCount(Base):
+    """
+    ORM model for the 'table_count' summary table, with the number of rows of every data table.
+
+    Attributes:
+        table_name (str): The name of the table.
+        rows (int): The number of rows of the table.
+    """
+    __tablename__ = "table_count"
+    table_name: Mapped[str] = mapped_column(String(length=100), primary_key=True)
+    rows: Mapped[int] = mapped_column()
+
+    def __repr__(self) -> str:
+        return f"TableCount(table_name={self.table_name}, rows={self.rows})"
+
+class OrganismSummary(Base):
+    """
+    ORM model for the 'organism_summary' summary table, with the number of proteins of every organism.
+
+    Attributes:
+        tax_id (int): The taxonomic identifier for the organism.
+        proteins (int): The number of proteins of the organism.
+    """
+    __tablename__ = "organism_summary"
+    tax_id: Mapped[int] = mapped_column(primary_key=True)
+    proteins: Mapped[int] = mapped_column()
+
+    def __repr__(self) -> str:
+        return f"OrganismSummary(tax_id={self.tax_id}, proteins={self.proteins})"
+
+class ExperimentalSystemSummary(Base):
+    """
+    ORM model for the 'experimental_system_summary' summary table, with the number of interactions of every
+    experimental system.
+
+    Attributes:
+        experimental_system (str): The experimental system.
+        experimental_system_type (str): The type of the experimental system.
+        interactions (int): The number of interactions detected with the experimental system.
+    """
+    __tablename__ = "experimental_system_summary"
+    experimental_system: Mapped[str] = mapped_column(String(length=100), primary_key=True)
+    experimental_system_type: Mapped[str] = mapped_column(String(length=100), primary_key=True)
+    interactions: Mapped[int] = mapped_column()
+
+    def __repr__(self) -> str:
+        return f"ExperimentalSystemSummary(experimental_system={self.experimental_system}, experimental_system_type={self.experimental_system_type}, interactions={self.interactions})"
+
+class OrganismPairSummary(Base):
+    """
+    ORM model for the 'organism_pair_summary' summary table, with the number of interactions between the proteins of
+    every pair of organisms, within one organism included. The pair is ordered so that tax_id_a <= tax_id_b.
+
+    Attributes:
+        tax_id_a (int): The smaller taxonomic identifier of the pair.
+        tax_id_b (int): The larger taxonomic identifier of the pair.
+        interactions (int): The number of interactions between proteins of the two organisms.
+    """
+    __tablename__ = "organism_pair_summary"
+    tax_id_a: Mapped[int] = mapped_column(primary_key=True)
+    tax_id_b: Mapped[int] = mapped_column(primary_key=True)
+    interactions: Mapped[int] = mapped_column()
 
     def __repr__(self) -> str:
-        return f"Interaction(id={self.id}, interactor_a_id={self.interactor_a_id}, interactor_b_id={self.interactor_b_id}, score={self.score}, experimental_system={self.experimental_system}, experimental_system_type={self.experimental_system_type})"
\ No newline at end of file
+        return f"OrganismPairSummary(tax_id_a={self.tax_id_a}, tax_id_b={self.tax_id_b}, interactions={self.interactions})"
@@ -0,0 +1,278 @@
+'''
+In this file, the queries to a database partitioned by organism are defined.
+PartitionedQuery reads the list of partitions from the catalog written by `Importer.import_partitions`, and runs every
+call on the partitions it needs only: the partitions of one organism, or of one pair of organisms, for organism-scoped
+calls, so their latency depends on the data of the organism and not on the size of the whole database. Calls about any
+organism are fanned out to all partitions over a thread pool, on one `Query` per partition, and their results merged.
+Calls about proteins only read the partitions of their organisms, which the catalog gives.
+Every call reads the versions of its partitions from the catalog with their keys, so it moves to the partitions of a new
+import as soon as the catalog lists them.
+'''
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
+from sqlalchemy import Engine, Select, func, or_, select
+
+from biogrid.db.engine import create_pooled_engine
+from biogrid.db.manager import Query, in_clause_batch_size, select_interactions
+from biogrid.db.models import Interaction, Protein
+from biogrid.db.partitions import partition_key, partition_table, partition_url
+from biogrid.db.result_cache import ResultCache
+from biogrid.db.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+T = TypeVar("T")
+
+
+class PartitionedQuery:
+    """
+    Class to handle queries to a database partitioned by organism.
+    """
+
+    def __init__(self, engine: Engine, max_workers: int = 8, cache: ResultCache | None = None) -> None:
+        """
+        Initialize the PartitionedQuery class. Like Query, it keeps no session between calls, so one instance can be
+        shared by many threads.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine of the catalog database, i.e. the engine of the Importer.
+            max_workers (int): The number of threads querying partitions at the same time. Defaults to 8.
+            cache (ResultCache | None): If given, the results of every partition are cached in it, keyed by the
+                generation of the partition. Defaults to None.
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be a positive integer, got {max_workers}")
+        self.engine: Engine = engine
+        self.catalog: Query = Query(engine=engine)
+        self.max_workers: int = max_workers
+        self.cache: ResultCache | None = cache
+        self._versions: dict[tuple[int, int], int] = {}
+        self._queries: dict[tuple[int, int], tuple[int, Query]] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def close(self) -> None:
+        """
+        Stop the threads and close the connections to the partitions.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            for _, query in self._queries.values():
+                query.engine.dispose()
+            self._queries.clear()
+
+    def _pruned(self, statement: Select, tax_id: int | None, partner_tax_id: int | None) -> Select:
+        """
+        Restrict a statement on the organism_partition table to the partitions of an organism, or of two organisms.
+
+        Args:
+            statement (Select): The statement.
+            tax_id (int | None): The tax_id of an organism. None does not restrict the statement.
+            partner_tax_id (int | None): The tax_id of the other organism. Only used with `tax_id`.
+
+        Returns:
+            Select: The restricted statement.
+        """
+        if tax_id is not None and partner_tax_id is not None:
+            tax_id_a, tax_id_b = partition_key(tax_id_a=tax_id, tax_id_b=partner_tax_id)
+            return statement.where(partition_table.c.tax_id_a == tax_id_a, partition_table.c.tax_id_b == tax_id_b)
+        if tax_id is not None:
+            return statement.where(or_(partition_table.c.tax_id_a == tax_id, partition_table.c.tax_id_b == tax_id))
+        return statement
+
+    def partitions(self, tax_id: int | None = None, partner_tax_id: int | None = None) -> list[tuple[int, int]]:
+        """
+        List the partitions holding the interactions of an organism, or between two organisms.
+
+        Args:
+            tax_id (int | None): The tax_id of an organism. Defaults to None, for all partitions.
+            partner_tax_id (int | None): The tax_id of the other organism, the same for interactions within the
+                organism. Only used with `tax_id`. Defaults to None, for any.
+
+        Returns:
+            list[tuple[int, int]]: The keys of the partitions, in order.
+        """
+        statement: Select = self._pruned(
+            statement=select(partition_table.c.tax_id_a, partition_table.c.tax_id_b, partition_table.c.version),
+            tax_id=tax_id,
+            partner_tax_id=partner_tax_id,
+        )
+        with self.catalog.session() as session:
+            rows: list = session.execute(statement.order_by(partition_table.c.tax_id_a, partition_table.c.tax_id_b)).all()
+        with self._lock:
+            self._versions.update(((tax_id_a, tax_id_b), version) for tax_id_a, tax_id_b, version in rows)
+        return [(tax_id_a, tax_id_b) for tax_id_a, tax_id_b, _ in rows]
+
+    def _query(self, key: tuple[int, int]) -> Query:
+        """
+        Get the Query of a partition, in the version `partitions` last listed, connecting to it the first time. The
+        connections to an earlier version are closed.
+
+        Args:
+            key (tuple[int, int]): The key of the partition.
+
+        Returns:
+            Query: The query of the partition.
+        """
+        with self._lock:
+            version: int = self._versions[key]
+            if key in self._queries and self._queries[key][0] != version:
+                self._queries.pop(key)[1].engine.dispose()
+            if key not in self._queries:
+                url: str = partition_url(url=self.engine.url, key=key, version=version).render_as_string(hide_password=False)
+                self._queries[key] = (version, Query(engine=create_pooled_engine(url=url), cache=self.cache))
+            return self._queries[key][1]
+
+    def _fan_out(self, keys: list[tuple[int, int]], function: Callable[[Query], T]) -> list[T]:
+        """
+        Run a function on the Query of every given partition, in parallel if there are several.
+
+        Args:
+            keys (list[tuple[int, int]]): The keys of the partitions.
+            function (Callable[[Query], T]): The function to run on every partition.
+
+        Returns:
+            list[T]: The result of every partition, in the order of the keys.
+        """
+        if len(keys) <= 1:
+            # Organism-scoped calls often need one partition, which is not worth a hop to another thread
+            return [function(self._query(key=key)) for key in keys]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="biogrid-partition")
+            executor: ThreadPoolExecutor = self._executor
+        return list(executor.map(lambda key: function(self._query(key=key)), keys))
+
+    def count_interactions(self, tax_id: int | None = None, partner_tax_id: int | None = None) -> int:
+        """
+        Count the interactions of an organism, or between two organisms, from the catalog.
+
+        Args:
+            tax_id (int | None): The tax_id of an organism. Defaults to None, for all interactions.
+            partner_tax_id (int | None): The tax_id of the other organism. Defaults to None, for any.
+
+        Returns:
+            int: The number of interactions.
+        """
+        statement: Select = self._pruned(
+            statement=select(func.coalesce(func.sum(partition_table.c.interactions), 0)), tax_id=tax_id, partner_tax_id=partner_tax_id
+        )
+        with self.catalog.session() as session:
+            return int(session.execute(statement).scalar_one())
+
+    def count_proteins(self, tax_id: int | None = None) -> int:
+        """
+        Count the proteins of an organism, or of all organisms, from the catalog.
+
+        Args:
+            tax_id (int | None): The tax_id of the organism. Defaults to None, for all proteins.
+
+        Returns:
+            int: The number of proteins.
+        """
+        statement: Select = select(func.count()).select_from(Protein)
+        if tax_id is not None:
+            statement = statement.where(Protein.tax_id == tax_id)
+        with self.catalog.session() as session:
+            return int(session.execute(statement).scalar_one())
+
+    def _tax_ids(self, uniprot_ids: list[str]) -> dict[str, int]:
+        """
+        Get the organisms of proteins from the catalog, using IN clauses of at most `in_clause_batch_size` IDs.
+
+        Args:
+            uniprot_ids (list[str]): The UniProt IDs of the proteins, without duplicates.
+
+        Returns:
+            dict[str, int]: The tax_id of every protein, keyed by UniProt ID. Unknown proteins are left out.
+        """
+        tax_ids: dict[str, int] = {}
+        with self.catalog.session() as session:
+            for start in range(0, len(uniprot_ids), in_clause_batch_size):
+                statement: Select = select(Protein.uniprot_id, Protein.tax_id).where(
+                    Protein.uniprot_id.in_(uniprot_ids[start:start + in_clause_batch_size])
+                )
+                tax_ids.update(session.execute(statement).tuples().all())
+        return tax_ids
+
+    def organism_interactions(self, tax_id: int, partner_tax_id: int | None = None, limit: int | None = 100,
+                              offset: int = 0) -> pd.DataFrame:
+        """
+        List the interactions with at least one interactor of an organism, or between two organisms, ordered by
+        interaction id. Only the partitions of the organism are read, which hold nothing else.
+
+        Args:
+            tax_id (int): The tax_id of the organism.
+            partner_tax_id (int | None): The tax_id of the other organism, the same for interactions within the
+                organism. Defaults to None, for any.
+            limit (int | None): The maximum number of interactions to return, for paging. None returns all of them.
+                Defaults to 100.
+            offset (int): The number of interactions to skip, for paging. Defaults to 0.
+
+        Returns:
+            pd.DataFrame: The interactions, with the columns of `Importer.get_interaction_df`.
+        """
+        # Every partition returns its first offset + limit interactions, among which are those of the page
+        statement: Select = select_interactions().order_by(Interaction.id).limit(None if limit is None else offset + limit)
+
+        def interactions(query: Query) -> pd.DataFrame:
+            with query.session() as session:
+                rows: list = session.execute(statement).all()
+            return pd.DataFrame(data=rows, columns=list(statement.selected_columns.keys()))
+
+        frames: list[pd.DataFrame] = self._fan_out(
+            keys=self.partitions(tax_id=tax_id, partner_tax_id=partner_tax_id), function=interactions
+        )
+        if not frames:
+            return pd.DataFrame(columns=list(statement.selected_columns.keys()))
+        df: pd.DataFrame = pd.concat(objs=frames, ignore_index=True).sort_values(by="id", ignore_index=True)
+        return df.iloc[offset:None if limit is None else offset + limit].reset_index(drop=True)
+
+    def lookup_interactions(self, uniprot_ids: Iterable[str]) -> pd.DataFrame:
+        """
+        Look up all interactions of many proteins, on either side, in the partitions of their organisms.
+
+        Args:
+            uniprot_ids (Iterable[str]): The UniProt IDs of the proteins, matched like `Query.lookup_interactions`
+                matches them. Duplicates are ignored.
+
+        Returns:
+            pd.DataFrame: One row per interaction, ordered by id, with the columns of `Query.lookup_interactions`.
+        """
+        # Normalized before the catalog routes them, which stores the IDs as Query matches them
+        unique_ids: list[str] = list(dict.fromkeys(uniprot_id.strip().upper() for uniprot_id in uniprot_ids))
+        organisms: set[int] = set(self._tax_ids(uniprot_ids=unique_ids).values())
+        keys: list[tuple[int, int]] = [key for key in self.partitions() if organisms.intersection(key)]
+        frames: list[pd.DataFrame] = self._fan_out(keys=keys, function=lambda query: query.lookup_interactions(uniprot_ids=unique_ids))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            # The catalog has the tables of a database without interactions, which gives the columns
+            return self.catalog.lookup_interactions(uniprot_ids=[])
+        return pd.concat(objs=frames, ignore_index=True).sort_values(by="id", ignore_index=True)
+
+    def interaction_evidence(self, uniprot_id_a: str, uniprot_id_b: str) -> pd.DataFrame:
+        """
+        Get the evidence that two proteins interact, reported as A-B or B-A, from the partition of their organisms.
+
+        Args:
+            uniprot_id_a (str): The UniProt ID of one protein.
+            uniprot_id_b (str): The UniProt ID of the other protein.
+
+        Returns:
+            pd.DataFrame: The columns of `Query.interaction_evidence`, by decreasing evidence.
+        """
+        uniprot_id_a, uniprot_id_b = uniprot_id_a.strip().upper(), uniprot_id_b.strip().upper()
+        tax_ids: dict[str, int] = self._tax_ids(uniprot_ids=list(dict.fromkeys([uniprot_id_a, uniprot_id_b])))
+        if uniprot_id_a in tax_ids and uniprot_id_b in tax_ids:
+            key: tuple[int, int] = partition_key(tax_id_a=tax_ids[uniprot_id_a], tax_id_b=tax_ids[uniprot_id_b])
+            if key in self.partitions(tax_id=key[0], partner_tax_id=key[1]):
+                return self._query(key=key).interaction_evidence(uniprot_id_a=uniprot_id_a, uniprot_id_b=uniprot_id_b)
+        # The catalog has the tables of a database without interactions, which gives the columns
+        return self.catalog.interaction_evidence(uniprot_id_a=uniprot_id_a, uniprot_id_b=uniprot_id_b)
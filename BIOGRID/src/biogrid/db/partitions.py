@@ -0,0 +1,125 @@
+'''
+In this file, the layout of a database partitioned by organism is defined.
+`Importer.import_partitions` writes the interactions between the proteins of two organisms, or within one organism, to
+a partition of their own: a SQLite file next to the database, e.g. biogrid.9606-2697049.3.db, or a MySQL schema, e.g.
+biokb_9606_2697049_3. Every partition has the tables of a whole database, with the proteins and organisms its interactions
+refer to, so a `Query` can run on it unchanged. The database of the engine is the catalog: it keeps the organisms, the
+proteins, the experimental systems and the list of partitions in the organism_partition table, which `PartitionedQuery`
+reads to prune the partitions of its calls.
+The last number of a partition is its version, the generation of the catalog which lists it. Every import builds its
+partitions under a new version, next to those the catalog lists, and switches the catalog to them when it commits.
+'''
+
+import os
+
+from sqlalchemy import Column, Connection, Engine, Integer, MetaData, Table, select
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
+
+from biogrid.db.engine import recreate_schema, remove_sqlite_files, sqlite_database_file
+
+partition_table = Table(
+    "organism_partition",
+    MetaData(),
+    Column("tax_id_a", Integer, primary_key=True, autoincrement=False),
+    Column("tax_id_b", Integer, primary_key=True, autoincrement=False),
+    Column("interactions", Integer, nullable=False),
+    Column("proteins", Integer, nullable=False),
+    Column("version", Integer, nullable=False),
+)
+
+
+def partition_key(tax_id_a: int, tax_id_b: int) -> tuple[int, int]:
+    """
+    Get the key of the partition of the interactions between two organisms, which is the same for A-B and B-A.
+
+    Args:
+        tax_id_a (int): The tax_id of one organism.
+        tax_id_b (int): The tax_id of the other organism, the same for interactions within one organism.
+
+    Returns:
+        tuple[int, int]: The smaller and the larger tax_id.
+    """
+    return (tax_id_a, tax_id_b) if tax_id_a <= tax_id_b else (tax_id_b, tax_id_a)
+
+
+def partition_url(url: URL, key: tuple[int, int], version: int) -> URL:
+    """
+    Get the URL of a partition of a database.
+
+    Args:
+        url (URL): The URL of the catalog database.
+        key (tuple[int, int]): The key of the partition, from `partition_key`.
+        version (int): The version of the partition.
+
+    Raises:
+        ValueError: If the database is neither a SQLite file nor a MySQL database.
+
+    Returns:
+        URL: The URL of the partition.
+    """
+    tax_id_a, tax_id_b = key
+    database_file: str | None = sqlite_database_file(url=url)
+    if database_file is not None:
+        root, extension = os.path.splitext(database_file)
+        return url.set(database=f"{root}.{tax_id_a}-{tax_id_b}.{version}{extension}")
+    if url.get_backend_name() in ("mysql", "mariadb") and url.database:
+        return url.set(database=f"{url.database}_{tax_id_a}_{tax_id_b}_{version}")
+    raise ValueError(f"Partitioning needs a SQLite file or a MySQL database, got {url.render_as_string(hide_password=True)}")
+
+
+def stored_partitions(connection: Connection | Session) -> dict[tuple[int, int], int]:
+    """
+    List the partitions of a catalog database.
+
+    Args:
+        connection (Connection | Session): A connection or session of the catalog database.
+
+    Returns:
+        dict[tuple[int, int], int]: The version of every partition, by key, in the order of the keys. Empty if the database
+            is not partitioned.
+    """
+    bind: Connection = connection.connection() if isinstance(connection, Session) else connection
+    partition_table.create(bind=bind, checkfirst=True)
+    return {(tax_id_a, tax_id_b): version for tax_id_a, tax_id_b, version in connection.execute(
+        select(partition_table.c.tax_id_a, partition_table.c.tax_id_b, partition_table.c.version)
+        .order_by(partition_table.c.tax_id_a, partition_table.c.tax_id_b)
+    ).all()}
+
+
+def create_partition(engine: Engine, key: tuple[int, int], version: int) -> URL:
+    """
+    Discard a partition, if it is left from an aborted import, so that it can be imported into again.
+
+    Args:
+        engine (Engine): The engine of the catalog database.
+        key (tuple[int, int]): The key of the partition.
+        version (int): The version of the partition.
+
+    Returns:
+        URL: The URL of the empty partition.
+    """
+    url: URL = partition_url(url=engine.url, key=key, version=version)
+    if engine.dialect.name == "sqlite":
+        remove_sqlite_files(database_file=url.database)
+    else:
+        recreate_schema(engine=engine, schema=url.database)
+    return url
+
+
+def drop_partition(engine: Engine, key: tuple[int, int], version: int) -> None:
+    """
+    Remove a partition, e.g. one which the catalog does not list anymore.
+    On SQLite, the files are unlinked, so the connections still open on them can finish their reads.
+
+    Args:
+        engine (Engine): The engine of the catalog database.
+        key (tuple[int, int]): The key of the partition.
+        version (int): The version of the partition.
+    """
+    url: URL = partition_url(url=engine.url, key=key, version=version)
+    if engine.dialect.name == "sqlite":
+        remove_sqlite_files(database_file=url.database)
+    else:
+        with engine.connect() as connection:
+            connection.exec_driver_sql(f"DROP DATABASE IF EXISTS `{url.database}`")
@@ -0,0 +1,174 @@
+'''
+In this file, the parsed BioGRID release is cached in a columnar Arrow IPC file next to the TSV file, so that later
+imports of the same release memory-map the cache instead of parsing the TSV again.
+The cache is keyed by the BLAKE2 hash of the TSV file and by the members read from a .zip archive. A JSON manifest next
+to it records them with the size and modification time the hash was computed for, so an unchanged file is recognized
+without hashing it again. A cache of other members is replaced by the next import which writes the cache. pyarrow is only needed when the
+cache is used and can be installed with the `arrow` extra.
+'''
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import warnings
+from typing import Iterator
+
+from biogrid.db.lazy import import_pyarrow, lazy_import
+
+pd = lazy_import("pandas")
+
+# Bump when the layout of the cached frame changes, to invalidate the caches written by older versions
+cache_format_version: int = 2
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Hash the content of a file.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The hex encoded BLAKE2b digest of the file.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ReleaseCache:
+    """
+    Arrow IPC cache of the DataFrame parsed from a TSV file.
+
+    Attributes:
+        source_path (str): The path to the TSV file.
+        members (list[str] | None): The members of a .zip archive which are read, in the order they are read, or None
+            for all of them.
+        cache_path (str): The path to the Arrow IPC file, next to the TSV file.
+        manifest_path (str): The path to the JSON manifest describing which version of the TSV file is cached.
+    """
+
+    def __init__(self, source_path: str, members: list[str] | None = None) -> None:
+        """
+        Initialize the ReleaseCache class.
+
+        Args:
+            source_path (str): The path to the TSV file.
+            members (list[str] | None): The members of a .zip archive which are read. Their order is kept, as it decides
+                which row of a repeated interaction comes first. Defaults to None, for all of them.
+        """
+        self.source_path: str = source_path
+        self.members: list[str] | None = list(members) if members is not None else None
+        self.cache_path: str = f"{source_path}.arrow"
+        self.manifest_path: str = f"{source_path}.arrow.json"
+
+    def _stat(self) -> dict:
+        """
+        Get the size and modification time of the TSV file.
+
+        Returns:
+            dict: The keys size and mtime_ns.
+        """
+        stat: os.stat_result = os.stat(self.source_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_valid(self) -> bool:
+        """
+        Check whether the cache holds the current content of the TSV file.
+        The file is only hashed if its size or modification time changed, and if the hash is still the same, the
+        manifest is updated so that the next check does not hash it again.
+
+        Returns:
+            bool: True if the cache can be used.
+        """
+        if not (os.path.exists(self.cache_path) and os.path.exists(self.manifest_path)):
+            return False
+        with open(self.manifest_path) as file:
+            manifest: dict = json.load(file)
+        if manifest.get("version") != cache_format_version or manifest.get("members") != self.members:
+            return False
+        stat: dict = self._stat()
+        if stat["size"] != manifest["size"]:
+            return False
+        if stat["mtime_ns"] == manifest["mtime_ns"]:
+            return True
+        if file_hash(file_path=self.source_path) != manifest["blake2b"]:
+            return False
+        self._write_manifest(manifest={**manifest, **stat})
+        return True
+
+    def _write_manifest(self, manifest: dict) -> None:
+        """
+        Atomically replace the manifest.
+
+        Args:
+            manifest (dict): The manifest to write.
+        """
+        with open(f"{self.manifest_path}.tmp", 'w') as file:
+            json.dump(manifest, file)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+    def _open(self):
+        """
+        Memory-map the cached table.
+
+        Returns:
+            pyarrow.Table: The cached table. Its buffers point into the mapped file.
+        """
+        pyarrow = import_pyarrow(feature="The release cache")
+        with pyarrow.memory_map(self.cache_path) as source:
+            return pyarrow.ipc.open_file(source).read_all()
+
+    def load(self) -> pd.DataFrame | None:
+        """
+        Load the cached DataFrame if the cache is valid.
+
+        Returns:
+            pd.DataFrame | None: The cached DataFrame, or None if there is no valid cache.
+        """
+        if not self.is_valid():
+            return None
+        return self._open().to_pandas()
+
+    def iter_chunks(self, chunksize: int) -> Iterator[pd.DataFrame] | None:
+        """
+        Stream the cached DataFrame in chunks, converting only one chunk at a time, if the cache is valid.
+
+        Args:
+            chunksize (int): The maximum number of rows per chunk.
+
+        Returns:
+            Iterator[pd.DataFrame] | None: An iterator over the chunks, or None if there is no valid cache.
+        """
+        if not self.is_valid():
+            return None
+        table = self._open()
+        return (table.slice(offset=start, length=chunksize).to_pandas() for start in range(0, table.num_rows, chunksize))
+
+    def store(self, df: pd.DataFrame) -> None:
+        """
+        Write the DataFrame parsed from the TSV file to the cache. Failing to write the cache, e.g. because the folder of
+        the TSV file is read only, only raises a warning.
+
+        Args:
+            df (pd.DataFrame): The parsed DataFrame.
+        """
+        pyarrow = import_pyarrow(feature="The release cache")
+        stat: dict = self._stat()
+        manifest: dict = {
+            "version": cache_format_version, "members": self.members, **stat, "blake2b": file_hash(file_path=self.source_path)
+        }
+        try:
+            table = pyarrow.Table.from_pandas(df=df, preserve_index=False)
+            # Uncompressed, so that the file can be memory-mapped without decoding it
+            with pyarrow.OSFile(f"{self.cache_path}.tmp", 'wb') as sink:
+                with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(f"{self.cache_path}.tmp", self.cache_path)
+            self._write_manifest(manifest=manifest)
+        except OSError as e:
+            warnings.warn(f"Could not write the release cache {self.cache_path}: {e}")
@@ -0,0 +1,357 @@
+'''
+In this file, the swap of a release built next to the live database is defined.
+`Importer.reload` imports a release into a shadow database, where the bulk load, the indexes, the summaries and the
+search index are built without touching the live data, and checks the row counts of the shadow before swapping it in.
+On SQLite, the live path is a symbolic link to the file of a release, e.g. biogrid.db to biogrid.5f0c2a9e41d7.db, and
+the link is replaced by one to the file of the shadow; on MySQL, the tables of the shadow schema and of the live one are
+exchanged with a single RENAME TABLE statement. Both are atomic, so readers see either the previous release or the new
+one. As SQLite names the WAL and shared memory files after the file a link points to, every release keeps its own, and
+the connections opened before a swap keep reading the previous release until `Query` reconnects. The previous release
+is kept, in a file or schema of its own, so that `Importer.rollback` swaps it back in at once.
+'''
+
+import os
+import time
+import uuid
+from typing import Literal
+
+from sqlalchemy import Engine, create_engine, func, inspect, select, update
+from sqlalchemy.engine import URL
+
+from biogrid.db.engine import recreate_schema, remove_sqlite_files, sqlite_database_file
+from biogrid.db.models import Base, DatasetGeneration, ExperimentalSystem, Interaction, InteractionEdge, Organism, Protein, TableCount
+from biogrid.db.report import ImportReport
+from biogrid.db.search import search_table
+
+# The tables whose row counts are checked before a shadow is swapped in
+counted_models: tuple[type, ...] = (Organism, Protein, ExperimentalSystem, Interaction, InteractionEdge)
+
+# Seconds to wait for the readers of a SQLite database in WAL mode to let the checkpoint before a swap complete
+checkpoint_timeout: float = 30.0
+
+
+def sibling_url(url: URL, role: Literal["shadow", "previous"]) -> URL:
+    """
+    Get the URL of the shadow or previous database of a live database, e.g. biogrid.shadow.db next to biogrid.db, or
+    the schema biokb_shadow next to biokb.
+
+    Args:
+        url (URL): The URL of the live database.
+        role (Literal["shadow", "previous"]): Which sibling to get.
+
+    Raises:
+        ValueError: If the database is neither a SQLite file nor a MySQL database.
+
+    Returns:
+        URL: The URL of the sibling.
+    """
+    database_file: str | None = sqlite_database_file(url=url)
+    if database_file is not None:
+        root, extension = os.path.splitext(database_file)
+        return url.set(database=f"{root}.{role}{extension}")
+    if url.get_backend_name() in ("mysql", "mariadb") and url.database:
+        return url.set(database=f"{url.database}_{role}")
+    raise ValueError(f"Reloading needs a SQLite file or a MySQL database, got {url.render_as_string(hide_password=True)}")
+
+
+def _table_names() -> list[str]:
+    """
+    Get the names of the tables a release consists of.
+
+    Returns:
+        list[str]: The tables of the models and the protein_search table.
+    """
+    return [table.name for table in Base.metadata.sorted_tables] + [search_table.name]
+
+
+def prepare_shadow(engine: Engine) -> URL:
+    """
+    Discard the shadow database of a live database, if any is left from an aborted reload, so that a release can be
+    imported into it.
+
+    Args:
+        engine (Engine): The engine of the live database.
+
+    Returns:
+        URL: The URL of the empty shadow database.
+    """
+    shadow_url: URL = sibling_url(url=engine.url, role="shadow")
+    if engine.dialect.name == "sqlite":
+        remove_sqlite_files(database_file=shadow_url.database)
+    else:
+        recreate_schema(engine=engine, schema=shadow_url.database)
+    return shadow_url
+
+
+def discard_shadow(engine: Engine) -> None:
+    """
+    Remove the shadow database of a live database, e.g. after its release failed the checks.
+
+    Args:
+        engine (Engine): The engine of the live database.
+    """
+    shadow_url: URL = sibling_url(url=engine.url, role="shadow")
+    if engine.dialect.name == "sqlite":
+        remove_sqlite_files(database_file=shadow_url.database)
+    else:
+        with engine.connect() as connection:
+            connection.exec_driver_sql(f"DROP DATABASE IF EXISTS `{shadow_url.database}`")
+
+
+def table_counts(engine: Engine) -> dict[str, int]:
+    """
+    Count the rows of the tables of a release.
+
+    Args:
+        engine (Engine): The engine of the database.
+
+    Returns:
+        dict[str, int]: The number of rows of every table, keyed by table name. 0 for missing tables.
+    """
+    existing: set[str] = set(inspect(engine).get_table_names())
+    counts: dict[str, int] = {}
+    with engine.connect() as connection:
+        for model in counted_models:
+            counts[model.__tablename__] = (
+                connection.execute(select(func.count()).select_from(model)).scalar_one() if model.__tablename__ in existing else 0
+            )
+    return counts
+
+
+def validate_counts(engine: Engine, report: ImportReport, live_counts: dict[str, int], min_row_ratio: float | None) -> dict[str, int]:
+    """
+    Check the row counts of a shadow database before it is swapped in.
+    Every table has to hold the rows its import inserted, the table_count summary has to agree with them, and the
+    release has to contain interactions. With `min_row_ratio`, the tables also must not shrink below that fraction of
+    the live ones, which catches truncated downloads.
+
+    Args:
+        engine (Engine): The engine of the shadow database.
+        report (ImportReport): The report of the import into the shadow database.
+        live_counts (dict[str, int]): The row counts of the live database, from `table_counts`.
+        min_row_ratio (float | None): The smallest allowed ratio of shadow to live rows. None does not compare them.
+
+    Raises:
+        ValueError: If a check fails.
+
+    Returns:
+        dict[str, int]: The row counts of the shadow database, keyed by table name.
+    """
+    counts: dict[str, int] = table_counts(engine=engine)
+    with engine.connect() as connection:
+        summarized: dict[str, int] = dict(connection.execute(select(TableCount.table_name, TableCount.rows)).all())
+    for table_name, rows in counts.items():
+        inserted: int = report[f"insert_{table_name}"].rows_out
+        if rows != inserted:
+            raise ValueError(f"The shadow table {table_name} has {rows} rows, but {inserted} were inserted")
+        if table_name in summarized and summarized[table_name] != rows:
+            raise ValueError(f"The table_count summary of {table_name} is {summarized[table_name]}, but the table has {rows} rows")
+        if min_row_ratio is not None and rows < min_row_ratio * live_counts.get(table_name, 0):
+            raise ValueError(
+                f"The shadow table {table_name} has {rows} rows, less than {min_row_ratio:.0%} of the "
+                f"{live_counts[table_name]} live rows"
+            )
+    if not counts[Interaction.__tablename__]:
+        raise ValueError("The release has no interactions")
+    return counts
+
+
+def set_generation(url: URL, generation: int) -> None:
+    """
+    Set the generation of the dataset of a database which no reader uses yet, e.g. a shadow before it is swapped in.
+
+    Args:
+        url (URL): The URL of the database.
+        generation (int): The generation.
+    """
+    engine: Engine = create_engine(url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(update(DatasetGeneration.__table__).where(DatasetGeneration.id == 1).values(generation=generation))
+    finally:
+        engine.dispose()
+
+
+def _checkpoint(engine: Engine) -> None:
+    """
+    Move the content of the WAL file of a SQLite database into the database file and truncate the WAL file, so that
+    the database file holds all committed data on its own.
+
+    Args:
+        engine (Engine): The engine of the database.
+
+    Raises:
+        TimeoutError: If readers keep the checkpoint from completing for `checkpoint_timeout` seconds.
+    """
+    deadline: float = time.monotonic() + checkpoint_timeout
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA journal_mode").scalar() != "wal":
+            return
+        while connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()[0]:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Readers kept the WAL checkpoint from completing for {checkpoint_timeout} seconds")
+            time.sleep(0.05)
+
+
+def _release_file(database_file: str) -> str:
+    """
+    Get a new name for the file of a release of a SQLite database, e.g. biogrid.5f0c2a9e41d7.db next to biogrid.db.
+
+    Args:
+        database_file (str): The live path of the database.
+
+    Returns:
+        str: The name, which no other file has.
+    """
+    root, extension = os.path.splitext(database_file)
+    return f"{root}.{uuid.uuid4().hex[:12]}{extension}"
+
+
+def _point(path: str, target: str) -> None:
+    """
+    Make a path a symbolic link to a database file, replacing the link or file at the path atomically.
+
+    Args:
+        path (str): The path.
+        target (str): The database file.
+    """
+    link: str = f"{path}.{uuid.uuid4().hex}.tmp"
+    os.symlink(os.path.relpath(target, start=os.path.dirname(os.path.abspath(path))), link)
+    os.replace(link, path)
+
+
+def _swap_files(engine: Engine, incoming: str, outgoing: str) -> None:
+    """
+    Point the live path of a SQLite database to another release file, and the outgoing path to the release it pointed
+    to. The release the outgoing path pointed to before is removed.
+    A live database which is still a plain file gets a release name of its own first, after its WAL is checkpointed,
+    and the WAL and shared memory files named after the live path are removed, so that no release opens them again.
+
+    Args:
+        engine (Engine): The engine of the live database.
+        incoming (str): The release file to swap in.
+        outgoing (str): The path which points to the swapped out release.
+    """
+    live: str = sqlite_database_file(url=engine.url)
+    current: str | None = None
+    plain_file: bool = os.path.exists(live) and not os.path.islink(live)
+    if os.path.islink(live):
+        current = os.path.realpath(live)
+    elif plain_file:
+        _checkpoint(engine=engine)
+        # The link keeps the live file under a release name, while the live name still points to it
+        current = _release_file(database_file=live)
+        os.link(live, current)
+    replaced: str | None = os.path.realpath(outgoing) if os.path.islink(outgoing) else None
+
+    _point(path=live, target=incoming)
+    if current is not None:
+        _point(path=outgoing, target=current)
+    if plain_file:
+        for path in (f"{live}-wal", f"{live}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    if replaced is not None and replaced not in (current, os.path.realpath(incoming)):
+        remove_sqlite_files(database_file=replaced)
+    # The pooled connections still read the release which was swapped out, so new ones are opened
+    engine.dispose()
+
+
+def _release_of(path: str) -> str:
+    """
+    Get the release file a path of a SQLite database points to. A plain file, e.g. a previous release kept by an
+    earlier version, is moved to a release name, which it must not be used under while it is moved.
+
+    Args:
+        path (str): The path, e.g. of the previous database.
+
+    Returns:
+        str: The release file.
+    """
+    if os.path.islink(path):
+        return os.path.realpath(path)
+    release: str = _release_file(database_file=path)
+    os.replace(path, release)
+    return release
+
+
+def _rename_tables(engine: Engine, renames: list[tuple[str, str, str]]) -> None:
+    """
+    Move tables between MySQL schemas with one RENAME TABLE statement, which is atomic.
+
+    Args:
+        engine (Engine): An engine of the server.
+        renames (list[tuple[str, str, str]]): The table name, source schema and target schema of every move, in order.
+    """
+    clauses: list[str] = [f"`{source}`.`{table}` TO `{target}`.`{table}`" for table, source, target in renames]
+    with engine.connect() as connection:
+        connection.exec_driver_sql(f"RENAME TABLE {', '.join(clauses)}")
+
+
+def swap_in(engine: Engine) -> None:
+    """
+    Swap the shadow database in for the live one, which becomes the previous database.
+
+    Args:
+        engine (Engine): The engine of the live database.
+    """
+    shadow_url: URL = sibling_url(url=engine.url, role="shadow")
+    previous_url: URL = sibling_url(url=engine.url, role="previous")
+    if engine.dialect.name == "sqlite":
+        # The shadow is not opened by readers, and has no WAL file, as its engine uses the rollback journal
+        incoming: str = _release_file(database_file=sqlite_database_file(url=engine.url))
+        os.replace(shadow_url.database, incoming)
+        _swap_files(engine=engine, incoming=incoming, outgoing=previous_url.database)
+        return
+
+    live: str = engine.url.database
+    recreate_schema(engine=engine, schema=previous_url.database)
+    live_tables: set[str] = set(inspect(engine).get_table_names())
+    _rename_tables(
+        engine=engine,
+        renames=[(table, live, previous_url.database) for table in _table_names() if table in live_tables]
+        + [(table, shadow_url.database, live) for table in _table_names()],
+    )
+    discard_shadow(engine=engine)
+
+
+def restore_previous(engine: Engine) -> None:
+    """
+    Swap the previous database back in for the live one, which becomes the previous database in turn, so that a second
+    rollback undoes the first. The generation of the restored dataset is set past the live one, so that no cached
+    result of the live dataset is served for it.
+
+    Args:
+        engine (Engine): The engine of the live database.
+
+    Raises:
+        FileNotFoundError: If there is no previous database.
+    """
+    previous_url: URL = sibling_url(url=engine.url, role="previous")
+    if engine.dialect.name == "sqlite":
+        if not os.path.exists(previous_url.database):
+            raise FileNotFoundError(f"There is no previous database {previous_url.database}")
+    elif DatasetGeneration.__tablename__ not in inspect(engine).get_table_names(schema=previous_url.database):
+        raise FileNotFoundError(f"There is no previous database {previous_url.database}")
+
+    with engine.connect() as connection:
+        generation: int = connection.execute(select(DatasetGeneration.generation).where(DatasetGeneration.id == 1)).scalar_one()
+    set_generation(url=previous_url, generation=generation + 1)
+
+    if engine.dialect.name == "sqlite":
+        _swap_files(engine=engine, incoming=_release_of(path=previous_url.database), outgoing=previous_url.database)
+        return
+
+    # The shadow schema holds the live tables for the moment of the statement
+    live: str = engine.url.database
+    shadow: str = sibling_url(url=engine.url, role="shadow").database
+    recreate_schema(engine=engine, schema=shadow)
+    previous_tables: set[str] = set(inspect(engine).get_table_names(schema=previous_url.database))
+    live_tables: set[str] = set(inspect(engine).get_table_names())
+    _rename_tables(
+        engine=engine,
+        renames=[(table, live, shadow) for table in _table_names() if table in live_tables]
+        + [(table, previous_url.database, live) for table in _table_names() if table in previous_tables]
+        + [(table, shadow, previous_url.database) for table in _table_names() if table in live_tables],
+    )
+    discard_shadow(engine=engine)
@@ -0,0 +1,220 @@
+'''
+In this file, the instrumentation of the import pipeline is defined.
+An ImportReport collects, for every stage of the import, the wall time spent, the rows going in and out, and the rows
+dropped with the reason why. It can be exported as JSON or in the Prometheus text exposition format, to track the
+ingestion of every release.
+'''
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterator
+
+from biogrid.db.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_bytes() -> int | None:
+    """
+    Get the peak resident set size of this process or of its worker processes, whichever is larger.
+
+    Returns:
+        int | None: The peak memory in bytes, or None where it cannot be measured (Windows).
+    """
+    if resource is None:
+        return None
+    peak: int = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports kilobytes, macOS bytes
+
+
+@dataclass
+class StageReport:
+    """
+    Measurements of one stage of the import.
+
+    Attributes:
+        seconds (float): Wall time spent in the stage. With several worker processes, the time of all workers is summed.
+        calls (int): Number of times the stage ran, e.g. once per chunk.
+        rows_in (int): Number of rows going into the stage.
+        rows_out (int): Number of rows coming out of the stage.
+        dropped (dict[str, int]): Number of rows dropped by the stage, by reason.
+    """
+    seconds: float = 0.0
+    calls: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    dropped: dict[str, int] = field(default_factory=dict)
+
+    def drop(self, reason: str, rows: int) -> None:
+        """
+        Record dropped rows.
+
+        Args:
+            reason (str): Why the rows were dropped.
+            rows (int): The number of dropped rows.
+        """
+        if rows:
+            self.dropped[reason] = self.dropped.get(reason, 0) + int(rows)
+
+
+@dataclass
+class ImportReport:
+    """
+    Measurements of one run of `Importer.import_data`.
+
+    Attributes:
+        stages (dict[str, StageReport]): The measurements of every stage, in the order the stages first ran.
+        seconds (float): Wall time of the whole import.
+        peak_rss_bytes (int | None): Peak resident memory of the importing process or its workers, since they started.
+        error (str | None): The error which aborted the import, or None if it succeeded.
+    """
+    stages: dict[str, StageReport] = field(default_factory=dict)
+    seconds: float = 0.0
+    peak_rss_bytes: int | None = None
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def __getitem__(self, name: str) -> StageReport:
+        """
+        Get the measurements of a stage, creating them when the stage runs for the first time.
+
+        Args:
+            name (str): The name of the stage.
+
+        Returns:
+            StageReport: The measurements of the stage.
+        """
+        if name not in self.stages:
+            self.stages[name] = StageReport()
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageReport]:
+        """
+        Time one run of a stage.
+
+        Args:
+            name (str): The name of the stage.
+
+        Yields:
+            StageReport: The measurements of the stage, to record rows on.
+        """
+        stage: StageReport = self[name]
+        start: float = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - start
+            stage.calls += 1
+
+    def timed_chunks(self, name: str, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Time the production of every chunk of an iterator, e.g. the parsing of the file, and count the rows produced.
+
+        Args:
+            name (str): The name of the stage.
+            chunks (Iterator[pd.DataFrame]): The chunks.
+
+        Yields:
+            pd.DataFrame: The chunks.
+        """
+        while True:
+            with self.stage(name=name) as stage:
+                chunk: pd.DataFrame | None = next(chunks, None)
+                if chunk is not None:
+                    stage.rows_out += len(chunk)
+            if chunk is None:
+                self[name].calls -= 1  # The last call only found the end of the iterator
+                return
+            yield chunk
+
+    def merge(self, other: "ImportReport") -> None:
+        """
+        Add the stage measurements of another report, e.g. one filled in a worker process.
+
+        Args:
+            other (ImportReport): The report to add.
+        """
+        for name, other_stage in other.stages.items():
+            stage: StageReport = self[name]
+            stage.seconds += other_stage.seconds
+            stage.calls += other_stage.calls
+            stage.rows_in += other_stage.rows_in
+            stage.rows_out += other_stage.rows_out
+            for reason, rows in other_stage.dropped.items():
+                stage.drop(reason=reason, rows=rows)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the report into plain Python objects.
+
+        Returns:
+            dict: The report.
+        """
+        return asdict(self)
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Serialize the report as JSON.
+
+        Args:
+            **kwargs: Passed on to `json.dumps`, e.g. indent.
+
+        Returns:
+            str: The report as JSON.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "biogrid_import") -> str:
+        """
+        Serialize the report in the Prometheus text exposition format, e.g. for the textfile collector of node_exporter.
+
+        Args:
+            prefix (str): The prefix of the metric names. Defaults to "biogrid_import".
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines: list[str] = []
+
+        def metric(name: str, help: str, samples: list[tuple[dict[str, str], float]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for labels, value in samples:
+                label_text: str = ",".join(f'{key}="{value}"' for key, value in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+        metric("success", "Whether the import succeeded.", [({}, int(self.succeeded))])
+        metric("seconds", "Wall time of the whole import.", [({}, self.seconds)])
+        if self.peak_rss_bytes is not None:
+            metric("peak_rss_bytes", "Peak resident memory of the importing processes.", [({}, self.peak_rss_bytes)])
+        metric("stage_seconds", "Wall time spent in each stage.", [({"stage": name}, stage.seconds) for name, stage in self.stages.items()])
+        metric("stage_rows_in", "Rows going into each stage.", [({"stage": name}, stage.rows_in) for name, stage in self.stages.items()])
+        metric("stage_rows_out", "Rows coming out of each stage.", [({"stage": name}, stage.rows_out) for name, stage in self.stages.items()])
+        metric("stage_rows_dropped", "Rows dropped by each stage, by reason.", [
+            ({"stage": name, "reason": reason}, rows) for name, stage in self.stages.items() for reason, rows in stage.dropped.items()
+        ])
+        return "\n".join(lines) + "\n"
+
+    def __str__(self) -> str:
+        rows: list[str] = [f"{'stage':<20}{'seconds':>10}{'rows in':>12}{'rows out':>12}  dropped"]
+        for name, stage in self.stages.items():
+            dropped: str = ", ".join(f"{reason}: {count}" for reason, count in stage.dropped.items())
+            rows.append(f"{name:<20}{stage.seconds:>10.3f}{stage.rows_in:>12}{stage.rows_out:>12}  {dropped}")
+        status: str = "succeeded" if self.succeeded else f"failed: {self.error}"
+        memory: str = f", peak memory {self.peak_rss_bytes / 2**20:.0f} MiB" if self.peak_rss_bytes is not None else ""
+        rows.append(f"Import {status} in {self.seconds:.3f} s{memory}")
+        return "\n".join(rows)
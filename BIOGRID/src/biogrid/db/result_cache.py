@@ -0,0 +1,300 @@
+'''
+In this file, the cache of query results is defined.
+Query keys every cached result by the generation of the dataset, which the Importer increments in the transaction of
+every import and update, so a result is never served for data other than the data it was computed from. Entries also
+expire after a time to live. The cache is an LRU in memory, and can be backed by a directory which other processes
+of the same user share, e.g. the workers of a web service. As the results are pickled, which runs code when they are
+loaded, the directory has to be private to the user. It holds at most `max_files` results, and Query removes the files
+of the older generations of its database when the generation changes.
+Results are copied on their way in and out, so that a caller modifying one does not change what the next hit returns.
+An InteractionGraph is too large to copy on every hit: its arrays are made read-only instead, and shared by all callers.
+'''
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from biogrid.db.graph import InteractionGraph
+from biogrid.db.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+_missing = object()
+
+
+def _digest(value: Hashable) -> str:
+    """
+    Hash the repr of a key, or of a part of it, into a file name.
+
+    Args:
+        value (Hashable): The key. Its repr has to identify it across processes.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return hashlib.blake2b(repr(value).encode(), digest_size=20).hexdigest()
+
+
+def _modified(entry: os.DirEntry) -> float:
+    """
+    Get when a file was last written, or 0 if it was removed meanwhile, which sorts it first.
+
+    Args:
+        entry (os.DirEntry): The file.
+
+    Returns:
+        float: The modification time.
+    """
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _check_private(directory: str) -> None:
+    """
+    Check that a cache directory belongs to the user and that other users can neither read nor write it, as loading a
+    pickle file which someone else wrote would run their code.
+
+    Args:
+        directory (str): The directory.
+
+    Raises:
+        PermissionError: If the directory belongs to another user, or other users can access it.
+    """
+    if not hasattr(os, "getuid"):  # Windows has no owner and mode bits to check
+        return
+    stat: os.stat_result = os.stat(directory)
+    if stat.st_uid != os.getuid():
+        raise PermissionError(f"The cache directory {directory} belongs to another user")
+    if stat.st_mode & 0o077:
+        raise PermissionError(f"The cache directory {directory} is accessible to other users, restrict it with chmod 700")
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a time to live, optionally shared with other processes through a directory.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 300.0, directory: str | None = None, max_files: int = 10_000) -> None:
+        """
+        Initialize the ResultCache class.
+
+        Args:
+            maxsize (int): The maximum number of results kept in memory. Defaults to 1024.
+            ttl (float | None): Seconds after which a result expires. None keeps results until they are evicted, which
+                is safe as the keys change with every import. Defaults to 300.
+            directory (str | None): A directory where results are also written, one pickle file per key, and read
+                from by every process using the same directory. It is created with mode 0700 if it does not exist.
+                Defaults to None, which only caches in memory.
+            max_files (int): The maximum number of results kept in the directory. The least recently written ones are
+                removed beyond it. Defaults to 10_000.
+
+        Raises:
+            PermissionError: If the directory belongs to another user, or other users can access it.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer, got {maxsize}")
+        if max_files < 1:
+            raise ValueError(f"max_files must be a positive integer, got {max_files}")
+        self.maxsize: int = maxsize
+        self.ttl: float | None = ttl
+        self.directory: str | None = directory
+        self.max_files: int = max_files
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(name=directory, mode=0o700, exist_ok=True)
+            _check_private(directory=directory)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: Hashable) -> str:
+        """
+        Get the file of a key in the shared directory. The files of keys starting with a namespace and a generation,
+        like those of Query, are named after both, so that `retire` finds them.
+
+        Args:
+            key (Hashable): The key. Its repr has to identify it across processes.
+
+        Returns:
+            str: The path of the file.
+        """
+        name: str = _digest(value=key) + ".pickle"
+        if isinstance(key, tuple) and len(key) >= 2 and isinstance(key[1], int):
+            name = f"{_digest(value=key[0])}.{key[1]}.{name}"
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _copy(value: object) -> object:
+        """
+        Copy results on their way in and out, so that callers modifying a result do not modify the cached one.
+        DataFrames, lists, dicts and sets are copied. The arrays of an InteractionGraph are made read-only instead, so
+        that the graph can be shared.
+
+        Args:
+            value (object): The result.
+
+        Returns:
+            object: The copied result, the read-only graph, or the result itself if it is immutable, e.g. an int.
+        """
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        if isinstance(value, (list, dict, set)):
+            return copy.deepcopy(value)
+        if isinstance(value, InteractionGraph):
+            for array in (value.nodes, value.offsets, value.neighbors):
+                array.flags.writeable = False
+        return value
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        """
+        Get the result of a key, from memory or else from the shared directory.
+
+        Args:
+            key (Hashable): The key.
+            default (object): Returned if the key is missing or expired. Defaults to None.
+
+        Returns:
+            object: The result or the default.
+        """
+        now: float = time.time()
+        with self._lock:
+            entry: tuple[float, object] | None = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(value=entry[1])
+            self._entries.pop(key, None)
+
+        value: object = self._read(key=key, now=now)
+        with self._lock:
+            if value is _missing:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return self._copy(value=value)
+
+    def _read(self, key: Hashable, now: float) -> object:
+        """
+        Read the result of a key from the shared directory, and keep it in memory.
+
+        Args:
+            key (Hashable): The key.
+            now (float): The current time.
+
+        Returns:
+            object: The result, or `_missing` if there is no cache directory or the key is missing or expired.
+        """
+        if self.directory is None:
+            return _missing
+        path: str = self._path(key=key)
+        try:
+            with open(path, "rb") as file:
+                created, stored_key, value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return _missing
+        if stored_key != key or (self.ttl is not None and now - created >= self.ttl):
+            return _missing
+        self._remember(key=key, created=created, value=value)
+        return value
+
+    def _remember(self, key: Hashable, created: float, value: object) -> None:
+        """
+        Keep a result in memory, evicting the least recently used ones beyond `maxsize`.
+
+        Args:
+            key (Hashable): The key.
+            created (float): When the result was computed.
+            value (object): The result.
+        """
+        with self._lock:
+            self._entries[key] = (created, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def set(self, key: Hashable, value: object) -> None:
+        """
+        Cache the result of a key, in memory and in the shared directory.
+
+        Args:
+            key (Hashable): The key.
+            value (object): The result. It has to be picklable if there is a shared directory.
+        """
+        created: float = time.time()
+        value = self._copy(value=value)
+        self._remember(key=key, created=created, value=value)
+        if self.directory is None:
+            return
+        # Written to a temporary file and renamed, so other processes never read a partial file
+        descriptor, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump((created, key, value), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key=key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._prune()
+
+    def _prune(self) -> None:
+        """
+        Remove the least recently written results of the shared directory beyond `max_files`.
+        """
+        files: list[os.DirEntry] = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".pickle")]
+        if len(files) <= self.max_files:
+            return
+        for entry in sorted(files, key=_modified)[:len(files) - self.max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:  # Removed by another process meanwhile
+                pass
+
+    def retire(self, namespace: Hashable, generation: int) -> None:
+        """
+        Remove the results of the generations older than a generation, for keys starting with a namespace and a
+        generation, e.g. when Query sees the generation of its database change.
+
+        Args:
+            namespace (Hashable): The first item of the keys, e.g. the URL of the database.
+            generation (int): The current generation, the second item of the keys.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if isinstance(key, tuple) and len(key) >= 2 and key[0] == namespace]:
+                if isinstance(key[1], int) and key[1] < generation:
+                    del self._entries[key]
+        if self.directory is None:
+            return
+        prefix: str = _digest(value=namespace) + "."
+        for name in os.listdir(self.directory):
+            if not (name.startswith(prefix) and name.endswith(".pickle")):
+                continue
+            stored_generation: str = name[len(prefix):].split(".", 1)[0]
+            if stored_generation.isdigit() and int(stored_generation) < generation:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:  # Removed by another process meanwhile
+                    pass
+
+    def clear(self) -> None:
+        """
+        Remove every result, from memory and from the shared directory.
+        """
+        with self._lock:
+            self._entries.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pickle"):
+                    os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,161 @@
+'''
+In this file, the full-text search over protein symbols and organism names is defined.
+The Importer creates the protein_search table with the other tables, and fills it with one row per protein, with its
+symbol and the name of its organism, in the transaction of every import and update. On SQLite it is an FTS5 virtual
+table with prefix indexes, on MySQL an InnoDB table with a FULLTEXT index, so that Query.search_proteins answers token
+and prefix searches from the index instead of scanning the protein table with LIKE '%x%'. Other dialects fall back to
+LIKE prefix matching on the protein table.
+'''
+
+import re
+
+from sqlalchemy import Column, Connection, Integer, MetaData, Select, String, Table, delete, func, insert, inspect, literal, literal_column, or_, select, text
+from sqlalchemy.orm import Session
+
+from biogrid.db.models import Organism, Protein
+
+# Matches of the symbol weigh more than matches of the organism name, which every protein of the organism shares
+symbol_weight: float = 10.0
+organism_weight: float = 1.0
+
+search_table = Table(
+    "protein_search",
+    MetaData(),
+    Column("uniprot_id", String(length=100), primary_key=True),
+    Column("tax_id", Integer),
+    Column("symbol", String(length=100)),
+    Column("organism", String(length=100)),
+    mysql_engine="InnoDB",
+)
+
+
+def _dialect(connection: Connection | Session) -> str:
+    """
+    Get the name of the dialect of a connection or session.
+
+    Args:
+        connection (Connection | Session): The connection or session.
+
+    Returns:
+        str: The name of the dialect, e.g. "sqlite" or "mysql".
+    """
+    bind = connection.get_bind() if isinstance(connection, Session) else connection
+    return bind.dialect.name
+
+
+def _tokens(query: str) -> list[str]:
+    """
+    Split a search into the tokens the full-text indexes store, i.e. runs of letters and digits.
+
+    Args:
+        query (str): The search, e.g. "nsp sars".
+
+    Returns:
+        list[str]: The tokens.
+    """
+    return re.findall(pattern=r"[^\W_]+", string=query)
+
+
+def create_search_index(connection: Connection | Session) -> None:
+    """
+    Create the protein_search table and its full-text index if they do not exist yet. On MySQL, DDL commits the open
+    transaction implicitly, so this runs on its own, before the transaction which imports the data.
+
+    Args:
+        connection (Connection | Session): The connection or session to create them with.
+    """
+    dialect: str = _dialect(connection=connection)
+    if dialect == "sqlite":
+        # The tokenizer splits symbols like 'HLA-A' into tokens, and the prefix indexes serve searches of 1 to 3
+        # characters followed by '*' without walking the whole vocabulary
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS protein_search USING fts5("
+            "uniprot_id UNINDEXED, tax_id UNINDEXED, symbol, organism, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3')"
+        ))
+    elif dialect in ("mysql", "mariadb"):
+        bind: Connection = connection.connection() if isinstance(connection, Session) else connection
+        search_table.create(bind=bind, checkfirst=True)
+        if "ft_protein_search" not in {index["name"] for index in inspect(bind).get_indexes(search_table.name)}:
+            connection.execute(text("ALTER TABLE protein_search ADD FULLTEXT INDEX ft_protein_search (symbol, organism)"))
+
+
+def refresh_search_index(connection: Connection | Session) -> None:
+    """
+    Fill the protein_search table again from the protein and organism tables, in the transaction of the connection.
+    The table is created by `create_search_index` beforehand. Nothing is done for dialects without a full-text index.
+
+    Args:
+        connection (Connection | Session): The connection or session of the transaction which changed the data.
+    """
+    dialect: str = _dialect(connection=connection)
+    if dialect not in ("sqlite", "mysql", "mariadb"):
+        return
+    connection.execute(delete(search_table))
+    connection.execute(
+        insert(search_table).from_select(
+            ["uniprot_id", "tax_id", "symbol", "organism"],
+            select(Protein.uniprot_id, Protein.tax_id, Protein.symbol, Organism.name).outerjoin(
+                Organism, Protein.tax_id == Organism.tax_id
+            ),
+        )
+    )
+
+
+def search_statement(dialect: str, query: str, prefix: bool = True, limit: int | None = 20, offset: int = 0) -> Select | None:
+    """
+    Build the statement searching the proteins whose symbol or organism name contains every token of a search.
+
+    Args:
+        dialect (str): The name of the dialect, e.g. "sqlite" or "mysql".
+        query (str): The search, e.g. "ACE" or "nsp coronavirus".
+        prefix (bool): Whether the tokens also match the words they start, e.g. 'ACE' matches 'ACE2'. Defaults to True.
+        limit (int | None): The maximum number of proteins to return, for paging. None returns all of them. Defaults to 20.
+        offset (int): The number of proteins to skip, for paging. Defaults to 0.
+
+    Returns:
+        Select | None: The statement, with the columns uniprot_id, symbol, tax_id, organism and score, by decreasing
+            score. None if the search has no tokens.
+    """
+    tokens: list[str] = _tokens(query=query)
+    if not tokens:
+        return None
+
+    if dialect == "sqlite":
+        # Every token is quoted, so that FTS5 does not read words like AND or NOT as operators. With prefixes, a word
+        # equal to the token matches both alternatives, which ranks 'NSP1' before 'NSP11' for the search 'nsp1'
+        match: str = " AND ".join(f'("{token}" OR "{token}"*)' if prefix else f'"{token}"' for token in tokens)
+        # bm25 is lower for better matches
+        score = (-func.bm25(literal_column("protein_search"), 0.0, 0.0, symbol_weight, organism_weight)).label("score")
+        statement: Select = (
+            select(search_table.c.uniprot_id, search_table.c.symbol, search_table.c.tax_id, search_table.c.organism, score)
+            .where(literal_column("protein_search").op("MATCH")(match))
+        )
+        # The rowid orders equal scores without reading the stored columns of every match
+        tie_breaker = literal_column("protein_search.rowid")
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects import mysql
+
+        # Tokens shorter than innodb_ft_min_token_size (3 by default) and stopwords are not indexed by MySQL
+        match = " ".join(f"+({token} {token}*)" if prefix else f"+{token}" for token in tokens)
+        relevance = mysql.match(search_table.c.symbol, search_table.c.organism, against=match).in_boolean_mode()
+        statement = (
+            select(search_table.c.uniprot_id, search_table.c.symbol, search_table.c.tax_id, search_table.c.organism, relevance.label("score"))
+            .where(relevance)
+        )
+        tie_breaker = search_table.c.uniprot_id
+    else:
+        # Without a full-text index, every token has to start the symbol or the organism name
+        conditions = [
+            or_(Protein.symbol.like(f"{token}%" if prefix else token), Organism.name.like(f"{token}%" if prefix else token))
+            for token in tokens
+        ]
+        statement = (
+            select(Protein.uniprot_id, Protein.symbol, Protein.tax_id, Organism.name.label("organism"), literal(1.0).label("score"))
+            .outerjoin(Organism, Protein.tax_id == Organism.tax_id)
+            .where(*conditions)
+        )
+        tie_breaker = Protein.uniprot_id
+
+    # Equal scores are ordered too, so that the pages do not overlap
+    return statement.order_by(literal_column("score").desc(), tie_breaker).limit(limit).offset(offset)
@@ -0,0 +1,358 @@
+'''
+In this file, the snapshot of the database for downstream jobs is defined.
+A snapshot is a directory of NumPy .npy files and a JSON manifest: a node table with the uniprot_id, symbol and tax_id
+of every protein, one row per interaction with int32 node ids and its attributes, and the CSR arrays of the interaction
+graph. Strings are stored like Arrow stores them, as the UTF-8 bytes of all values and the offset of every value. Every
+file is opened with mmap, so loading a snapshot costs milliseconds whatever its size, and the processes opening the same
+snapshot share its pages through the page cache. Write it with Query.export_snapshot and open it with Snapshot.open.
+'''
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import re
+import time
+import uuid
+
+from biogrid.db.graph import InteractionGraph
+from biogrid.db.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Bump when the files or their layout change. Snapshot.open refuses the snapshots of other versions
+snapshot_format_version: int = 1
+manifest_name: str = "manifest.json"
+
+
+class StringColumn:
+    """
+    Read-only column of strings stored as the concatenated UTF-8 bytes of all values and the offset of every value.
+    Values are only decoded when they are accessed.
+
+    Attributes:
+        offsets (np.ndarray): int64 array of length n + 1, value i is data[offsets[i]:offsets[i + 1]].
+        data (np.ndarray): uint8 array with the UTF-8 bytes of all values, one after the other.
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        """
+        Initialize the StringColumn class.
+
+        Args:
+            offsets (np.ndarray): The offset of every value, followed by the total number of bytes.
+            data (np.ndarray): The UTF-8 bytes of all values.
+        """
+        self.offsets: np.ndarray = offsets
+        self.data: np.ndarray = data
+
+    @classmethod
+    def encode(cls, values: np.ndarray) -> "StringColumn":
+        """
+        Build the column from strings.
+
+        Args:
+            values (np.ndarray): The strings.
+
+        Returns:
+            StringColumn: The column, in memory.
+        """
+        encoded: list[bytes] = [str(value).encode("utf-8") for value in values]
+        offsets: np.ndarray = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(offsets=offsets, data=np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Decode every value.
+
+        Returns:
+            np.ndarray: The strings, as an object array.
+        """
+        data: bytes = self.data.tobytes()
+        bounds: list[int] = self.offsets.tolist()
+        return np.array([data[start:stop].decode("utf-8") for start, stop in zip(bounds[:-1], bounds[1:])], dtype=object)
+
+    def search_sorted(self, value: str) -> int:
+        """
+        Find a value in a sorted column with a binary search, which decodes about log2(n) values.
+
+        Args:
+            value (str): The value.
+
+        Returns:
+            int: The position of the value, or -1 if it is not in the column.
+        """
+        index: int = bisect.bisect_left(_Decoded(column=self), value)
+        return index if index < len(self) and self[index] == value else -1
+
+
+class _Decoded:
+    """
+    Sequence view of a StringColumn for `bisect`, which decodes only the values it compares.
+    """
+
+    def __init__(self, column: StringColumn) -> None:
+        self.column: StringColumn = column
+
+    def __len__(self) -> int:
+        return len(self.column)
+
+    def __getitem__(self, index: int) -> str:
+        return self.column[index]
+
+
+def _save(directory: str, name: str, token: str, array: np.ndarray, files: dict[str, dict]) -> None:
+    """
+    Write an array to a .npy file of a snapshot and describe it in the manifest.
+
+    Args:
+        directory (str): The directory of the snapshot.
+        name (str): The name of the array.
+        token (str): The token of the export, which is part of the file name.
+        array (np.ndarray): The array. It must not hold Python objects.
+        files (dict[str, dict]): The description of the files of the manifest. It is updated in place.
+    """
+    array = np.ascontiguousarray(array)
+    file_name: str = f"{name}.{token}.npy"
+    np.save(file=os.path.join(directory, file_name), arr=array, allow_pickle=False)
+    files[name] = {"file": file_name, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+
+def _save_strings(directory: str, name: str, token: str, values: np.ndarray, files: dict[str, dict]) -> None:
+    """
+    Write a column of strings to the .npy files of its offsets and bytes.
+
+    Args:
+        directory (str): The directory of the snapshot.
+        name (str): The name of the column.
+        token (str): The token of the export, which is part of the file names.
+        values (np.ndarray): The strings.
+        files (dict[str, dict]): The description of the files of the manifest. It is updated in place.
+    """
+    column: StringColumn = StringColumn.encode(values=values)
+    _save(directory=directory, name=f"{name}.offsets", token=token, array=column.offsets, files=files)
+    _save(directory=directory, name=f"{name}.data", token=token, array=column.data, files=files)
+
+
+def _read_manifest(directory: str) -> dict | None:
+    """
+    Read the manifest of a snapshot.
+
+    Args:
+        directory (str): The directory of the snapshot.
+
+    Returns:
+        dict | None: The manifest, or None if the directory holds no snapshot.
+    """
+    try:
+        with open(os.path.join(directory, manifest_name)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(directory: str, proteins: pd.DataFrame, interactions: pd.DataFrame, experimental_systems: pd.DataFrame,
+                   generation: int) -> dict:
+    """
+    Write a snapshot of the database. Every export writes files of its own, whose names hold a random token, and the
+    manifest naming them is written last and atomically. A directory with a manifest thus always holds a complete
+    snapshot, and exporting into the directory of an older snapshot never changes the files its readers mapped. The
+    files of the previous snapshot are kept, for the readers which read its manifest just before, and older ones are
+    deleted. Only files named like the arrays of a snapshot, `<array name>.<token>.npy`, are deleted, so other .npy
+    files in the directory are left alone.
+
+    Args:
+        directory (str): The directory of the snapshot. It is created if it does not exist.
+        proteins (pd.DataFrame): Columns uniprot_id, symbol and tax_id.
+        interactions (pd.DataFrame): Columns id, interactor_a_id, interactor_b_id, score and experimental_system_id.
+        experimental_systems (pd.DataFrame): Columns id, name and type.
+        generation (int): The generation of the dataset the snapshot was taken from.
+
+    Returns:
+        dict: The manifest.
+    """
+    os.makedirs(name=directory, exist_ok=True)
+    previous: dict | None = _read_manifest(directory=directory)
+    token: str = uuid.uuid4().hex[:12]
+    interactions = interactions.sort_values(by="id", ignore_index=True)
+
+    # The node ids are the positions in the sorted uniprot_ids, as in InteractionGraph, which also gives the CSR arrays
+    graph: InteractionGraph = InteractionGraph.from_edges(
+        interactor_a_ids=interactions["interactor_a_id"].to_numpy(),
+        interactor_b_ids=interactions["interactor_b_id"].to_numpy(),
+        extra_nodes=proteins["uniprot_id"].to_numpy(),
+    )
+    # Interactors missing from the protein table get an empty symbol and tax_id -1
+    nodes: pd.DataFrame = pd.DataFrame(data={"uniprot_id": graph.nodes}).merge(right=proteins, on="uniprot_id", how="left")
+    node_ids: pd.Index = pd.Index(data=graph.nodes)
+
+    files: dict[str, dict] = {}
+    _save_strings(directory=directory, name="node_uniprot_id", token=token, values=graph.nodes, files=files)
+    _save_strings(directory=directory, name="node_symbol", token=token, values=nodes["symbol"].fillna(value="").to_numpy(), files=files)
+    _save(directory=directory, name="node_tax_id", token=token, array=nodes["tax_id"].fillna(value=-1).to_numpy(dtype=np.int32), files=files)
+    _save(directory=directory, name="edge_source", token=token, array=node_ids.get_indexer(interactions["interactor_a_id"]).astype(np.int32), files=files)
+    _save(directory=directory, name="edge_target", token=token, array=node_ids.get_indexer(interactions["interactor_b_id"]).astype(np.int32), files=files)
+    _save(directory=directory, name="edge_interaction_id", token=token, array=interactions["id"].to_numpy(dtype=np.int64), files=files)
+    _save(directory=directory, name="edge_score", token=token, array=interactions["score"].to_numpy(dtype=np.float64, na_value=np.nan), files=files)
+    _save(
+        directory=directory, name="edge_experimental_system_id", token=token,
+        array=interactions["experimental_system_id"].to_numpy(dtype=np.int16), files=files,
+    )
+    _save(directory=directory, name="csr_offsets", token=token, array=graph.offsets, files=files)
+    _save(directory=directory, name="csr_neighbors", token=token, array=graph.neighbors, files=files)
+
+    manifest: dict = {
+        "format": "biogrid-snapshot",
+        "format_version": snapshot_format_version,
+        "generation": generation,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "nodes": len(graph.nodes),
+        "edges": len(interactions),
+        "experimental_systems": [
+            {"id": int(row.id), "name": row.name, "type": row.type}
+            for row in experimental_systems.sort_values(by="id").itertuples(index=False)
+        ],
+        "files": files,
+    }
+    tmp_path: str = os.path.join(directory, f"{manifest_name}.tmp")
+    with open(tmp_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, os.path.join(directory, manifest_name))
+
+    # Readers keep the files they mapped even once they are deleted
+    kept: set[str] = {description["file"] for snapshot in (manifest, previous or {}) for description in snapshot.get("files", {}).values()}
+    for file_name in os.listdir(directory):
+        match: re.Match | None = re.fullmatch(pattern=r"(.+)\.[0-9a-f]{12}\.npy", string=file_name)
+        if match is not None and match.group(1) in files and file_name not in kept:
+            os.remove(os.path.join(directory, file_name))
+    return manifest
+
+
+class Snapshot:
+    """
+    Snapshot of the database opened with mmap. The arrays are read-only views on the files.
+
+    Attributes:
+        directory (str): The directory of the snapshot.
+        manifest (dict): The manifest, with the generation of the dataset and the description of every file.
+        uniprot_ids (StringColumn): The sorted uniprot_id of every node. The position of an id is its node id.
+        symbols (StringColumn): The symbol of every node.
+        tax_ids (np.ndarray): int32 tax_id of every node, -1 if unknown.
+        edges (dict[str, np.ndarray]): One row per interaction, ordered by id: int32 source and target node ids of the
+            interactors A and B, and the interaction_id, score (NaN if missing) and experimental_system_id.
+        experimental_systems (pd.DataFrame): Columns id, name and type, for the experimental_system_id of the edges.
+    """
+
+    def __init__(self, directory: str, manifest: dict, arrays: dict[str, np.ndarray]) -> None:
+        """
+        Initialize the Snapshot class. Use `open` to load a snapshot.
+
+        Args:
+            directory (str): The directory of the snapshot.
+            manifest (dict): The manifest.
+            arrays (dict[str, np.ndarray]): The arrays, keyed by name.
+        """
+        self.directory: str = directory
+        self.manifest: dict = manifest
+        self._arrays: dict[str, np.ndarray] = arrays
+        self.uniprot_ids = StringColumn(offsets=arrays["node_uniprot_id.offsets"], data=arrays["node_uniprot_id.data"])
+        self.symbols = StringColumn(offsets=arrays["node_symbol.offsets"], data=arrays["node_symbol.data"])
+        self.tax_ids: np.ndarray = arrays["node_tax_id"]
+        self.edges: dict[str, np.ndarray] = {
+            name: arrays[f"edge_{name}"]
+            for name in ("source", "target", "interaction_id", "score", "experimental_system_id")
+        }
+        self.experimental_systems = pd.DataFrame(data=manifest["experimental_systems"], columns=["id", "name", "type"])
+
+    @classmethod
+    def open(cls, directory: str) -> "Snapshot":
+        """
+        Open a snapshot written by `write_snapshot`, mapping its files into memory without reading them.
+
+        Args:
+            directory (str): The directory of the snapshot.
+
+        Returns:
+            Snapshot: The snapshot.
+
+        Raises:
+            FileNotFoundError: If the directory holds no snapshot.
+            ValueError: If the snapshot was written in another format version, or a file does not match the manifest.
+        """
+        manifest: dict | None = _read_manifest(directory=directory)
+        if manifest is None:
+            raise FileNotFoundError(f"There is no snapshot in {directory}")
+        if manifest.get("format_version") != snapshot_format_version:
+            raise ValueError(
+                f"The snapshot in {directory} has format version {manifest.get('format_version')}, expected {snapshot_format_version}"
+            )
+        arrays: dict[str, np.ndarray] = {}
+        for name, description in manifest["files"].items():
+            array: np.ndarray = np.load(file=os.path.join(directory, description["file"]), mmap_mode="r", allow_pickle=False)
+            if array.dtype.str != description["dtype"] or list(array.shape) != description["shape"]:
+                raise ValueError(f"The file {description['file']} of the snapshot in {directory} does not match its manifest")
+            arrays[name] = array
+        return cls(directory=directory, manifest=manifest, arrays=arrays)
+
+    def __len__(self) -> int:
+        return len(self.tax_ids)
+
+    def __repr__(self) -> str:
+        return f"Snapshot(nodes={len(self)}, edges={len(self.edges['source'])}, generation={self.manifest['generation']})"
+
+    @property
+    def generation(self) -> int:
+        return self.manifest["generation"]
+
+    def node_id(self, uniprot_id: str) -> int:
+        """
+        Get the node id of a protein, with a binary search on the sorted uniprot_ids.
+
+        Args:
+            uniprot_id (str): The uniprot_id of the protein.
+
+        Returns:
+            int: The node id.
+
+        Raises:
+            KeyError: If the protein is not in the snapshot.
+        """
+        node_id: int = self.uniprot_ids.search_sorted(value=uniprot_id)
+        if node_id < 0:
+            raise KeyError(uniprot_id)
+        return node_id
+
+    def nodes(self) -> pd.DataFrame:
+        """
+        Decode the node table.
+
+        Returns:
+            pd.DataFrame: Columns uniprot_id, symbol and tax_id, indexed by node id.
+        """
+        return pd.DataFrame(data={
+            "uniprot_id": self.uniprot_ids.to_numpy(),
+            "symbol": self.symbols.to_numpy(),
+            "tax_id": np.asarray(self.tax_ids),
+        })
+
+    def graph(self) -> InteractionGraph:
+        """
+        Build the interaction graph on the mapped CSR arrays. Only the uniprot_ids are decoded.
+
+        Returns:
+            InteractionGraph: The graph, equal to Query.graph() of the database the snapshot was taken from.
+        """
+        return InteractionGraph(
+            nodes=self.uniprot_ids.to_numpy(), offsets=self._arrays["csr_offsets"], neighbors=self._arrays["csr_neighbors"]
+        )
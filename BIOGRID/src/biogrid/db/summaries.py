@@ -0,0 +1,99 @@
+'''
+In this file, the materialized summary tables are maintained.
+The Importer recomputes them with one INSERT ... SELECT per table in the transaction of every import and update, so
+they always describe the committed data, and Query reads the counts from them instead of scanning the data tables.
+`check_summaries` recomputes them and compares, to detect summaries changed or left behind by other writers.
+'''
+
+from __future__ import annotations
+
+from sqlalchemy import Connection, Select, Table, case, delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from biogrid.db.models import (
+    ExperimentalSystem,
+    ExperimentalSystemSummary,
+    Interaction,
+    Organism,
+    OrganismPairSummary,
+    OrganismSummary,
+    Protein,
+    TableCount,
+)
+from biogrid.db.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+
+def summary_selects() -> dict[Table, Select]:
+    """
+    Build the statements which compute the content of every summary table from the data tables.
+
+    Returns:
+        dict[Table, Select]: The statement of every summary table, with its columns in order.
+    """
+    protein_a, protein_b = aliased(Protein), aliased(Protein)
+    # The pair is ordered, so that A-B and B-A interactions count for the same pair
+    tax_id_a = case((protein_a.tax_id <= protein_b.tax_id, protein_a.tax_id), else_=protein_b.tax_id)
+    tax_id_b = case((protein_a.tax_id <= protein_b.tax_id, protein_b.tax_id), else_=protein_a.tax_id)
+    return {
+        TableCount.__table__: union_all(
+            *(
+                select(literal(model.__tablename__).label("table_name"), func.count().label("rows")).select_from(model)
+                for model in (Organism, Protein, Interaction)
+            )
+        ),
+        OrganismSummary.__table__: select(Organism.tax_id, func.count(Protein.uniprot_id).label("proteins"))
+        .outerjoin(Protein, Protein.tax_id == Organism.tax_id)
+        .group_by(Organism.tax_id),
+        # Counted on the integer keys, and named through the dimension table
+        ExperimentalSystemSummary.__table__: select(
+            ExperimentalSystem.name.label("experimental_system"),
+            ExperimentalSystem.type.label("experimental_system_type"),
+            func.count().label("interactions"),
+        )
+        .select_from(Interaction)
+        .join(ExperimentalSystem, Interaction.experimental_system_id == ExperimentalSystem.id)
+        .group_by(ExperimentalSystem.id, ExperimentalSystem.name, ExperimentalSystem.type),
+        OrganismPairSummary.__table__: select(
+            tax_id_a.label("tax_id_a"), tax_id_b.label("tax_id_b"), func.count().label("interactions")
+        )
+        .select_from(Interaction)
+        .join(protein_a, Interaction.interactor_a_id == protein_a.uniprot_id)
+        .join(protein_b, Interaction.interactor_b_id == protein_b.uniprot_id)
+        .group_by(tax_id_a, tax_id_b),
+    }
+
+
+def refresh_summaries(connection: Connection | Session) -> None:
+    """
+    Recompute every summary table, in the transaction of the connection.
+
+    Args:
+        connection (Connection | Session): The connection or session of the transaction which changed the data.
+    """
+    for table, statement in summary_selects().items():
+        connection.execute(delete(table))
+        connection.execute(insert(table).from_select([column.name for column in table.columns], statement))
+
+
+def check_summaries(connection: Connection | Session) -> dict[str, bool]:
+    """
+    Recompute every summary table and compare it with the stored one.
+
+    Args:
+        connection (Connection | Session): The connection or session to read with.
+
+    Returns:
+        dict[str, bool]: Whether every summary table is consistent with the data tables, keyed by table name.
+    """
+    consistent: dict[str, bool] = {}
+    for table, statement in summary_selects().items():
+        keys: list[str] = [column.name for column in table.primary_key.columns]
+        columns: list[str] = [column.name for column in table.columns]
+        expected: pd.DataFrame = pd.DataFrame(data=connection.execute(statement).all(), columns=columns)
+        stored: pd.DataFrame = pd.DataFrame(data=connection.execute(select(table)).all(), columns=columns)
+        consistent[table.name] = (
+            expected.sort_values(by=keys, ignore_index=True).equals(stored.sort_values(by=keys, ignore_index=True))
+        )
+    return consistent
@@ -1,17 +1,45 @@
+import asyncio
+import glob
+import gzip
+import json
 import os.path
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 import pytest
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, inspect, select
 
-from biogrid.db.manager import Importer, Query
-from biogrid.db.models import Base, Interaction, Organism, Protein
+import biogrid
+from biogrid.cli import main
+from biogrid.db import analytics
+from biogrid.db.async_query import AsyncQuery
+from biogrid.db.engine import create_async_pooled_engine, create_pooled_engine
+from biogrid.db.graph import InteractionGraph
+from biogrid.db.manager import Importer, Query, select_interactions
+from biogrid.db.edges import edges_select
+from biogrid.db.models import Base, ExperimentalSystem, Interaction, InteractionEdge, Organism, Protein, TableCount
+from biogrid.db.partitioned_query import PartitionedQuery
+from biogrid.db.result_cache import ResultCache
+from biogrid.db.snapshot import Snapshot
+from biogrid.db.summaries import refresh_summaries
 
 file_path = os.path.join("tests", "data", "test_data.tsv")
 connection_string = "sqlite:///biogrid.db"
 
 engine: Engine = create_engine(url=connection_string)
 
+
+def assert_same_values(df: pd.DataFrame, expected: pd.DataFrame) -> None:
+    # The importer parses strings into categoricals, where missing values are NaN, and tax ids into int32, so only the
+    # values are compared
+    pd.testing.assert_frame_equal(
+        df.astype(dtype=object).where(df.notna(), None), expected.astype(dtype=object).where(expected.notna(), None)
+    )
+
 data = [
     {
         "biogrid_interaction_id": 1,
@@ -134,25 +162,287 @@ class TestImporter:
     def test_load_data(self, importer: Importer):
         df_test = pd.DataFrame(data)
         df: pd.DataFrame = importer.load_data()
-        assert df.equals(df_test)
+        assert_same_values(df, df_test)
+        assert isinstance(df["experimental_system"].dtype, pd.CategoricalDtype)
+        assert df["organism_id_interactor_a"].dtype == np.int32
+
+    def test_iter_data(self, importer: Importer):
+        df_test = pd.DataFrame(data)
+        chunks = list(importer.iter_data(chunksize=2))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert_same_values(pd.concat(chunks).reset_index(drop=True), df_test)
+
+    def test_load_data_from_cache(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        df_test = pd.DataFrame(data)
+        release_path = tmp_path / "release.tsv"
+        release_path.write_bytes(open(file_path, "rb").read())
+        importer = Importer(engine=engine, file_path=str(release_path), cache=True)
+        assert_same_values(importer.load_data(), df_test)
+        assert importer.cache.is_valid()
+        assert_same_values(importer.load_data(), df_test)
+        # Changing the file invalidates the cache
+        release_path.write_bytes(open(file_path, "rb").read().rsplit(b"\n", 2)[0] + b"\n")
+        assert not importer.cache.is_valid()
+        assert_same_values(importer.load_data(), df_test.iloc[:2])
+
+    def test_cache_of_archive_members(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        with open(file_path, "rb") as file:
+            header, *rows = file.read().splitlines(keepends=True)
+        zip_path = tmp_path / "release.tab3.zip"
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            archive.writestr("o1.tab3.txt", header + rows[0] + rows[1])
+            archive.writestr("o2.tab3.txt", header + rows[2])
+        # The cache of all the members is not used for a selection of them, and the other way round
+        for members, interactions in ((None, 3), (["o2.tab3.txt"], 1), (None, 3)):
+            importer = Importer(engine=engine, file_path=str(zip_path), cache=True, members=members)
+            assert not importer.cache.is_valid()
+            assert importer.import_data().succeeded
+            assert Query(engine=engine).count_interactions() == interactions
+            assert importer.cache.is_valid()
+
+    def test_load_data_from_archives(self, tmp_path):
+        df_test = pd.DataFrame(data)
+        with open(file_path, "rb") as file:
+            content = file.read()
+        header, *rows = content.splitlines(keepends=True)
+        gz_path = tmp_path / "release.tab3.txt.gz"
+        with gzip.open(gz_path, "wb") as file:
+            file.write(content)
+        zip_path = tmp_path / "release.tab3.zip"
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("organism-1.tab3.txt", header + rows[0] + rows[1])
+            archive.writestr("organism-2.tab3.txt", header + rows[2])
+            archive.writestr("README.md", "not a tab3 file")
+
+        assert_same_values(Importer(engine=engine, file_path=str(gz_path)).load_data(), df_test)
+        zip_importer = Importer(engine=engine, file_path=str(zip_path))
+        assert zip_importer.archive_members() == ["organism-1.tab3.txt", "organism-2.tab3.txt"]
+        assert_same_values(zip_importer.load_data(), df_test)
+        assert_same_values(pd.concat(zip_importer.iter_data(chunksize=1)).reset_index(drop=True), df_test)
+        one_member_importer = Importer(engine=engine, file_path=str(zip_path), members=["organism-2.tab3.txt"])
+        assert_same_values(one_member_importer.load_data(), df_test.iloc[2:].reset_index(drop=True))
+
+        for chunksize in (None, 1):
+            # With one row per chunk, the first member is sent back in two chunks
+            Importer(engine=engine, file_path=str(zip_path), workers=2).import_data(chunksize=chunksize)
+            with engine.connect() as connection:
+                interactions = connection.execute(select_interactions().order_by(Interaction.id)).mappings().all()
+            assert [dict(row) for row in interactions] == data_interactions
 
     def test_get_interaction_df(self, importer: Importer):
         df: pd.DataFrame = importer.load_data()
         interaction_df: pd.DataFrame = importer.get_interaction_df(df)
         interaction_df_test = pd.DataFrame(data_interactions)
-        assert interaction_df.equals(interaction_df_test)
+        assert_same_values(interaction_df, interaction_df_test)
 
     def test_get_protein_df(self, importer: Importer):
         df = importer.load_data()
         protein_df: pd.DataFrame = importer.get_proteins_df(df)
         protein_df_test = pd.DataFrame(data_proteins)
-        assert protein_df.equals(protein_df_test)
+        assert_same_values(protein_df, protein_df_test)
 
     def test_get_organism_df(self, importer: Importer):
         df: pd.DataFrame = importer.load_data()
         organism_df: pd.DataFrame = importer.get_organisms_df(df)
         organism_df_test = pd.DataFrame(data_organisms)
-        assert organism_df.equals(organism_df_test)
+        assert_same_values(organism_df, organism_df_test)
+
+    def test_import_data_in_batches(self):
+        importer = Importer(engine=engine, file_path=file_path, batch_size=2)
+        importer.import_data()
+        with engine.connect() as connection:
+            interactions = connection.execute(select_interactions().order_by(Interaction.id)).mappings().all()
+            proteins = connection.execute(select(Protein.__table__).order_by(Protein.uniprot_id)).mappings().all()
+            organisms = connection.execute(select(Organism.__table__).order_by(Organism.tax_id)).mappings().all()
+        assert [dict(row) for row in interactions] == data_interactions
+        assert [dict(row) for row in proteins] == data_proteins
+        assert [dict(row) for row in organisms] == sorted(data_organisms, key=lambda row: row["tax_id"])
+
+
+    def test_import_data_in_chunks(self):
+        importer = Importer(engine=engine, file_path=file_path)
+        importer.import_data(chunksize=1)
+        query = Query(engine=engine)
+        assert query.count_proteins() == 3
+        assert query.count_organisms() == 2
+        assert query.count_interactions() == 3
+
+    def test_import_data_with_empty_chunk(self, tmp_path):
+        # The repeated row is dropped as a duplicate, which leaves its chunk without interactions
+        with open(file_path) as file:
+            lines: list[str] = file.readlines()
+        repeated_path = tmp_path / "repeated.tsv"
+        repeated_path.write_text("".join(lines + lines[1:2]))
+        report = Importer(engine=engine, file_path=str(repeated_path)).import_data(chunksize=1)
+        assert report.succeeded
+        assert Query(engine=engine).count_interactions() == 3
+
+    def test_import_data_with_workers(self):
+        importer = Importer(engine=engine, file_path=file_path, workers=2)
+        importer.import_data(chunksize=1)
+        with engine.connect() as connection:
+            interactions = connection.execute(select_interactions().order_by(Interaction.id)).mappings().all()
+            proteins = connection.execute(select(Protein.__table__).order_by(Protein.uniprot_id)).mappings().all()
+        assert [dict(row) for row in interactions] == data_interactions
+        assert [dict(row) for row in proteins] == data_proteins
+
+    def test_import_data_builds_indexes(self):
+        Importer(engine=engine, file_path=file_path).import_data()
+        inspector = inspect(engine)
+        assert {index["name"] for index in inspector.get_indexes("interaction")} == {
+            "ix_interaction_a_system_b",
+            "ix_interaction_b_system_a",
+            "ix_interaction_experimental_system_id",
+        }
+        assert {index["name"] for index in inspector.get_indexes("protein")} == {"ix_protein_tax_id"}
+        assert {index["name"] for index in inspector.get_indexes("organism")} == {"ix_organism_name"}
+
+    def test_import_report(self):
+        report = Importer(engine=engine, file_path=file_path).import_data(chunksize=2)
+        assert report.succeeded
+        assert report["parse"].rows_out == 3
+        assert report["interactions"].rows_in == 3
+        assert report["interactions"].rows_out == 3
+        assert report["insert_interaction"].rows_out == 3
+        assert report["insert_organism"].rows_out == 2
+        assert report["organisms"].dropped["duplicate"] == 2
+        assert report["dedup_across_chunks"].dropped["organism in an earlier chunk"] == 2
+        assert report.seconds >= report["commit"].seconds
+
+        assert json.loads(report.to_json())["stages"]["insert_protein"]["rows_out"] == 3
+        metrics = report.to_prometheus()
+        assert "biogrid_import_success 1" in metrics
+        assert 'biogrid_import_stage_rows_out{stage="insert_interaction"} 3' in metrics
+
+    def test_update_data(self, tmp_path):
+        Importer(engine=engine, file_path=file_path).import_data()
+        with open(file_path) as file:
+            header, row_1, row_2, row_3 = file.read().splitlines()
+        # Release in which interaction 1 changed its experimental system, 3 was retracted and 4 is new
+        row_1 = row_1.replace("Two-hybrid", "Affinity Capture-MS")
+        row_4 = "\t".join(["4" if index == 0 else value for index, value in enumerate(row_2.split("\t"))])
+        release_path = tmp_path / "release.tsv"
+        release_path.write_text("\n".join([header, row_1, row_2, row_4]) + "\n")
+
+        importer = Importer(engine=engine, file_path=str(release_path), recreate=False)
+        summary = importer.update_data(delete_missing=True)
+        assert summary.interactions_inserted == 1
+        assert summary.interactions_updated == 1
+        assert summary.interactions_deleted == 1
+        assert summary.interactions_unchanged == 1
+        assert summary.proteins_inserted == summary.proteins_updated == 0
+        assert summary.organisms_inserted == summary.organisms_updated == 0
+        with engine.connect() as connection:
+            interactions = connection.execute(select_interactions().order_by(Interaction.id)).mappings().all()
+            systems = connection.execute(select(ExperimentalSystem.id, ExperimentalSystem.name).order_by(ExperimentalSystem.id)).all()
+        assert [(row["id"], row["experimental_system"]) for row in interactions] == [(1, "Affinity Capture-MS"), (2, "Two-hybrid"), (4, "Two-hybrid")]
+        # The keys of the stored experimental systems are kept, and the new one gets the next key
+        assert systems == [(1, "Two-hybrid"), (2, "Proximity Label-MS"), (3, "Affinity Capture-MS")]
+        with engine.connect() as connection:
+            edges = connection.execute(select(InteractionEdge.__table__).order_by(*InteractionEdge.__table__.primary_key)).all()
+        assert edges == [("P1", "P2", 3, 1), ("P2", "P3", 1, 2)]
+
+    def test_interaction_edges(self, tmp_path):
+        with open(file_path) as file:
+            header, row_1, row_2, row_3 = file.read().splitlines()
+        swapped = {"P1": "P2", "P2": "P1", "symbol_1": "symbol_2", "symbol_2": "symbol_1"}
+        # Interaction 1 reported again as B-A, and detected again with another experimental system
+        row_4 = "\t".join(["4", *(swapped.get(value, value) for value in row_1.split("\t")[1:])])
+        row_5 = "\t".join(["5", *row_1.split("\t")[1:]]).replace("Two-hybrid", "Affinity Capture-MS")
+        release_path = tmp_path / "release.tsv"
+        release_path.write_text("\n".join([header, row_1, row_2, row_3, row_4, row_5]) + "\n")
+
+        report = Importer(engine=engine, file_path=str(release_path)).import_data(chunksize=2)
+        assert report["insert_interaction_edge"].rows_out == 4
+        with engine.connect() as connection:
+            edges = connection.execute(select(InteractionEdge.__table__).order_by(*InteractionEdge.__table__.primary_key)).all()
+            # Aggregated in pandas across the chunks, like the SQL statement which refreshes them after updates
+            assert edges == sorted(connection.execute(edges_select()).all())
+        assert edges == [("P1", "P2", 1, 2), ("P1", "P2", 3, 1), ("P1", "P3", 2, 1), ("P2", "P3", 1, 1)]
+
+        query = Query(engine=engine)
+        assert query.interaction_evidence(uniprot_id_a="p2", uniprot_id_b="P1").values.tolist() == [
+            ["Two-hybrid", "physical", 2],
+            ["Affinity Capture-MS", "physical", 1],
+        ]
+        assert query.interaction_evidence(uniprot_id_a="P1", uniprot_id_b="P4").empty
+        assert query.interact(uniprot_id_a="P3", uniprot_id_b="P1")
+        assert not query.interact(uniprot_id_a="P1", uniprot_id_b="P1")
+        assert (query.count_interactions(), query.count_edges()) == (5, 3)
+
+    def test_import_into_memory(self):
+        in_memory_engine = create_engine("sqlite://")
+        assert Importer(engine=in_memory_engine, file_path=file_path).import_data().succeeded
+        assert Query(engine=in_memory_engine).count_interactions() == 3
+
+    def test_drop_indexes_keeps_foreign_key_indexes_on_mysql(self):
+        in_memory_engine = create_engine("sqlite://")
+        importer = Importer(engine=in_memory_engine, file_path=file_path)
+        # Only the name of the dialect decides which indexes are dropped
+        in_memory_engine.dialect.name = "mysql"
+        with importer.session_factory() as session:
+            importer.drop_indexes(session=session)
+            session.commit()
+        in_memory_engine.dialect.name = "sqlite"
+        indexes = {index["name"] for table in ("organism", "protein", "interaction") for index in inspect(in_memory_engine).get_indexes(table)}
+        assert indexes == {"ix_protein_tax_id", "ix_interaction_a_system_b", "ix_interaction_b_system_a", "ix_interaction_experimental_system_id"}
+
+    def test_reload(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'biogrid.db'}"
+        live_engine = create_pooled_engine(url=url)
+        Importer(engine=live_engine, file_path=file_path).import_data()
+        query = Query(engine=live_engine, cache=ResultCache())
+        # Reads through an engine of its own, like another process
+        reader = Query(engine=create_engine(url))
+        generation = query.generation()
+        assert query.count_interactions() == reader.count_interactions() == 3
+
+        with open(file_path) as file:
+            header, *rows = file.read().splitlines()
+        release_path = tmp_path / "release.tsv"
+        release_path.write_text("\n".join([header, *rows[:2]]) + "\n")
+        importer = Importer.for_reload(engine=live_engine, file_path=str(release_path))
+        report = importer.reload()
+        assert report.succeeded
+        assert report["validate"].calls == report["swap"].calls == 1
+        assert query.generation() == generation + 1
+        assert query.count_interactions() == reader.count_interactions() == 2
+        # The live path and the previous one link to release files, which have their own WAL and shared memory files
+        live_file, previous_file = os.path.realpath(tmp_path / "biogrid.db"), os.path.realpath(tmp_path / "biogrid.previous.db")
+        assert os.path.islink(tmp_path / "biogrid.db") and os.path.islink(tmp_path / "biogrid.previous.db")
+        assert live_file != previous_file
+        assert sorted(glob.glob("biogrid.db*", root_dir=tmp_path)) == ["biogrid.db"]
+        assert len(glob.glob("biogrid.*.db", root_dir=tmp_path)) == 3
+
+        # A release much smaller than the live one is not swapped in
+        release_path.write_text("\n".join([header, rows[0]]) + "\n")
+        report = Importer.for_reload(engine=live_engine, file_path=str(release_path)).reload(min_row_ratio=0.75)
+        assert report.error.startswith("ValueError")
+        assert query.count_interactions() == 2
+        assert not os.path.exists(tmp_path / "biogrid.shadow.db")
+
+        importer.rollback()
+        assert query.generation() == generation + 2
+        assert query.count_interactions() == reader.count_interactions() == 3
+        assert os.path.realpath(tmp_path / "biogrid.db") == previous_file
+        importer.rollback()
+        assert query.count_interactions() == reader.count_interactions() == 2
+        assert os.path.realpath(tmp_path / "biogrid.db") == live_file
+
+        # A second reload replaces the previous release, whose files are removed
+        release_path.write_text("\n".join([header, *rows]) + "\n")
+        assert Importer.for_reload(engine=live_engine, file_path=str(release_path)).reload().succeeded
+        assert query.count_interactions() == reader.count_interactions() == 3
+        assert os.path.realpath(tmp_path / "biogrid.previous.db") == live_file
+        assert not glob.glob(f"{os.path.basename(previous_file)}*", root_dir=tmp_path)
+
+        # An Importer created to import, which dropped the live tables, refuses to reload
+        with pytest.raises(ValueError):
+            Importer(engine=live_engine, file_path=str(release_path)).reload()
+        live_engine.dispose()
+        reader.engine.dispose()
 
 
 class TestQuery:
@@ -164,3 +454,386 @@ class TestQuery:
 
     def test_count_interactions(self, query: Query):
         assert query.count_interactions() == 3
+
+    def test_count_without_table_count(self, query: Query):
+        # Databases imported before the summaries existed have no table_count table
+        TableCount.__table__.drop(bind=engine)
+        assert query.count_interactions() == 3
+        assert query.count_proteins() == 3
+
+    def test_lookup_interactions(self, query: Query):
+        for method in ("temp_table", "in"):
+            df = query.lookup_interactions(uniprot_ids=iter(["P3", "P9", "P3"]), method=method)
+            assert df["id"].to_list() == [2, 3]
+            assert df.loc[0, ["interactor_a_id", "symbol_a", "organism_a"]].to_list() == [
+                "P2",
+                "symbol_2",
+                "Severe acute respiratory syndrome coronavirus 2",
+            ]
+            assert df.loc[0, ["interactor_b_id", "symbol_b", "tax_id_b", "organism_b"]].to_list() == ["P3", "symbol_3", 9606, "Homo sapiens"]
+        # The temporary table is dropped, so the pooled connection can run the lookup again
+        assert len(query.lookup_interactions(uniprot_ids=["P1"])) == 2
+        assert query.lookup_interactions(uniprot_ids=[]).empty
+
+    def test_interactions_by_experimental_system(self, query: Query):
+        assert query.experimental_system_ids() == [1, 2]
+        assert query.experimental_system_ids(experimental_system="Proximity Label-MS") == [2]
+        assert query.experimental_system_ids(experimental_system="Affinity Capture-MS") == []
+        assert query.interactions_by_experimental_system(experimental_system="Two-hybrid")["id"].to_list() == [1, 2]
+        assert query.interactions_by_experimental_system(experimental_system_type="physical", limit=2, offset=1).to_dict("records") == data_interactions[1:]
+        assert query.interactions_by_experimental_system(experimental_system_type="genetic").empty
+        with query.session() as session:
+            interaction = session.get(Interaction, 3)
+            assert (interaction.experimental_system, interaction.experimental_system_type) == ("Proximity Label-MS", "physical")
+
+    def test_search_proteins(self, query: Query):
+        assert query.search_proteins(query="symbol_3")["uniprot_id"].to_list() == ["P3"]
+        # '2' is also a word of 'Severe acute respiratory syndrome coronavirus 2', which ranks below the symbol
+        assert query.search_proteins(query="symbol_2")["uniprot_id"].to_list() == ["P2", "P1"]
+        assert query.search_proteins(query="sapiens")[["uniprot_id", "symbol", "tax_id", "organism"]].values.tolist() == [
+            ["P3", "symbol_3", 9606, "Homo sapiens"]
+        ]
+        # Prefixes of words match, and the pages follow the ranking
+        ranked = query.search_proteins(query="SYMB")["uniprot_id"].to_list()
+        assert sorted(ranked) == ["P1", "P2", "P3"]
+        assert query.search_proteins(query="SYMB", limit=2, offset=1)["uniprot_id"].to_list() == ranked[1:]
+        assert query.search_proteins(query="SYMB", prefix=False).empty
+        # Operators of the full-text syntax are searched as words
+        assert query.search_proteins(query="symbol 1 OR").empty
+        assert query.search_proteins(query="- ,").empty
+
+    def test_search_index_created_with_tables(self, tmp_path):
+        # The table is created before any import, as its DDL would commit the import transaction on MySQL
+        search_engine = create_engine(url=f"sqlite:///{tmp_path / 'biogrid.db'}")
+        Importer(engine=search_engine, file_path=file_path)
+        assert inspect(search_engine).has_table("protein_search")
+        search_engine.dispose()
+
+    def test_export_snapshot(self, query: Query, tmp_path):
+        manifest = query.export_snapshot(directory=str(tmp_path))
+        assert (manifest["nodes"], manifest["edges"], manifest["generation"]) == (3, 3, query.generation())
+        snapshot = Snapshot.open(directory=str(tmp_path))
+        assert isinstance(snapshot.edges["source"], np.memmap)
+        assert snapshot.nodes().to_dict("records") == sorted(data_proteins, key=lambda row: row["uniprot_id"])
+        assert snapshot.node_id("P2") == 1
+        with pytest.raises(KeyError):
+            snapshot.node_id("P9")
+        assert snapshot.edges["interaction_id"].tolist() == [1, 2, 3]
+        assert [snapshot.uniprot_ids[node_id] for node_id in snapshot.edges["target"]] == ["P2", "P3", "P1"]
+        assert snapshot.experimental_systems["name"][snapshot.edges["experimental_system_id"] - 1].tolist() == [
+            "Two-hybrid", "Two-hybrid", "Proximity Label-MS"
+        ]
+        graph = snapshot.graph()
+        assert graph.nodes.tolist() == query.graph().nodes.tolist()
+        assert graph.neighbor_ids(graph.node_id("P1")).tolist() == [1, 2]
+
+        # Exporting again replaces the snapshot without touching the files of the one opened above
+        query.export_snapshot(directory=str(tmp_path))
+        assert snapshot.uniprot_ids[0] == "P1"
+        # Only the files of the snapshots before the previous one are deleted, not other .npy files of the directory
+        foreign_files = ["embeddings.npy", "edge_source.npy", "edge_source.final.npy"]
+        for name in foreign_files:
+            np.save(file=tmp_path / name, arr=np.arange(3))
+        query.export_snapshot(directory=str(tmp_path))
+        assert all(os.path.exists(tmp_path / name) for name in foreign_files)
+        assert len(glob.glob("edge_source.????????????.npy", root_dir=tmp_path)) == 2
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(json.dumps({**json.loads(manifest_path.read_text()), "format_version": 0}))
+        with pytest.raises(ValueError):
+            Snapshot.open(directory=str(tmp_path))
+
+    def test_result_cache(self, tmp_path, monkeypatch):
+        cache = ResultCache(maxsize=8, directory=str(tmp_path / "cache"))
+        Importer(engine=engine, file_path=file_path).import_data()
+        query = Query(engine=engine, cache=cache)
+        generation = query.generation()
+        assert query.count_interactions() == 3
+        assert query.count_interactions() == 3
+        assert (cache.hits, cache.misses) == (1, 1)
+        df = query.lookup_interactions(uniprot_ids=["P1"])
+        df.loc[0, "symbol_a"] = "changed"
+        assert query.lookup_interactions(uniprot_ids=["P1"]).loc[0, "symbol_a"] == "symbol_1"
+        # Lists are copied too, and the cached graph is shared read-only
+        query.experimental_system_ids(experimental_system="Two-hybrid").append(99)
+        assert 99 not in query.experimental_system_ids(experimental_system="Two-hybrid")
+        with pytest.raises(ValueError):
+            query.graph().neighbors[0] = 2
+        assert query.graph().neighbor_ids(0).tolist() == [1, 2]
+        # Another process sharing the directory reads the results written by this one
+        assert Query(engine=engine, cache=ResultCache(directory=str(tmp_path / "cache"))).count_interactions() == 3
+
+        # The import bumps the generation in its transaction, so the cached results are not served any more
+        with open(file_path) as file:
+            header, *rows = file.read().splitlines()
+        release_path = tmp_path / "release.tsv"
+        release_path.write_text("\n".join([header, rows[0]]) + "\n")
+        Importer(engine=engine, file_path=str(release_path)).import_data()
+        assert query.generation() == generation + 2  # Recreating the tables counts as well
+        assert query.count_interactions() == 1
+        # The files of the older generations are removed once the query sees the new one
+        assert all(f".{generation + 2}." in name for name in os.listdir(tmp_path / "cache"))
+
+        # Cache hits reuse the generation they read, for generation_ttl seconds
+        reads = []
+        read_generation = query.generation
+        monkeypatch.setattr(query, "generation", lambda: reads.append(1) or read_generation())
+        assert [query.count_interactions() for _ in range(3)] == [1, 1, 1]
+        assert not reads
+        query.generation_ttl = 0.0
+        assert query.count_interactions() == 1
+        assert len(reads) == 1
+
+    def test_result_cache_directory(self, tmp_path):
+        cache = ResultCache(directory=str(tmp_path / "cache"), max_files=2)
+        assert os.stat(tmp_path / "cache").st_mode & 0o777 == 0o700
+        for generation in range(3):
+            cache.set(key=("database", generation, "count"), value=generation)
+        assert len(os.listdir(tmp_path / "cache")) == 2
+        cache.retire(namespace="database", generation=2)
+        assert len(os.listdir(tmp_path / "cache")) == 1
+        assert ResultCache(directory=str(tmp_path / "cache")).get(key=("database", 2, "count")) == 2
+        # Pickle files which other users can write are never loaded
+        os.chmod(tmp_path / "cache", 0o755)
+        with pytest.raises(PermissionError):
+            ResultCache(directory=str(tmp_path / "cache"))
+
+    def test_summaries(self, query: Query):
+        assert query.organism_protein_counts().to_dict("list") == {
+            "tax_id": [2697049, 9606],
+            "name": ["Severe acute respiratory syndrome coronavirus 2", "Homo sapiens"],
+            "proteins": [2, 1],
+        }
+        assert query.experimental_system_counts().to_dict("list") == {
+            "experimental_system": ["Two-hybrid", "Proximity Label-MS"],
+            "experimental_system_type": ["physical", "physical"],
+            "interactions": [2, 1],
+        }
+        assert query.organism_pair_counts()[["tax_id_a", "tax_id_b", "interactions"]].values.tolist() == [[9606, 2697049, 2]]
+        assert query.organism_pair_counts(cross_species_only=False)["interactions"].to_list() == [2, 1]
+        assert all(query.check_summaries().values())
+        with engine.begin() as connection:
+            connection.execute(Interaction.__table__.delete().where(Interaction.id == 3))
+        consistent = query.check_summaries()
+        assert not consistent["table_count"] and consistent["organism_summary"]
+
+    def test_shared_between_threads(self, tmp_path):
+        pooled_engine = create_pooled_engine(url=f"sqlite:///{tmp_path / 'biogrid.db'}", pool_size=4, max_overflow=4)
+        with pooled_engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        Importer(engine=pooled_engine, file_path=file_path).import_data()
+        query = Query(engine=pooled_engine)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            counts = list(executor.map(lambda _: query.count_interactions(), range(100)))
+        assert counts == [3] * 100
+        assert pooled_engine.pool.checkedout() == 0
+        # Every call sees the data committed before it
+        with pooled_engine.begin() as connection:
+            connection.execute(Interaction.__table__.delete().where(Interaction.id == 3))
+            refresh_summaries(connection=connection)
+        assert query.count_interactions() == 2
+        pooled_engine.dispose()
+
+
+class TestPartitionedQuery:
+    def test_partitions(self, tmp_path):
+        catalog_engine = create_engine(f"sqlite:///{tmp_path / 'biogrid.db'}")
+        report = Importer(engine=catalog_engine, file_path=file_path).import_partitions(chunksize=2)
+        assert report.succeeded
+        assert report["route"].rows_out == report["insert_interaction"].rows_out == 3
+        # Version 2 is the generation of the catalog, which recreating the database incremented once
+        assert sorted(os.listdir(tmp_path)) == ["biogrid.2697049-2697049.2.db", "biogrid.9606-2697049.2.db", "biogrid.db"]
+
+        query = PartitionedQuery(engine=catalog_engine, max_workers=2)
+        # Interactions within the virus, and between the virus and its host
+        assert query.partitions() == [(9606, 2697049), (2697049, 2697049)]
+        assert query.partitions(tax_id=9606) == [(9606, 2697049)]
+        assert query.partitions(tax_id=2697049, partner_tax_id=2697049) == [(2697049, 2697049)]
+        assert query.count_interactions() == 3
+        assert query.count_interactions(tax_id=9606) == 2
+        assert query.count_interactions(tax_id=9606, partner_tax_id=10090) == 0
+        assert query.count_proteins() == 3
+        assert query.count_proteins(tax_id=2697049) == 2
+
+        assert query.organism_interactions(tax_id=9606)["id"].to_list() == [2, 3]
+        assert query.organism_interactions(tax_id=2697049, limit=2, offset=1)["id"].to_list() == [2, 3]
+        assert [dict(row) for _, row in query.organism_interactions(tax_id=2697049).iterrows()] == data_interactions
+
+        # Fanned out over all partitions, and merged into what the unpartitioned database answers
+        Importer(engine=engine, file_path=file_path).import_data()
+        assert_same_values(
+            df=query.lookup_interactions(uniprot_ids=["P1", "P3"]),
+            expected=Query(engine=engine).lookup_interactions(uniprot_ids=["P1", "P3"]),
+        )
+        assert query.lookup_interactions(uniprot_ids=["P4"]).empty
+        assert query.interaction_evidence(uniprot_id_a="P1", uniprot_id_b="P3").values.tolist() == [["Proximity Label-MS", "physical", 1]]
+        # The IDs are normalized before the catalog routes them
+        assert_same_values(
+            df=query.interaction_evidence(uniprot_id_a="p2", uniprot_id_b=" P1"),
+            expected=Query(engine=engine).interaction_evidence(uniprot_id_a="P2", uniprot_id_b="P1"),
+        )
+        assert len(query.interaction_evidence(uniprot_id_a="p2", uniprot_id_b=" P1")) == 1
+        assert_same_values(
+            df=query.lookup_interactions(uniprot_ids=["p1 "]), expected=Query(engine=engine).lookup_interactions(uniprot_ids=["P1"])
+        )
+
+        # A failed import leaves the catalog and its partitions as they were
+        report = Importer(engine=catalog_engine, file_path=str(tmp_path / "missing.tsv"), recreate=False).import_partitions()
+        assert not report.succeeded
+        # The partitions read through pooled connections have WAL files too
+        assert sorted(glob.glob("*.db", root_dir=tmp_path)) == ["biogrid.2697049-2697049.2.db", "biogrid.9606-2697049.2.db", "biogrid.db"]
+        assert query.count_interactions(tax_id=9606) == 2
+        assert query.organism_interactions(tax_id=9606)["id"].to_list() == [2, 3]
+
+        # A new import is built next to the partitions, which the catalog switches from when it commits
+        report = Importer(engine=catalog_engine, file_path=file_path, recreate=False).import_partitions(chunksize=1)
+        assert report.succeeded
+        assert sorted(glob.glob("*.db", root_dir=tmp_path)) == ["biogrid.2697049-2697049.3.db", "biogrid.9606-2697049.3.db", "biogrid.db"]
+        assert query.organism_interactions(tax_id=9606)["id"].to_list() == [2, 3]
+        assert [dict(row) for _, row in query.organism_interactions(tax_id=2697049).iterrows()] == data_interactions
+        query.close()
+
+
+class TestAsyncQuery:
+    def test_lookups(self, tmp_path):
+        pytest.importorskip("aiosqlite")
+        db_path = tmp_path / "biogrid.db"
+        Importer(engine=create_engine(url=f"sqlite:///{db_path}"), file_path=file_path).import_data()
+
+        async def lookups():
+            async_engine = create_async_pooled_engine(url=f"sqlite+aiosqlite:///{db_path}")
+            query = AsyncQuery(engine=async_engine)
+            try:
+                counts = await asyncio.gather(query.count_proteins(), query.count_organisms(), query.count_interactions())
+                partners = await asyncio.gather(*(query.partners(uniprot_id="P1" if i % 2 else " p1") for i in range(50)))
+                return (
+                    counts,
+                    partners,
+                    await query.partners_many(uniprot_ids=["p2", "P9", " P2 "]),
+                    await query.organism_interactions(tax_id=9606, limit=1, offset=1),
+                    await query.proteins_many(uniprot_ids=["P3", "P9", "p1"]),
+                )
+            finally:
+                await async_engine.dispose()
+
+        counts, partners, partners_many, interactions, proteins = asyncio.run(lookups())
+        assert counts == [3, 2, 3]
+        assert partners == [["P2", "P3"]] * 50
+        assert partners_many == {"P2": ["P1", "P3"], "P9": []}
+        assert interactions == [data_interactions[2]]
+        assert [protein["uniprot_id"] for protein in proteins] == ["P3", "P1"]
+        assert proteins[0]["organism_name"] == "Homo sapiens"
+
+    def test_count_from_table_count(self, tmp_path):
+        pytest.importorskip("aiosqlite")
+        db_path = tmp_path / "biogrid.db"
+        sync_engine = create_engine(url=f"sqlite:///{db_path}")
+        Importer(engine=sync_engine, file_path=file_path).import_data()
+
+        async def count_interactions():
+            async_engine = create_async_pooled_engine(url=f"sqlite+aiosqlite:///{db_path}")
+            try:
+                return await AsyncQuery(engine=async_engine).count_interactions()
+            finally:
+                await async_engine.dispose()
+
+        # The count is read from the summary, and counted the slow way on databases without it
+        with sync_engine.begin() as connection:
+            connection.execute(TableCount.__table__.update().where(TableCount.table_name == "interaction").values(rows=7))
+        assert asyncio.run(count_interactions()) == 7
+        TableCount.__table__.drop(bind=sync_engine)
+        assert asyncio.run(count_interactions()) == 3
+        sync_engine.dispose()
+
+
+class TestInteractionGraph:
+    def test_graph(self, query: Query):
+        graph = query.graph()
+        assert len(graph) == 3
+        assert graph.edge_count() == 3
+        assert graph.partners("P1") == ["P2", "P3"]
+        assert graph.degree("P2") == 2
+
+    def test_from_edges(self):
+        # P1-P2 twice and in both directions, a self interaction of P3, a chain P3-P4-P5 and a protein without interactions
+        graph = InteractionGraph.from_edges(
+            interactor_a_ids=np.array(["P1", "P2", "P1", "P3", "P3", "P4"], dtype=object),
+            interactor_b_ids=np.array(["P2", "P1", "P2", "P3", "P4", "P5"], dtype=object),
+            extra_nodes=np.array(["P6"], dtype=object),
+        )
+        assert graph.edge_count() == 4
+        assert graph.neighbors.dtype == np.int32
+        assert graph.partners("P3") == ["P3", "P4"]
+        assert graph.degree("P6") == 0
+        assert graph.k_hop("P5", k=0) == ["P5"]
+        assert graph.k_hop("P5", k=1) == ["P4", "P5"]
+        assert graph.k_hop("P5", k=5) == ["P3", "P4", "P5"]
+        subgraph = graph.subgraph(["P1", "P3", "P4", "P6"])
+        assert subgraph.nodes.tolist() == ["P1", "P3", "P4", "P6"]
+        assert subgraph.partners("P1") == []
+        assert subgraph.partners("P4") == ["P3"]
+        assert subgraph.edge_count() == 2
+
+
+class TestNetworkAnalytics:
+    def test_degree_distribution(self, query: Query):
+        df = query.degree_distribution()
+        assert df.to_dict("records") == [
+            {"tax_id": 9606, "name": "Homo sapiens", "degree": 2, "proteins": 1},
+            {"tax_id": 2697049, "name": "Severe acute respiratory syndrome coronavirus 2", "degree": 2, "proteins": 2},
+        ]
+
+    def test_cross_organism_edges(self, query: Query):
+        df = query.cross_organism_edges()
+        assert df[["tax_id_a", "tax_id_b", "edges"]].values.tolist() == [[9606, 2697049, 2], [2697049, 2697049, 1]]
+        assert df["name_a"].tolist() == ["Homo sapiens", "Severe acute respiratory syndrome coronavirus 2"]
+
+    def test_graph_statistics(self):
+        # A triangle P1-P2-P3 with a tail P3-P4, and P5-P6 as a second component
+        graph = InteractionGraph.from_edges(
+            interactor_a_ids=np.array(["P1", "P2", "P3", "P3", "P5"], dtype=object),
+            interactor_b_ids=np.array(["P2", "P3", "P1", "P4", "P6"], dtype=object),
+        )
+        components = analytics.connected_components(graph)
+        assert components["component"].tolist() == [0, 0, 0, 0, 1, 1]
+        assert components["component_size"].tolist() == [4, 4, 4, 4, 2, 2]
+        clustering = analytics.clustering_coefficients(graph)
+        assert clustering["triangles"].tolist() == [1, 1, 1, 0, 0, 0]
+        assert clustering["clustering"].tolist() == pytest.approx([1, 1, 1 / 3, 0, 0, 0])
+        centrality = analytics.betweenness(graph, samples=None)
+        assert centrality["betweenness"].tolist() == pytest.approx([0, 0, 2, 0, 0, 0])
+
+
+class TestCli:
+    def test_commands(self, tmp_path, capsys):
+        url = f"sqlite:///{tmp_path / 'biogrid.db'}"
+        assert main(["--database", url, "import", file_path]) == 0
+        capsys.readouterr()
+
+        assert main(["--database", url, "count"]) == 0
+        assert capsys.readouterr().out.splitlines() == ["proteins\t3", "organisms\t2", "interactions\t3", "edges\t3"]
+        assert main(["--database", url, "count", "interactions"]) == 0
+        assert capsys.readouterr().out == "interactions\t3\n"
+        with pytest.raises(SystemExit):
+            main(["--database", url, "count", "genes"])
+
+        assert main(["--database", url, "lookup", "P2", "P4"]) == 0
+        header, *rows = capsys.readouterr().out.splitlines()
+        assert header.split("\t")[:2] == ["id", "interactor_a_id"]
+        assert [row.split("\t")[0] for row in rows] == ["1", "2"]
+        assert main(["--database", url, "lookup", "P4"]) == 1
+        assert capsys.readouterr().out.splitlines() == [header]
+
+        assert main(["--database", url, "export", str(tmp_path / "snapshot")]) == 0
+        assert json.loads(capsys.readouterr().out)["generation"] == Query(engine=create_engine(url)).generation()
+        assert main(["--database", url, "import", str(tmp_path / "missing.tsv")]) == 1
+
+    def test_count_without_pandas(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'biogrid.db'}"
+        Importer(engine=create_engine(url), file_path=file_path).import_data()
+        code = (
+            "import sys; from biogrid.cli import main; main(['--database', sys.argv[1], 'count', 'interactions']); "
+            "print(sorted(name for name in sys.modules if name.startswith(('pandas.', 'numpy.'))))"
+        )
+        env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(biogrid.__file__))}
+        result = subprocess.run([sys.executable, "-c", code, url], capture_output=True, text=True, env=env, check=True)
+        assert result.stdout.splitlines() == ["interactions\t3", "[]"]
@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import sys # this initialises a QApplication instance and handles Command Line Arguments
+from array import array # a compact list of numbers stored as raw machine values (4 bytes per year) instead of one python int object per entry. 'i' is a signed 4 byte number
 from PyQt5.QtWidgets import (
     QWidget, #base class for all windows
     QLabel, #to display non editable text in GUI
     QLineEdit, #allows users to input single line text
     QTextEdit, #allows users to input multi line text
-    QListWidget, #a list view for displaying multiple items
+    QTableView, #a view which displays the rows of a model and only asks the model for the rows visible on the screen. Here it shows a single column, i.e. a list
+    QHeaderView, #the row and column headers of the QTableView. They are hidden, but the row header decides the height of the rows
+    QAbstractItemView, #holds the constants of the views, e.g. for selecting whole rows and for drag-and-drop
     QPushButton, #buttons to perform actions like "add", "edit", "delete", etc
     QSpinBox, #allows users to select numeric values within a range.
     QRadioButton, #Provides selectable options where only one button can be chosen at a time (the button looks like a buttet point and once selected, turns blue). 
@@ -15,9 +18,15 @@ from PyQt5.QtWidgets import (
     QApplication, 
     QDialog, #Represents the pop-up dialog box for editing subject details.
     QFileDialog, # Allows users to select files for loading and saving data.
+    QMessageBox, # a pop-up which shows a message, here the lines of a loaded file which could not be read
     QGridLayout, QHBoxLayout, QVBoxLayout, QFormLayout #Layout managers to arrange widgets in a grid, horizontal, vertical, or labeled rows.
 )
-from PyQt5.QtCore import Qt #Provides constants like Qt.InternalMove used for enabling drag-and-drop reordering in the list
+from PyQt5.QtCore import (
+    Qt, #Provides constants like Qt.DisplayRole and Qt.MoveAction used by the model and by drag-and-drop reordering in the list
+    QAbstractListModel, #base class for a list model: the data lives in the model and views only ask it for the rows they draw
+    QMimeData, #the container which carries the dragged rows from the drag to the drop
+    QModelIndex #points at one row of a model. An invalid QModelIndex() stands for the (invisible) root of the list
+)
 
 '''
 This class opens a QDialog box which takes input from the user about their name, Year of birth, symptom and gender
@@ -114,6 +123,162 @@ class SubjectDialog(QDialog): #here we are making the dialogue box which will po
             self.symptoms_edit.text()
         ]
 
+"""
+This class is the model which holds all the subjects and tells the view (the QTableView in ListWindow) about every change.
+The view never copies the data: it only asks the model for the names of the rows which are visible on the screen, so
+the list stays fast with a million subjects. The subjects are stored column by column instead of one python list per
+subject: the names and symptoms in lists of strings, the years in an array of 4 byte numbers and the genders in a
+bytearray with one byte per subject.
+Every change emits a signal for the rows which changed only (rowsInserted, dataChanged, rowsRemoved), so adding, editing
+or deleting a subject redraws one row instead of rebuilding the whole list like QListWidget.clear() and addItem() did.
+"""
+class SubjectListModel(QAbstractListModel):
+    mime_type = 'application/x-subject-rows' #the type of the data carried by a drag. It is private to this model, so rows can only be dropped within the same list
+
+    def __init__(self, subjects=None, parent=None):
+        super().__init__(parent)
+        self.names = [] #the 4 columns of the backing store. Row i is (names[i], years[i], genders[i], symptoms[i])
+        self.years = array('i') #'i' is a signed 4 byte number, so a year from a file outside the 1900 to 2100 of the QSpinBox (even a negative one) still fits
+        self.genders = bytearray() #one byte per subject: ord('m'), ord('f') or ord('?')
+        self.symptoms = []
+        if subjects:
+            self.setSubjects(subjects)
+
+    def rowCount(self, parent=QModelIndex()): #the view calls this to know how many rows there are. A list has rows at the root only, so any valid parent has 0 children
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole): #the view calls this for every visible row, and the role says what it wants. DisplayRole is the text shown in the row
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.names[index.row()] #the name is what is displayed in the list, like addItem(subject[0]) did before
+
+    def flags(self, index): #says what the user can do with a row. Rows can be selected and dragged; dropping is allowed between rows (on the invalid root index), not onto a row
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self): #rows dropped in the list are moved, not copied
+        return Qt.MoveAction
+
+    """
+    Returns one subject as a list [name, year of birth, gender, symptoms], the format used by SubjectDialog.setData and getData
+    """
+    def subject(self, row):
+        return [self.names[row], self.years[row], chr(self.genders[row]), self.symptoms[row]]
+
+    def subjects(self): #yields all subjects one after the other, e.g. to save them, without building a list of all of them first
+        for row in range(len(self.names)):
+            yield self.subject(row)
+
+    """
+    Adds one subject at the end of the list. beginInsertRows tells the view which row is going to appear, so it only
+    lays out that row. appending to a list, an array and a bytearray is O(1)
+    """
+    def appendSubject(self, subject):
+        row = len(self.names)
+        self.beginInsertRows(QModelIndex(), row, row) #the arguments are (parent, first row, last row) of the rows being inserted
+        self._insert(row, [subject])
+        self.endInsertRows() #this emits rowsInserted, which makes the view show the new row
+
+    """
+    Replaces the subject in a row. dataChanged tells the view that only this row (from index to index) has to be redrawn
+    """
+    def setSubject(self, row, subject):
+        name, year, gender, symptoms = subject
+        self.names[row] = name
+        self.years[row] = year
+        self.genders[row] = ord(gender)
+        self.symptoms[row] = symptoms
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    """
+    Removes count rows starting at row. This is also called by the view after rows were dragged to another place,
+    to remove them from their old place
+    """
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or count <= 0 or row + count > len(self.names):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.names[row:row + count]
+        del self.years[row:row + count]
+        del self.genders[row:row + count]
+        del self.symptoms[row:row + count]
+        self.endRemoveRows() #this emits rowsRemoved, which makes the view drop the rows without asking for the other rows again
+        return True
+
+    def removeSubject(self, row):
+        self.removeRows(row, 1)
+
+    """
+    Replaces all the subjects, e.g. after loading a file. beginResetModel and endResetModel tell the view to forget
+    everything it knew about the rows. It then only asks for the rows which are visible
+    """
+    def setSubjects(self, subjects):
+        columns = self.toColumns(subjects) #a subject which does not fit raises here, before the view is told about the reset, so the model is left as it was
+        self.beginResetModel()
+        self.names, self.years, self.genders, self.symptoms = columns
+        self.endResetModel()
+
+    def _insert(self, row, subjects): #writes subjects into the 4 columns before row. The caller emits the signals
+        names, years, genders, symptoms = self.toColumns(subjects) #checked first, so the 4 columns always keep the same length
+        self.names[row:row] = names
+        self.years[row:row] = years
+        self.genders[row:row] = genders
+        self.symptoms[row:row] = symptoms
+
+    """
+    Puts subjects into 4 new columns (names, years, genders, symptoms) without touching the model.
+    Raises ValueError if a subject is not [name, year of birth, gender, symptoms] with a whole number as year and
+    'm', 'f' or '?' as gender
+    """
+    @staticmethod
+    def toColumns(subjects):
+        names, years, genders, symptoms = [], array('i'), bytearray(), []
+        for subject in subjects:
+            name, year, gender, symptom = subject #raises ValueError if there are more or fewer than 4 fields
+            if gender not in ('m', 'f', '?'):
+                raise ValueError(f"the gender must be m, f or ?, not {gender!r}")
+            try:
+                years.append(year)
+            except (OverflowError, TypeError) as e: #not a whole number, or too large for 4 bytes
+                raise ValueError(f"{year!r} is not a year of birth") from e
+            names.append(name)
+            genders.append(ord(gender))
+            symptoms.append(symptom)
+        return names, years, genders, symptoms
+
+    """
+    The next 3 functions make drag-and-drop reordering work. When the user drags rows, the view asks mimeData to pack
+    them; the rows are packed as their row numbers, as they can only be dropped within this list. On the drop,
+    dropMimeData inserts copies of the dragged subjects at the drop position, and then the view removes the dragged
+    rows from their old position with removeRows
+    """
+    def mimeTypes(self):
+        return [self.mime_type]
+
+    def mimeData(self, indexes):
+        mime_data = QMimeData()
+        rows = sorted(index.row() for index in indexes if index.isValid())
+        mime_data.setData(self.mime_type, ','.join(map(str, rows)).encode())
+        return mime_data
+
+    def dropMimeData(self, mime_data, action, row, column, parent):
+        if action != Qt.MoveAction or not mime_data.hasFormat(self.mime_type):
+            return False
+        if parent.isValid(): #dropped onto a row: the subjects go before that row
+            row = parent.row()
+        if row < 0: #dropped below the last row: the subjects go at the end
+            row = len(self.names)
+        rows = [int(dragged_row) for dragged_row in bytes(mime_data.data(self.mime_type)).decode().split(',') if dragged_row]
+        if not rows:
+            return False
+        subjects = [self.subject(dragged_row) for dragged_row in rows]
+        self.beginInsertRows(QModelIndex(), row, row + len(subjects) - 1)
+        self._insert(row, subjects)
+        self.endInsertRows()
+        return True
+
 """
 This is the class ListWindow which is a QWidget which will display the contents 'Dummy Name' and 'Other Dummy Name' on the widget
 This QWidget also gives us buttons. The buttons and their respective functions are as follows:
@@ -127,17 +292,26 @@ class ListWindow(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.data = [
+        self.model = SubjectListModel([
             ['Dummy Name', 1900, 'm', 'some symptoms'],
             ['Other Dummy Name', 1970, 'f', 'other symptoms']
-        ]
+        ]) #the model holds the subjects. See the SubjectListModel class above
 
-        self.list = QListWidget() #helps to diplay a list of items. Helps in managing a collection of data in a simple list format
-        self.list.setDragDropMode(QListWidget.InternalMove) #this setDragDropMode helps in reordering of the list contents. To use this, just press and hold one list content and then reorder it
-                                                            # InternalMove means items can only be moved within the widget, not outside it
-        self.list.model().rowsMoved.connect(self.onRowsMoved) #if the rows are moved then arrange and update the data accordingly in the self.data
-
-        self.updateList() #this populates the self.list widget with the self.data. The function is below in the code
+        self.list = QTableView() #displays the subjects of the model. It only asks the model for the rows which are visible, so it does not matter how many subjects there are
+                                 #a QListView would do as well, but it lays out every row again after each change, asking the python model about every row, which takes seconds with a million rows
+        self.list.setModel(self.model) #connects the view to the model. From now on the view redraws itself whenever the model emits a signal
+        self.list.horizontalHeader().hide() #the next 4 lines make the table look like a list: no headers, no grid, and the single column as wide as the view
+        self.list.verticalHeader().hide()
+        self.list.horizontalHeader().setStretchLastSection(True)
+        self.list.setShowGrid(False)
+        self.list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed) #all rows have the same height, so the view computes the position of any row without asking the model about the rows above it. This keeps scrolling smooth with a million rows
+        self.list.verticalHeader().setDefaultSectionSize(self.list.fontMetrics().height() + 4)
+        self.list.setSelectionBehavior(QAbstractItemView.SelectRows) #clicking selects the whole row, and only one row at a time, like in a list
+        self.list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list.setDragDropMode(QAbstractItemView.InternalMove) #this setDragDropMode helps in reordering of the list contents. To use this, just press and hold one list content and then reorder it
+                                                                  # InternalMove means items can only be moved within the widget, not outside it
+        self.list.setDragDropOverwriteMode(False) #dropped rows are inserted between the rows instead of replacing the row they are dropped on
+        self.list.setDefaultDropAction(Qt.MoveAction)
 
         button_add = QPushButton('Add') # add a new subject
         button_edit = QPushButton('Edit') #edit a selected subject (this will only work if any list is selected)
@@ -169,19 +343,11 @@ class ListWindow(QWidget):
         self.setWindowTitle('Subject List')
         self.show() #displays it on the window
         """
-        This function first clears the whole data in the self.list and then repopulates it with names of the subjects
-        we clear it first because when we update the widget which may have new data, we dont want the old data to be repeated again
-        """
-    def updateList(self):
-        self.list.clear() #it is important to clear the contents before updating them because then they will duplicate themselves after clicking ok 
-        for subject in self.data:
-            self.list.addItem(subject[0]) #the 1st element in every list (the name) is used to display. addItem adds the clickable boxes containing the data and addItem takes in 1 string argument which should represent the name of the clickable box
-        """
         When u click the add button, button_add.clicked.connect(self.onAddClicked)  gets triggered and then it runs this program
         it first opens the dialog box (defined in the above class) and then u can interact with the box. 
         it doesnt close the dialog box until ok or cancel is clicked. 
-        If ok is clicked, it gets the data in the form of list (using getData) and then appends the list to the self.data. 
-        Then later we update the data 
+        If ok is clicked, it gets the data in the form of list (using getData) and then appends the list to the model. 
+        The model then tells the view that one row was added at the end, so only that row is drawn
         """
     def onAddClicked(self):
         dlg = SubjectDialog(self) #opens the diaogue box which we defined above (creates an instance of the SubjectDialog dialog box) here the parameter is self i.e parent listWindow
@@ -189,37 +355,36 @@ class ListWindow(QWidget):
         if dlg.exec_() == dlg.Accepted:         #this displays the subjectDialog to the user and waits for them to interact with it. 
                                                 #dlg.exec_() opens dialog box in modal state (blocks interaction with the LisWindow until the dialog box is closed)
                                                 #the if statement Checks if the dialog was closed using the "OK" button (dlg.accept() was triggered).
-            self.data.append(dlg.getData()) #go to the getData function to understand this. 
-            self.updateList() #we have to update because new data was added. see the updateList() function to understand how new data is added
+            self.model.appendSubject(dlg.getData()) #go to the getData function to understand this. see the appendSubject() function of the model to understand how the view is told about the new row
         """
-        This function 1st verifies which data is being clicked by currentRow() or data is even clicked or not
+        This function 1st verifies which data is being clicked by currentIndex() or data is even clicked or not
         then it opens that data and displays it because of the line if data: self.setData(data) in the SubjectDialog class 
         if we click ok then the new data entered is captured using getData (which is a list) and now this new list is replaced by the old one 
-        then update
+        then the model tells the view that only this row changed
         """
     def onEditClicked(self):
-        current_row = self.list.currentRow() #this checks which row is currently selected and assigns it to current_row. self.list.currentRow() returns 0 if 1st item is selected, 1 if 2nd is selected
-        if current_row < 0: #these two lines ensure that if now row is selected and we click the button, the function exits. No row selected returns -1 and is less than 0
+        current_row = self.list.currentIndex().row() #this checks which row is currently selected and assigns it to current_row. It is 0 if 1st item is selected, 1 if 2nd is selected
+        if current_row < 0: #these two lines ensure that if now row is selected and we click the button, the function exits. No row selected gives an invalid index whose row is -1
             return
 
-        dlg = SubjectDialog(self, self.data[current_row]) #if 2nd item was selected then current_row = 1 and self.data[1] will give the list ['Other Dummy Name', 1970, 'f', 'other symptoms']
+        dlg = SubjectDialog(self, self.model.subject(current_row)) #if 2nd item was selected then current_row = 1 and self.model.subject(1) will give the list ['Other Dummy Name', 1970, 'f', 'other symptoms']
         if dlg.exec_() == dlg.Accepted:
-            self.data[current_row] = dlg.getData() 
-            self.updateList()
+            self.model.setSubject(current_row, dlg.getData()) 
         """
-        This function checks which cell is selected and then deletes it and then updates the list
+        This function checks which cell is selected and then deletes it. The model tells the view that only this row was removed
         """
     def onDeleteClicked(self):
-        current_row = self.list.currentRow() #self.list.currentRow() returns 0 if 1st item is selected, 1 if 2nd is selected
+        current_row = self.list.currentIndex().row() #0 if 1st item is selected, 1 if 2nd is selected, -1 if nothing is selected
         if current_row < 0:
             return
 
-        del self.data[current_row] 
-        self.updateList()
+        self.model.removeSubject(current_row) 
         """
         the QFileDialog opens a dialog box that allows the user to choose file from their system
-        getOpenFileName gets the name of the file and then this function gets the data and saves the data in self.data
-        updateList() then adds the data content to the screen (remember that updateList also has addIem function to show the data on the screen in the widget)
+        getOpenFileName gets the name of the file and then this function reads the subjects and puts them in the model
+        with setSubjects(), after which the view shows the new subjects (it only asks the model for the visible rows).
+        Lines which cannot be read are skipped and listed in a QMessageBox. An exception must not escape this function:
+        PyQt5 aborts the whole application when a slot raises
         """
     def onLoadClicked(self):
         filename, _ = QFileDialog.getOpenFileName(self, "Load File") #the syntax: .getOpenFileName(parent, caption, directory='', filter=''). 
@@ -230,11 +395,27 @@ class ListWindow(QWidget):
                                                                         # since this all returns a tuple which is ('file path', 'the filter used')
                                                                         #in this case we receive the tuple ('path file', '') and we unpack it and we assign the '' to a placeholder _
         if filename:                                                    
-            with open(filename, 'r') as f:
-                self.data = [line.strip().split(',') for line in f.readlines()] #there can be multiple lines in the same file
-                for subject in self.data:
-                    subject[1] = int(subject[1])  # Convert year of birth to int cause it is in str form when previously saved
-                self.updateList()
+            subjects, bad_lines = [], []
+            try:
+                with open(filename, 'r') as f:
+                    for number, line in enumerate(f, start=1): #there can be multiple lines in the same file
+                        if not line.strip(): #e.g. an empty line at the end of the file
+                            continue
+                        subject = line.strip().split(',')
+                        try:
+                            subject[1] = int(subject[1])  # Convert year of birth to int cause it is in str form when previously saved
+                            SubjectListModel.toColumns([subject]) #checks the subject the way setSubjects will
+                        except (ValueError, IndexError) as e:
+                            bad_lines.append(f"line {number}: {e}")
+                            continue
+                        subjects.append(subject)
+            except (OSError, UnicodeDecodeError) as e: #the file could not be opened or is not a text file
+                QMessageBox.warning(self, "Load File", f"The file could not be read: {e}")
+                return
+            self.model.setSubjects(subjects)
+            if bad_lines: #only the first 20, so the message box still fits on the screen
+                more = f"\n... and {len(bad_lines) - 20} more" if len(bad_lines) > 20 else ""
+                QMessageBox.warning(self, "Load File", "These lines were skipped:\n" + '\n'.join(bad_lines[:20]) + more)
 
         """
         getSaveFileName helps u to save a file in ur pc. "Save File is the name u give to the dialog box
@@ -244,16 +425,8 @@ class ListWindow(QWidget):
         filename, _ = QFileDialog.getSaveFileName(self, "Save File")
         if filename:
             with open(filename, 'w') as f:
-                for subject in self.data:
+                for subject in self.model.subjects():
                     f.write(','.join(map(str, subject)) + '\n') 
-    """
-    Helps in drag and drop of the data hence rearranging them. After dragging and dropping data
-    their arrangement needs to be updated in the self.data for which this function is created     
-    """
-    def onRowsMoved(self, parent, start, end, destination, row):
-        moved_items = self.data[start:end + 1]
-        del self.data[start:end + 1]
-        self.data[row:row] = moved_items
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)